@@ -111,15 +111,34 @@ class SuperScheduler:
                               required_one_off_schedules: Optional[list[str]] = None,):
         if schedule_args.get('name') and schedule_args['name'] in required_one_off_schedules:
             task_args['one_off'] = True
+        check_load = task_args.pop('check_load', False)
         data = {
             'task': task_args,
             'schedule': schedule_args,
         }
+        if check_load:
+            data['check_load'] = True
         self.data = data
         return data
 
-    def send_request_to_super_scheduler(self, post: bool = False, delete: bool = False, get: bool = False):
+    @staticmethod
+    def load_bulk_file(path: str) -> dict:
+        """
+        Bulk request from json file: list of items to create or dict with 'create', 'update', 'delete' lists.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = {'create': data}
+        return data
+
+    def send_request_to_super_scheduler(self, post: bool = False, delete: bool = False, get: bool = False,
+                                        bulk: bool = False, load: bool = False):
         url = f'http://{self.address}/{self.SUPER_SCHEDULER_URL}'
+        if bulk:
+            url = url.rstrip('/') + '/bulk/'
+        elif load:
+            url = url.rstrip('/') + '/load/'
         content, status_code = self.send_request(url=url, data=self.data, post=post, delete=delete, get=get)
 
         if content is not None:
@@ -184,20 +203,147 @@ class ActionFormat(BaseModel):
         description="flag for getting task",
         example="--get"
     )
+    load: bool = Field(
+        description="flag for projected load of all enabled periodic tasks",
+        example="--load"
+    )
+    file: Optional[str] = Field(
+        default=None,
+        description="json file with list of tasks to create or with 'create', 'update', 'delete' lists "
+                    "of {'task': {...}, 'schedule': {...}} items; all tasks are sent in one bulk request",
+        example="--file tasks.json"
+    )
 
     @root_validator(pre=True)
     def action_validator(cls, values):
-        keys = ['create', 'delete', 'get']
+        keys = ['create', 'delete', 'get', 'load']
         for key in keys:
             values[key] = True if key in values else False
-        if sum([values.get(key) for key in keys]) != 1:
-            raise ValueError("Set only one flag '--create', '--delete' or '--get'")
+        if sum([values.get(key) for key in keys]) + ('file' in values) != 1:
+            raise ValueError("Set only one flag '--create', '--delete', '--get', '--load' or '--file'")
 
         return values
 
+    @validator('file', pre=True)
+    def file_validator(cls, value):
+        if isinstance(value, (list, tuple)):
+            if len(value) != 1:
+                raise ValueError("Set only one 'file' argument: '--file \"tasks.json\"'")
+            value = value[0]
+        return value
+
 
 class TaskGetFormat(BaseModel):
-    pass
+
+    # filters
+    enabled: Optional[bool] = Field(
+        default=None,
+        description="get only enabled (true) or disabled (false) periodic tasks",
+        example="--enabled true"
+    )
+    task: Optional[str] = Field(
+        default=None,
+        description="get periodic tasks of function",
+        example="--task super_scheduler.tasks.otl"
+    )
+    name_prefix: Optional[str] = Field(
+        default=None,
+        description="get periodic tasks with name prefix",
+        example="--name_prefix my_"
+    )
+    schedule_type: Optional[str] = Field(
+        default=None,
+        description="get periodic tasks with schedule type: interval, crontab, solar or clocked",
+        example="--schedule_type crontab"
+    )
+    owner: Optional[str] = Field(
+        default=None,
+        description="get periodic tasks with 'username' kwarg",
+        example="--owner admin"
+    )
+    # page
+    fields: Optional[str] = Field(
+        default=None,
+        description="periodic task fields in response; default - all fields",
+        example="--fields name task enabled"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="cursor of page from 'next_cursor' of previous response",
+        example="--cursor WyJteV90YXNrIl0="
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        description="max periodic tasks in response, default - 100",
+        example="--limit 500"
+    )
+    # sections
+    running: bool = Field(
+        default=False,
+        description="flag, add running tasks of cluster in response",
+        example="--running"
+    )
+    registered: bool = Field(
+        default=False,
+        description="flag, add registered task functions in response",
+        example="--registered"
+    )
+    stats: bool = Field(
+        default=False,
+        description="flag, add progress of distributed groups and otl coalescing stats in response",
+        example="--stats"
+    )
+
+    @validator('enabled', 'task', 'name_prefix', 'schedule_type', 'owner', 'cursor', 'limit', pre=True)
+    def fields_validator(cls, value, field):
+        field: pydantic.fields.ModelField
+        field_name = field.name
+        if isinstance(value, (list, tuple)):
+            if len(value) != 1:
+                raise ValueError(f"Set only one '{field_name}' argument: '--{field_name} \"smth...\"'")
+            value = value[0]
+        return value
+
+    @validator('fields', pre=True)
+    def fields_list_validator(cls, value):
+        if isinstance(value, (list, tuple)):
+            value = ','.join(value)
+        return value
+
+    @validator('running', 'registered', 'stats', pre=True)
+    def flag_validator(cls, value, field):
+        field: pydantic.fields.ModelField
+        field_name = field.name
+        if isinstance(value, (list, tuple)):
+            if len(value) != 0:
+                raise ValueError(f"Set only '{field_name}' flag: '--{field_name}'")
+            value = True
+        return value
+
+
+class TaskLoadFormat(BaseModel):
+
+    hours: Optional[int] = Field(
+        default=None,
+        description="hours of projected load; default - 'hours' in [load] section of server config",
+        example="--hours 24"
+    )
+    threshold: Optional[int] = Field(
+        default=None,
+        description="report seconds with more projected task starts; "
+                    "default - 'threshold' in [load] section of server config",
+        example="--threshold 50"
+    )
+
+    @validator('hours', 'threshold', pre=True)
+    def fields_validator(cls, value, field):
+        field: pydantic.fields.ModelField
+        field_name = field.name
+        if isinstance(value, (list, tuple)):
+            if len(value) != 1:
+                raise ValueError(f"Set only one '{field_name}' argument: '--{field_name} 10'")
+            value = int(value[0])
+        return value
 
 
 class TaskDeleteFormat(BaseModel):
@@ -259,8 +405,29 @@ class TaskCreateFormat(TaskDeleteFormat):
         description="datetime after which the schedule will no longer trigger the task to run",
         example="--expires \"2025-11-28 12:10:50.001\""
     )
+    distributed: bool = Field(
+        default=False,
+        description="flag, run otl lines of group_otl task as subtasks on all workers",
+        example="--distributed"
+    )
+    max_parallel: Optional[int] = Field(
+        default=None,
+        description="max parallel running instances of periodic task in cluster; "
+                    "default - 1 if 'wait_finish_task' in config, else unlimited",
+        example="--max_parallel 2"
+    )
+    unique: bool = Field(
+        default=False,
+        description="flag, reject task if other periodic task has the same task, args and kwargs",
+        example="--unique"
+    )
+    check_load: bool = Field(
+        default=False,
+        description="flag, warn if task starts in seconds overloaded by other periodic tasks",
+        example="--check_load"
+    )
 
-    @validator('task', 'priority', 'start_time', 'expires', pre=True)
+    @validator('task', 'priority', 'start_time', 'expires', 'max_parallel', pre=True)
     def fields_validator(cls, value, field):
         field: pydantic.fields.ModelField
         field_name = field.name
@@ -280,7 +447,7 @@ class TaskCreateFormat(TaskDeleteFormat):
             kwargs[key] = value
         return kwargs
 
-    @validator('one_off', 'disable', pre=True)
+    @validator('one_off', 'disable', 'distributed', 'unique', 'check_load', pre=True)
     def flag_validator(cls, value, field):
         field: pydantic.fields.ModelField
         field_name = field.name
@@ -309,14 +476,23 @@ class ScheduleFormat(BaseModel):
         description="flag for solar schedule",
         example="--solar"
     )
+    bitset_crontab: bool = Field(
+        description="flag for crontab schedule compiled into bitmasks, args of crontab schedule",
+        example="--bitset_crontab"
+    )
+    spread: bool = Field(
+        description="flag for crontab schedule with stable offset of task in window, args of crontab schedule",
+        example="--spread"
+    )
 
     @root_validator(pre=True)
     def schedule_validator(cls, values):
-        keys = ['crontab', 'clocked', 'interval', 'solar']
+        keys = ['crontab', 'clocked', 'interval', 'solar', 'bitset_crontab', 'spread']
         for key in keys:
             values[key] = True if key in values else False
         if sum([values.get(key) for key in keys]) != 1:
-            raise ValueError("Set only one flag '--crontab', '--clocked', '--interval' or '--solar'")
+            raise ValueError("Set only one flag '--crontab', '--clocked', '--interval', '--solar', "
+                             "'--bitset_crontab' or '--spread'")
 
         return values
 
@@ -381,6 +557,24 @@ class CrontabScheduleFormat(BaseModel):
         return values
 
 
+class SpreadScheduleFormat(CrontabScheduleFormat):
+
+    # schedule
+    window: Optional[int] = Field(
+        default=None,
+        description="window (sec) of task start offset; default - 'window' in [spread] section of server config",
+        example="--window 60"
+    )
+
+    @validator('window', pre=True)
+    def window_validator(cls, value):
+        if isinstance(value, (list, tuple)):
+            if len(value) != 1:
+                raise ValueError("Set only one 'window' argument: '--window 60'")
+            value = int(value[0])
+        return value
+
+
 class ClockedScheduleFormat(BaseModel):
 
     # schedule
@@ -466,8 +660,11 @@ class ArgParser:
         'task (create)': TaskCreateFormat,
         'task (delete)': TaskDeleteFormat,
         'task (get)': TaskGetFormat,
+        'task (load)': TaskLoadFormat,
         'schedule': ScheduleFormat,
         'schedule (crontab)': CrontabScheduleFormat,
+        'schedule (bitset_crontab)': CrontabScheduleFormat,
+        'schedule (spread)': SpreadScheduleFormat,
         'schedule (clocked)': ClockedScheduleFormat,
         'schedule (interval)': IntervalScheduleFormat,
         'schedule (solar)': SolarScheduleFormat,
@@ -523,7 +720,8 @@ class ArgParser:
         # print(action_args)
 
         task_args = {}
-        for key, key_format in zip(('create', 'delete', 'get'), ('task (create)', 'task (delete)', 'task (get)')):
+        for key, key_format in zip(('create', 'delete', 'get', 'load'),
+                                   ('task (create)', 'task (delete)', 'task (get)', 'task (load)')):
             if action_args[key]:
                 task_args = self.ARG_PARSER_FORMATS[key_format](**group_args).dict()
                 break
@@ -641,6 +839,23 @@ def client():
     # set token
     super_scheduler_class.auth()
 
+    # bulk request from file
+    if action_args['file']:
+        data = SuperScheduler.load_bulk_file(action_args['file'])
+        super_scheduler_class.data = data
+        print("\nRequest data:")
+        SuperScheduler.pretty_print(data_dict2dict={action: len(items) for action, items in data.items()})
+        super_scheduler_class.send_request_to_super_scheduler(post=True, bulk=True)
+        return
+
+    # projected load of periodic tasks
+    if action_args['load']:
+        super_scheduler_class.data = task_args
+        print("\nRequest data:")
+        SuperScheduler.pretty_print(data_dict2dict=task_args)
+        super_scheduler_class.send_request_to_super_scheduler(get=True, load=True)
+        return
+
     # create data
     data = super_scheduler_class.new_data_construction(
         task_args,
@@ -0,0 +1,285 @@
+from django_celery_beat.models import PeriodicTask as DjangoPeriodicTask, PeriodicTasks
+from django.db import transaction, DatabaseError
+from django.db.models import Q
+from django.utils.timezone import now
+from pydantic import validator
+from typing import Dict, List, Optional, Tuple
+from functools import reduce
+from decimal import Decimal
+import operator
+import logging
+
+from ..utils.get_task import SCHEDULE_TYPE_FIELDS
+from ..utils.kwargs_parser import KwargsParser
+from ..utils.validation_context import ValidationContext
+from ..utils.task_fingerprint import TaskFingerprintIndex, periodic_task_fingerprint
+from ..utils.schedule_changes import notify_schedule_changed
+from ..schedule.format import ScheduleCreateFormat
+from ..schedule.schedule_objects import schedule_name2class, schedule_name2format, schedule_name2field, \
+    move_task_params
+
+from .format import TaskCreateFormat, TaskDeleteFormat
+
+
+BATCH_SIZE = 500
+
+SUCCESS, FAILED = 'success', 'failed'
+
+
+class TaskBulkCreateFormat(TaskCreateFormat):
+    """
+    Task create format of bulk request; names and tasks are checked against snapshot of bulk request.
+    """
+
+    @validator('name')
+    def name_validator(cls, value: str) -> str:
+        return value
+
+    @validator('task')
+    def task_exist(cls, value: str) -> str:
+        return value
+
+
+class TaskBulkDeleteFormat(TaskDeleteFormat):
+    """
+    Task delete format of bulk request; names are checked against snapshot of bulk request.
+    """
+
+    @validator('name', allow_reuse=True)
+    def name_validator(cls, value: str) -> str:
+        return value
+
+
+def _schedule_key(schedule_name: str, schedule_kwargs: dict) -> tuple:
+    """
+    Hashable key of schedule, the same for parsed kwargs and django model fields.
+    """
+    def normalize(value):
+        if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+            return float(value)
+        return str(value)
+    return schedule_name, tuple(sorted((key, normalize(value)) for key, value in schedule_kwargs.items()))
+
+
+class PeriodicTaskBulk:
+    """
+    Create, update and delete many periodic tasks at once.
+    Items are validated together against one snapshot of periodic task names, registered tasks and schedules;
+    valid items are written in one transaction, invalid ones are reported in results.
+    """
+
+    logger = logging.getLogger('super_scheduler.periodic_task')
+
+    def __init__(self, names: List[str]):
+        """
+        :param names: periodic task names of all items
+        """
+        self.existing_names = set()
+        for i in range(0, len(names), BATCH_SIZE):
+            self.existing_names.update(DjangoPeriodicTask.objects.filter(
+                name__in=names[i:i + BATCH_SIZE]).values_list('name', flat=True))
+        self.task_names = ValidationContext.registered_tasks()
+        self.schedules: Dict[tuple, object] = {}
+
+    @staticmethod
+    def item_name(item) -> Optional[str]:
+        if isinstance(item, dict) and isinstance(item.get('task'), dict):
+            name = item['task'].get('name')
+            return name if isinstance(name, str) else None
+        return None
+
+    @staticmethod
+    def _parse_schedule(schedule_kwargs) -> Tuple[Optional[Tuple[str, dict]], Optional[str]]:
+        """
+        :return: schedule type & schedule kwargs | None & error msg
+        """
+        if not isinstance(schedule_kwargs, dict):
+            return None, "Not valid format; expected: {'task': {}, 'schedule': {}}"
+        schedule_name_dict, msg = KwargsParser.parse_kwargs(schedule_kwargs, ScheduleCreateFormat)
+        if schedule_name_dict is None:
+            return None, msg
+        schedule_name = schedule_name_dict['name']
+        schedule_kwargs, msg = KwargsParser.parse_kwargs(schedule_kwargs, schedule_name2format(schedule_name))
+        if schedule_kwargs is None:
+            return None, msg
+        return (schedule_name, schedule_kwargs), None
+
+    def _parse_task(self, item, seen_names: set, exists: bool) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        Parse create or update item.
+
+        :param exists: periodic task must exist (update) or not (create)
+        :return: {"task": task kwargs, "schedule": (schedule type, schedule kwargs)} | None & error msg
+        """
+        if not isinstance(item, dict) or not isinstance(item.get('task'), dict) or 'schedule' not in item:
+            return None, "Not valid format; expected: {'task': {}, 'schedule': {}}"
+
+        schedule_kwargs, task_kwargs = move_task_params(item['schedule'], item['task'])
+        task_kwargs, msg = KwargsParser.parse_kwargs(dict(task_kwargs), TaskBulkCreateFormat)
+        if task_kwargs is None:
+            return None, msg
+
+        name = task_kwargs['name']
+        if name in seen_names:
+            return None, f"Duplicate periodic task name {name} in request"
+        seen_names.add(name)
+        if exists and name not in self.existing_names:
+            return None, f"Periodic task name {name} does not exist"
+        if not exists and name in self.existing_names:
+            return None, f"Duplicate periodic task name {name}"
+        if task_kwargs['task'] not in self.task_names:
+            return None, f"Task name {task_kwargs['task']} does not exist"
+
+        schedule, msg = self._parse_schedule(schedule_kwargs)
+        if schedule is None:
+            return None, msg
+        return {'task': task_kwargs, 'schedule': schedule}, None
+
+    def _parse_delete(self, item, seen_names: set) -> Tuple[Optional[str], Optional[str]]:
+        """
+        :return: periodic task name | None & error msg
+        """
+        if not isinstance(item, dict) or not isinstance(item.get('task'), dict):
+            return None, "Not valid format; expected: {'task': {'name': ...}}"
+        task_kwargs, msg = KwargsParser.parse_kwargs(dict(item['task']), TaskBulkDeleteFormat)
+        if task_kwargs is None:
+            return None, msg
+        name = task_kwargs['name']
+        if name in seen_names:
+            return None, f"Duplicate periodic task name {name} in request"
+        seen_names.add(name)
+        if name not in self.existing_names:
+            return None, f"Periodic task name {name} does not exist"
+        return name, None
+
+    def _prefetch_schedules(self, schedules: List[Tuple[str, dict]]):
+        """
+        Load existing schedules with one query per schedule type, create missing ones.
+        """
+        by_type: Dict[str, Dict[tuple, dict]] = {}
+        for schedule_name, schedule_kwargs in schedules:
+            by_type.setdefault(schedule_name, {})[_schedule_key(schedule_name, schedule_kwargs)] = schedule_kwargs
+
+        for schedule_name, kwargs_by_key in by_type.items():
+            schedule_class = schedule_name2class(schedule_name)
+            kwargs_list = list(kwargs_by_key.values())
+            for i in range(0, len(kwargs_list), BATCH_SIZE):
+                query = reduce(operator.or_, (Q(**kwargs) for kwargs in kwargs_list[i:i + BATCH_SIZE]))
+                for schedule in schedule_class.objects.filter(query):
+                    for key, kwargs in kwargs_by_key.items():
+                        if key not in self.schedules and \
+                                _schedule_key(schedule_name, {field: getattr(schedule, field) for field in kwargs}) == key:
+                            self.schedules[key] = schedule
+            for key, kwargs in kwargs_by_key.items():
+                if key not in self.schedules:
+                    self.schedules[key], _ = schedule_class.objects.get_or_create(**kwargs)
+
+    def _get_schedule(self, schedule: Tuple[str, dict]):
+        return self.schedules[_schedule_key(*schedule)]
+
+    def _write(self, creates: List[dict], updates: List[dict], deletes: List[str]):
+        schedules = [item['schedule'] for item in creates + updates]
+        with transaction.atomic():
+            self._prefetch_schedules(schedules)
+
+            DjangoPeriodicTask.objects.bulk_create([
+                DjangoPeriodicTask(**{schedule_name2field(item['schedule'][0]): self._get_schedule(item['schedule'])},
+                                   **item['task'])
+                for item in creates
+            ], batch_size=BATCH_SIZE)
+
+            if updates:
+                p_tasks = {p_task.name: p_task for p_task in DjangoPeriodicTask.objects.filter(
+                    name__in=[item['task']['name'] for item in updates])}
+                fields = set()
+                for item in updates:
+                    p_task = p_tasks[item['task']['name']]
+                    for field, value in item['task'].items():
+                        setattr(p_task, field, value)
+                        fields.add(field)
+                    for schedule_field in SCHEDULE_TYPE_FIELDS.values():
+                        setattr(p_task, schedule_field, None)
+                    setattr(p_task, schedule_name2field(item['schedule'][0]), self._get_schedule(item['schedule']))
+                    p_task.date_changed = now()
+                fields.discard('name')
+                fields.update(SCHEDULE_TYPE_FIELDS.values())
+                fields.add('date_changed')
+                DjangoPeriodicTask.objects.bulk_update(list(p_tasks.values()), list(fields), batch_size=BATCH_SIZE)
+
+            for i in range(0, len(deletes), BATCH_SIZE):
+                DjangoPeriodicTask.objects.filter(name__in=deletes[i:i + BATCH_SIZE]).delete()
+
+            # bulk operations don't send signals, notify beat about changes once
+            PeriodicTasks.update_changed()
+
+        TaskFingerprintIndex.set_many(
+            (item['task']['name'], periodic_task_fingerprint(
+                item['task']['task'], item['task'].get('args'), item['task'].get('kwargs')))
+            for item in creates + updates)
+        notify_schedule_changed([item['task']['name'] for item in creates + updates] + deletes)
+
+    def run(self, create: list, update: list, delete: list) -> Dict[str, List[dict]]:
+        """
+        Validate items against snapshot and write valid ones.
+
+        :return: {"create": [{"name": ..., "status": "success" | "failed", "error": ...}], "update": [...], ...}
+        """
+        results = {'create': [], 'update': [], 'delete': []}
+        valid = {'create': [], 'update': [], 'delete': []}
+        seen_names = set()
+        for action, items in (('create', create), ('update', update), ('delete', delete)):
+            for item in items:
+                if action == 'delete':
+                    parsed, msg = self._parse_delete(item, seen_names)
+                else:
+                    parsed, msg = self._parse_task(item, seen_names, exists=action == 'update')
+                result = {'name': self.item_name(item)}
+                if parsed is None:
+                    result.update(status=FAILED, error=msg)
+                else:
+                    result['status'] = SUCCESS
+                    valid[action].append(parsed)
+                results[action].append(result)
+
+        if any(valid.values()):
+            try:
+                self._write(valid['create'], valid['update'], valid['delete'])
+            except DatabaseError as err:
+                self.logger.error(f"Bulk write failed: {err}")
+                for action_results in results.values():
+                    for result in action_results:
+                        if result['status'] == SUCCESS:
+                            result.update(status=FAILED, error=f"Bulk write failed: {err}")
+
+        self.logger.info("Bulk request: " + ", ".join(
+            f"{action} {sum(result['status'] == SUCCESS for result in action_results)}/{len(action_results)}"
+            for action, action_results in results.items()))
+        return results
+
+    @classmethod
+    def apply(cls, create: Optional[list] = None, update: Optional[list] = None,
+              delete: Optional[list] = None) -> Dict[str, List[dict]]:
+        """
+        Validate items and write valid ones.
+
+        :param create: items {"task": {...}, "schedule": {...}} of new periodic tasks
+        :param update: items {"task": {...}, "schedule": {...}} replacing existing periodic tasks
+        :param delete: items {"task": {"name": ...}}
+        :return: {"create": [{"name": ..., "status": "success" | "failed", "error": ...}], "update": [...], ...}
+        """
+        create, update, delete = create or [], update or [], delete or []
+        names = [name for name in map(cls.item_name, create + update + delete) if name is not None]
+        return cls(names).run(create, update, delete)
+
+    @classmethod
+    def upsert(cls, items: list) -> Dict[str, List[dict]]:
+        """
+        Create new periodic tasks and replace existing ones.
+
+        :param items: items {"task": {...}, "schedule": {...}}
+        :return: results of 'create' and 'update' items
+        """
+        bulk = cls([name for name in map(cls.item_name, items) if name is not None])
+        create = [item for item in items if cls.item_name(item) not in bulk.existing_names]
+        update = [item for item in items if cls.item_name(item) in bulk.existing_names]
+        return bulk.run(create, update, [])
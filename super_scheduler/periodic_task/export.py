@@ -0,0 +1,104 @@
+from django_celery_beat.models import PeriodicTask as DjangoPeriodicTask
+from typing import Dict, Iterable, Iterator, List
+from decimal import Decimal
+import datetime
+import json
+
+from ..utils.get_task import SCHEDULE_TYPE_FIELDS
+from ..schedule.schedule_objects import schedule_name2format
+
+from .bulk import PeriodicTaskBulk, SUCCESS
+
+
+EXPORT_TASK_FIELDS = ('name', 'task', 'args', 'kwargs', 'enabled', 'one_off', 'priority', 'start_time', 'expires')
+CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 500
+
+
+def _schedule_fields() -> Dict[str, List[str]]:
+    """
+    Fields of each schedule type from schedule formats.
+    """
+    return {schedule_name: list(schedule_name2format(schedule_name).__fields__)
+            for schedule_name in SCHEDULE_TYPE_FIELDS}
+
+
+def _json_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def iter_periodic_task_records(chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    All periodic tasks in bulk item format {"task": {...}, "schedule": {"name": schedule type, ...}}.
+    Rows are read from database in chunks with server-side cursor, memory doesn't depend on count of tasks.
+    """
+    schedule_fields = _schedule_fields()
+    values = list(EXPORT_TASK_FIELDS) + list(SCHEDULE_TYPE_FIELDS.values()) + [
+        f'{SCHEDULE_TYPE_FIELDS[schedule_name]}__{field}'
+        for schedule_name, fields in schedule_fields.items() for field in fields
+    ]
+    rows = DjangoPeriodicTask.objects.order_by('name').values(*values).iterator(chunk_size=chunk_size)
+    for row in rows:
+        task = {field: _json_value(row[field]) for field in EXPORT_TASK_FIELDS}
+        task['args'] = json.loads(task['args'] or '[]')
+        task['kwargs'] = json.loads(task['kwargs'] or '{}')
+        task = {field: value for field, value in task.items() if value is not None}
+
+        schedule = {}
+        for schedule_name, fields in schedule_fields.items():
+            schedule_field = SCHEDULE_TYPE_FIELDS[schedule_name]
+            if row[schedule_field] is not None:
+                schedule = {'name': schedule_name, **{
+                    field: _json_value(row[f'{schedule_field}__{field}']) for field in fields}}
+                break
+        yield {'task': task, 'schedule': schedule}
+
+
+def iter_ndjson(records: Iterable[dict]) -> Iterator[bytes]:
+    for record in records:
+        yield json.dumps(record).encode() + b'\n'
+
+
+def import_periodic_task_records(lines: Iterable[bytes], batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """
+    Create or replace periodic tasks from newline-delimited json records of export;
+    every batch is validated and written in its own transaction.
+
+    :param lines: lines of newline-delimited json
+    :param batch_size: records in batch
+    :return: {"total": ..., "succeeded": ..., "failed": [{"line": ..., "name": ..., "error": ...}]}
+    """
+    summary = {'total': 0, 'succeeded': 0, 'failed': []}
+
+    def apply(batch_: List[tuple]):
+        results = PeriodicTaskBulk.upsert([item for _, item in batch_])
+        line_numbers = {PeriodicTaskBulk.item_name(item): line_number for line_number, item in batch_}
+        for result in results['create'] + results['update']:
+            if result['status'] == SUCCESS:
+                summary['succeeded'] += 1
+            else:
+                summary['failed'].append({
+                    'line': line_numbers.get(result['name']), 'name': result['name'], 'error': result['error']})
+
+    batch = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        summary['total'] += 1
+        try:
+            item = json.loads(line)
+        except ValueError as err:
+            summary['failed'].append({'line': line_number, 'name': None, 'error': f"Not valid json: {err}"})
+            continue
+        batch.append((line_number, item))
+        if len(batch) >= batch_size:
+            apply(batch)
+            batch = []
+    if batch:
+        apply(batch)
+    return summary
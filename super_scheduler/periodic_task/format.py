@@ -1,5 +1,5 @@
-from pydantic import validator, root_validator
-from typing import Optional
+from pydantic import BaseModel, validator, root_validator
+from typing import List, Optional
 import json
 import datetime
 
@@ -8,8 +8,17 @@ from dateutil.tz import gettz
 
 from core.settings.base import TIME_ZONE
 
-from ..utils.get_task import get_all_periodic_task_names, get_all_task_names
+from ..utils.get_task import PERIODIC_TASK_FIELDS, SCHEDULE_TYPE_FIELDS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from ..utils.kwargs_parser import BaseFormat as BaseTaskParserFormat
+from ..utils.validation_context import get_validation_context
+from ..utils.schedule_load import MAX_HOURS
+from ..utils.polling_policy import POLLING_POLICIES
+from ..settings import LOAD_HOURS, LOAD_THRESHOLD
+from ..schedule.schedule_objects.custom.spread import SPREAD_WINDOW_KWARG, MAX_SPREAD_WINDOW
+from ..schedule.schedule_objects.custom.bitset_crontab import BITSET_CRONTAB_KWARG
+
+
+DISTRIBUTED_TASK = 'super_scheduler.tasks.group_otl'
 
 
 def add_name_to_kwargs(kwargs: dict, p_name: str) -> dict:
@@ -43,7 +52,7 @@ class TaskCreateFormat(BaseTaskParserFormat):
         """
         Check duplicate periodic task name in django database.
         """
-        if value in get_all_periodic_task_names():
+        if get_validation_context().periodic_task_exists(value):
             raise ValueError(f"Duplicate periodic task name {value}")
         return value
 
@@ -55,12 +64,98 @@ class TaskCreateFormat(BaseTaskParserFormat):
         values['kwargs']['name'] = values.get('name')
         return values
 
+    @root_validator(pre=True)
+    def add_max_parallel_in_kwargs(cls, values):
+        """
+        Move max parallel running instances of periodic task in kwargs, BaseTask reads it from there.
+        """
+        max_parallel = values.pop('max_parallel', None)
+        if max_parallel is None:
+            return values
+        try:
+            max_parallel = int(max_parallel)
+        except (TypeError, ValueError):
+            raise ValueError(f"'max_parallel' must be int, got {max_parallel}")
+        if max_parallel < 1:
+            raise ValueError("'max_parallel' must be >= 1")
+        values['kwargs']['max_parallel'] = max_parallel
+        return values
+
+    @root_validator(pre=True)
+    def add_spread_window_in_kwargs(cls, values):
+        """
+        Move spread window of crontab schedule in kwargs, scheduler reads it from there.
+        """
+        spread_window = values.pop(SPREAD_WINDOW_KWARG, None)
+        if spread_window is None:
+            return values
+        try:
+            spread_window = int(spread_window)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{SPREAD_WINDOW_KWARG}' must be int, got {spread_window}")
+        if not 1 <= spread_window <= MAX_SPREAD_WINDOW:
+            raise ValueError(f"'{SPREAD_WINDOW_KWARG}' must be between 1 and {MAX_SPREAD_WINDOW}")
+        values['kwargs'][SPREAD_WINDOW_KWARG] = spread_window
+        return values
+
+    @root_validator(pre=True)
+    def add_bitset_crontab_in_kwargs(cls, values):
+        """
+        Move marker of bitset crontab schedule in kwargs, scheduler reads it from there.
+        """
+        if values.pop(BITSET_CRONTAB_KWARG, False):
+            values['kwargs'][BITSET_CRONTAB_KWARG] = True
+        return values
+
+    @root_validator(pre=True)
+    def add_distributed_in_kwargs(cls, values):
+        """
+        Move flag of distributed group in kwargs, supported only by group_otl task.
+        """
+        distributed = values.pop('distributed', False)
+        if not distributed:
+            return values
+        if values.get('task') != DISTRIBUTED_TASK:
+            raise ValueError(f"'distributed' flag is supported only by task {DISTRIBUTED_TASK}")
+        values['kwargs']['distributed'] = True
+        return values
+
+    @root_validator(pre=True)
+    def polling_policy_exist(cls, values):
+        """
+        Check polling policy of otl tasks in kwargs, unknown one would fail every run.
+        """
+        kwargs = values.get('kwargs')
+        if not isinstance(kwargs, dict) or 'polling_policy' not in kwargs:
+            return values
+        if kwargs['polling_policy'] not in POLLING_POLICIES:
+            raise ValueError(f"Not correct polling policy {kwargs['polling_policy']}. "
+                             f"Available: {list(POLLING_POLICIES)}")
+        return values
+
+    @root_validator(pre=True)
+    def unique_definition(cls, values):
+        """
+        Optional 'unique' flag: reject periodic task if other one has the same task, args and kwargs.
+        """
+        unique = values.pop('unique', False)
+        if not unique:
+            return values
+        task, args, kwargs = values.get('task'), values.get('args', []), values.get('kwargs')
+        if not isinstance(task, str) or not isinstance(args, list) or not isinstance(kwargs, dict):
+            return values  # fields validation reports it
+        same = [name for name in get_validation_context().same_definition_names(task, args, kwargs)
+                if name != values.get('name')]
+        if same:
+            raise ValueError(f"Periodic tasks {same} have the same task, args and kwargs")
+        return values
+
     @validator('task')
     def task_exist(cls, value: str) -> str:
         """
         Check exist task.
         """
-        if value not in get_all_task_names():
+        if not get_validation_context().task_exists(value):
             raise ValueError(f"Task name {value} does not exist")
         return value
 
@@ -89,28 +184,28 @@ class TaskCreateFormat(BaseTaskParserFormat):
         return json.dumps(value)
 
     @validator("start_time")
-    def start_time_transform(cls, value: str) -> str:
+    def start_time_transform(cls, value: str) -> datetime.datetime:
         """
-        Parse & transform start_time to correct Django format - string.
+        Parse & transform start_time to correct Django format - datetime.
         """
         try:
             tzinfo = gettz(TIME_ZONE)
             value = parse(value, tzinfos={"PST": tzinfo, "PDT": tzinfo})
         except Exception as e:
             raise ValueError(f"Not correct 'start_time' param. Error: {e}")
-        return json.dumps(value)
+        return value
 
     @validator("expires")
-    def expires_transform(cls, value: str) -> str:
+    def expires_transform(cls, value: str) -> datetime.datetime:
         """
-        Parse & transform expires to correct Django format - string.
+        Parse & transform expires to correct Django format - datetime.
         """
         try:
             tzinfo = gettz(TIME_ZONE)
             value = parse(value, tzinfos={"PST": tzinfo, "PDT": tzinfo})
         except Exception as e:
             raise ValueError(f"Not correct 'expires' param. Error: {e}")
-        return json.dumps(value)
+        return value
 
 
 class TaskDeleteFormat(BaseTaskParserFormat):
@@ -123,6 +218,73 @@ class TaskDeleteFormat(BaseTaskParserFormat):
         """
         Check exist task.
         """
-        if value not in get_all_periodic_task_names():
+        if not get_validation_context().periodic_task_exists(value):
             raise ValueError(f"Periodic task name {value} does not exist")
         return value
+
+
+class TaskListFormat(BaseModel):
+    """
+    Task list format: filters, fields and page of periodic tasks; optional sections of response.
+    """
+    enabled: Optional[bool] = None
+    task: Optional[str] = None
+    name_prefix: Optional[str] = None
+    schedule_type: Optional[str] = None
+    owner: Optional[str] = None
+    fields: Optional[List[str]] = None
+    cursor: Optional[str] = None
+    limit: int = DEFAULT_PAGE_SIZE
+    running: bool = False
+    registered: bool = False
+    stats: bool = False
+
+    @validator('fields', pre=True)
+    def fields_split(cls, value):
+        """
+        Fields as list or comma-separated string.
+        """
+        if isinstance(value, str):
+            value = [field.strip() for field in value.split(',') if field.strip()]
+        return value
+
+    @validator('fields')
+    def fields_exist(cls, value: Optional[List[str]]) -> Optional[List[str]]:
+        if value is None:
+            return value
+        unknown = [field for field in value if field not in PERIODIC_TASK_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown periodic task fields {unknown}. Available: {PERIODIC_TASK_FIELDS}")
+        return value
+
+    @validator('schedule_type')
+    def schedule_type_exist(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and value not in SCHEDULE_TYPE_FIELDS:
+            raise ValueError(f"Not correct schedule type {value}. Available: {tuple(SCHEDULE_TYPE_FIELDS)}")
+        return value
+
+    @validator('limit')
+    def limit_range(cls, value: int) -> int:
+        if not 0 < value <= MAX_PAGE_SIZE:
+            raise ValueError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+        return value
+
+
+class TaskLoadFormat(BaseModel):
+    """
+    Schedule load format: hours of projection and max task starts in one second.
+    """
+    hours: int = LOAD_HOURS
+    threshold: int = LOAD_THRESHOLD
+
+    @validator('hours')
+    def hours_range(cls, value: int) -> int:
+        if not 0 < value <= MAX_HOURS:
+            raise ValueError(f"'hours' must be between 1 and {MAX_HOURS}")
+        return value
+
+    @validator('threshold')
+    def threshold_range(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("'threshold' must be >= 1")
+        return value
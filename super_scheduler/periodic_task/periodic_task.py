@@ -3,6 +3,8 @@ from typing import Optional, Tuple
 
 from ..utils.get_schedule import get_schedule_name_by_schedule_class
 from ..utils.kwargs_parser import KwargsParser
+from ..utils.validation_context import ValidationContext
+from ..utils.schedule_changes import notify_schedule_changed
 
 from .format import TaskCreateFormat, TaskDeleteFormat
 
@@ -23,16 +25,17 @@ class PeriodicTask:
         return schedule_name, None
 
     @classmethod
-    def get_or_create(cls, schedule, task_kwargs: dict) -> Optional[str]:
+    def get_or_create(cls, schedule, task_kwargs: dict, context: Optional[ValidationContext] = None) -> Optional[str]:
         """
         Add periodic task to django database.
 
         :param schedule: schedule class from super_scheduler.schedule.SCHEDULES
         :param task_kwargs: task kwargs
+        :param context: optional validation context of request
         :return: optional error msg
         """
 
-        task_kwargs, msg = KwargsParser.parse_kwargs(task_kwargs, TaskCreateFormat)
+        task_kwargs, msg = KwargsParser.parse_kwargs(task_kwargs, TaskCreateFormat, context)
         if task_kwargs is None:
             return msg
 
@@ -44,19 +47,21 @@ class PeriodicTask:
             **{schedule_name: schedule},
             **task_kwargs,
         )
+        notify_schedule_changed([task_kwargs['name']])
 
         return None
 
     @classmethod
-    def delete(cls, task_kwargs: dict) -> Optional[str]:
+    def delete(cls, task_kwargs: dict, context: Optional[ValidationContext] = None) -> Optional[str]:
         """
         Delete periodic task with unused schedules.
 
         :param task_kwargs: task kwargs
+        :param context: optional validation context of request
         :return: optional error msg
         """
 
-        task_kwargs, msg = KwargsParser.parse_kwargs(task_kwargs, TaskDeleteFormat)
+        task_kwargs, msg = KwargsParser.parse_kwargs(task_kwargs, TaskDeleteFormat, context)
         if task_kwargs is None:
             return msg
 
@@ -65,4 +70,5 @@ class PeriodicTask:
         )
 
         task.delete()
+        notify_schedule_changed([task.name])
         return None
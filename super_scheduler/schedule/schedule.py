@@ -4,6 +4,7 @@ import logging
 
 from ..utils.get_schedule import get_schedule_class_and_format_by_name, get_all_schedules_subclasses
 from ..utils.kwargs_parser import KwargsParser
+from ..utils.schedule_cache import ScheduleCache
 
 from .format import ScheduleCreateFormat, ScheduleDeleteFormat
 from .schedule_objects import SCHEDULES, schedule_name2class
@@ -17,6 +18,8 @@ class Schedule:
     def get_or_create(cls, schedule_kwargs: dict) -> Tuple[any, Optional[str]]:
         """
         Create schedule class with validation format.
+        Schedule kwargs are canonicalized by format, so equivalent schedules are stored once;
+        found schedules are cached by canonical kwargs.
 
         :param schedule_kwargs: schedule kwargs
         :return: schedule class & None | None & error msg
@@ -33,9 +36,14 @@ class Schedule:
         if schedule_kwargs is None:
             return None, msg
 
+        schedule = ScheduleCache.get(schedule_name_dict['name'], schedule_kwargs)
+        if schedule is not None:
+            return schedule, None
+
         schedule, created = schedule_class.objects.get_or_create(
             **schedule_kwargs,
         )
+        ScheduleCache.put(schedule_name_dict['name'], schedule_kwargs, schedule)
 
         return None if schedule is False else schedule, None if isinstance(created, bool) else "Can't create schedule"
 
@@ -56,6 +64,7 @@ class Schedule:
             return False, f"Not exist schedule with schedule_subclass: {schedule_subclass}"
 
         schedule_name2class(schedule_name).from_schedule(schedule_subclass).delete()
+        ScheduleCache.invalidate()
         return True, None
 
     @classmethod
@@ -81,4 +90,5 @@ class Schedule:
             **schedule_kwargs,
         )
         schedule.delete()
+        ScheduleCache.invalidate()
         return None
@@ -1,7 +1,11 @@
+from typing import Tuple
+
 from .interval import IntervalDjangoSchedule, IntervalFormat
 from .crontab import CrontabDjangoSchedule, CrontabFormat
 from .solar import SolarDjangoSchedule, SolarFormat
 from .clocked import ClockedDjangoSchedule, ClockedFormat
+from .custom.bitset_crontab import BitsetCrontabDjangoSchedule, BitsetCrontabFormat, BITSET_CRONTAB_KWARG
+from .custom.spread import SpreadDjangoSchedule, SpreadFormat, SPREAD_TASK_PARAMS
 
 
 SCHEDULES = {
@@ -9,6 +13,19 @@ SCHEDULES = {
     'crontab': (CrontabDjangoSchedule, CrontabFormat),
     'solar': (SolarDjangoSchedule, SolarFormat),
     'clocked': (ClockedDjangoSchedule, ClockedFormat),
+    'bitset_crontab': (BitsetCrontabDjangoSchedule, BitsetCrontabFormat),
+    'spread': (SpreadDjangoSchedule, SpreadFormat),
+}
+
+# params of custom schedules kept in periodic task, schedule tables have no columns for them:
+# schedule type -> {schedule param: (periodic task param, default)}
+SCHEDULE_TASK_PARAMS = {
+    'spread': SPREAD_TASK_PARAMS,
+}
+# custom schedules sharing table with other schedule type are marked in periodic task:
+# schedule type -> periodic task param
+SCHEDULE_TASK_MARKERS = {
+    'bitset_crontab': BITSET_CRONTAB_KWARG,
 }
 
 
@@ -24,3 +41,30 @@ def schedule_name2format(name: str):
     Schedule type to schedule format.
     """
     return SCHEDULES[name][1]
+
+
+def schedule_name2field(name: str) -> str:
+    """
+    Schedule type to periodic task field; custom schedules are stored in tables of django_celery_beat schedules.
+    """
+    model = schedule_name2class(name)._meta.concrete_model
+    return next(key for key, (schedule_class, _) in SCHEDULES.items() if schedule_class is model)
+
+
+def move_task_params(schedule_kwargs, task_kwargs) -> Tuple[dict, dict]:
+    """
+    Move params of custom schedule kept in periodic task from schedule kwargs to task kwargs, set marker
+    of custom schedule in task kwargs.
+
+    :return: schedule kwargs & task kwargs, not dicts are returned as is
+    """
+    if not isinstance(schedule_kwargs, dict) or not isinstance(task_kwargs, dict):
+        return schedule_kwargs, task_kwargs
+    schedule_kwargs, task_kwargs = dict(schedule_kwargs), dict(task_kwargs)
+    for schedule_param, (task_param, default) in SCHEDULE_TASK_PARAMS.get(schedule_kwargs.get('name'), {}).items():
+        value = schedule_kwargs.pop(schedule_param, None)
+        task_kwargs[task_param] = default if value is None else value
+    marker = SCHEDULE_TASK_MARKERS.get(schedule_kwargs.get('name'))
+    if marker:
+        task_kwargs[marker] = True
+    return schedule_kwargs, task_kwargs
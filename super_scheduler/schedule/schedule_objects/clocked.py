@@ -4,6 +4,7 @@ from pydantic.fields import Field
 
 from dateutil.parser import parse
 from dateutil.tz import gettz
+from dateutil import tz
 
 from core.settings.base import TIME_ZONE
 
@@ -26,7 +27,10 @@ class ClockedFormat(BaseScheduleFormat):
             value = parse(value, tzinfos={"PST": tzinfo, "PDT": tzinfo})
         except Exception as e:
             raise ValueError(f"Not correct 'clocked_time' param. Error: {e}")
-        return value
+        # canonical form: aware datetime in UTC, the same moment is stored once
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=tzinfo)
+        return value.astimezone(tz.UTC)
 
 
 ClockedDjangoSchedule = ClockedSchedule
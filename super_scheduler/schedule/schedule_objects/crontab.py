@@ -1,4 +1,5 @@
 from django_celery_beat.models import CrontabSchedule
+from celery.schedules import crontab_parser, ParseException
 from typing import Optional
 from pydantic import validator
 from pydantic.fields import Field
@@ -6,6 +7,38 @@ from pydantic.fields import Field
 from .base import BaseScheduleFormat
 
 
+# field -> (count of values, min value)
+CRONTAB_RANGES = {
+    'minute': (60, 0),
+    'hour': (24, 0),
+    'day_of_week': (7, 0),
+    'day_of_month': (31, 1),
+    'month_of_year': (12, 1),
+}
+
+
+def canonical_crontab_field(value: str, max_: int, min_: int) -> str:
+    """
+    Canonical form of crontab field with the same set of values: '*', '*/n' or sorted numbers and ranges,
+    e.g. '0,15,30,45' -> '*/15', 'mon-fri' -> '1-5'.
+    """
+    values = sorted(crontab_parser(max_, min_).parse(str(value)))
+    full = list(range(min_, max_ + min_))
+    if values == full:
+        return '*'
+    for step in range(2, max_):
+        if values == full[::step]:
+            return f'*/{step}'
+
+    parts, start = [], 0
+    for i in range(1, len(values) + 1):
+        if i == len(values) or values[i] != values[i - 1] + 1:
+            run = values[start:i]
+            parts += [f'{run[0]}-{run[-1]}'] if len(run) >= 3 else [str(value_) for value_ in run]
+            start = i
+    return ','.join(parts)
+
+
 class CrontabFormat(BaseScheduleFormat):
     minute: str = Field(
         default="*",
@@ -33,5 +66,15 @@ class CrontabFormat(BaseScheduleFormat):
         example="--month_of_year 1,3"
     )
 
+    @validator('minute', 'hour', 'day_of_week', 'day_of_month', 'month_of_year', always=True)
+    def canonicalize(cls, value, field):
+        """
+        Check field and transform it to canonical form, equivalent crontabs are stored once.
+        """
+        try:
+            return canonical_crontab_field(value, *CRONTAB_RANGES[field.name])
+        except (ParseException, ValueError) as e:
+            raise ValueError(f"Not correct '{field.name}' param. Error: {e}")
+
 
 CrontabDjangoSchedule = CrontabSchedule
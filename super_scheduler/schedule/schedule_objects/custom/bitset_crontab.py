@@ -0,0 +1,199 @@
+from django_celery_beat.models import CrontabSchedule
+from celery.schedules import crontab, crontab_parser, schedstate
+from celery.utils.time import localize
+from typing import Optional
+import datetime
+import calendar
+
+from ..crontab import CrontabFormat
+from .base import BaseCelerySchedule
+
+
+# kwargs key of periodic task created as 'bitset_crontab'; crontab table has no column for it
+BITSET_CRONTAB_KWARG = 'bitset_crontab'
+# months searched for next fire time; impossible crontab (e.g. 30 of february) is never due
+MAX_SEARCH_MONTHS = 12 * 28
+NEVER_CHECK_TIMEOUT = 24 * 60 * 60  # seconds
+
+MINUTE = datetime.timedelta(minutes=1)
+
+
+def _mask(values) -> int:
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+def _next_bit(mask: int, start: int) -> Optional[int]:
+    """
+    The least set bit >= start.
+    """
+    mask >>= start
+    if not mask:
+        return None
+    return start + (mask & -mask).bit_length() - 1
+
+
+class BitsetCrontab(BaseCelerySchedule):
+    """
+    Crontab schedule compiled into bitmasks once.
+    Next fire time is found by scanning bits of month, day, hour and minute instead of expanding sets
+    of celery crontab on every check. Semantics of celery crontab: day of month and day of week must both match,
+    Sunday is day 0 of week. Unlike celery crontab, the first fire time after last run is due even if last run was
+    on previous day: celery skips the rest of hour of last run then. So only periodic tasks created as
+    'bitset_crontab' run as BitsetCrontab, crontab ones keep celery crontab.
+    """
+
+    def __init__(self, minute='*', hour='*', day_of_week='*', day_of_month='*', month_of_year='*',
+                 tz=None, nowfun=None, app=None):
+        self._orig_minute = minute
+        self._orig_hour = hour
+        self._orig_day_of_week = day_of_week
+        self._orig_day_of_month = day_of_month
+        self._orig_month_of_year = month_of_year
+        self._tz = tz
+        # the last computed fire time: beat checks entry with the same last run time until it's due
+        self._last_run_at = None
+        self._next_fire_at = None
+        self.minute_mask = _mask(crontab_parser(60).parse(str(minute)))
+        self.hour_mask = _mask(crontab_parser(24).parse(str(hour)))
+        self.day_of_week_mask = _mask(crontab_parser(7).parse(str(day_of_week)))
+        self.day_of_month_mask = _mask(crontab_parser(31, 1).parse(str(day_of_month)))
+        self.month_mask = _mask(crontab_parser(12, 1).parse(str(month_of_year)))
+        # days 1..31 of month matching day of week, by day of week of the first day
+        self._days_by_first_weekday = [
+            _mask(day for day in range(1, 32) if self.day_of_week_mask >> ((weekday + day - 1) % 7) & 1)
+            for weekday in range(7)
+        ]
+        super().__init__(nowfun=nowfun, app=app)
+
+    @classmethod
+    def from_crontab(cls, schedule: crontab, **kwargs) -> 'BitsetCrontab':
+        """
+        Compile celery crontab, timezone of django_celery_beat crontab is kept.
+        """
+        return cls(schedule._orig_minute, schedule._orig_hour, schedule._orig_day_of_week,
+                   schedule._orig_day_of_month, schedule._orig_month_of_year,
+                   tz=getattr(schedule, 'tz', None), nowfun=schedule.nowfun, app=schedule._app, **kwargs)
+
+    @property
+    def tz(self):
+        return self._tz or super().tz
+
+    def _day_mask(self, year: int, month: int) -> int:
+        """
+        Days of month matching day of month and day of week.
+        """
+        first_weekday = (calendar.weekday(year, month, 1) + 1) % 7  # Sunday is 0
+        days_in_month = calendar.monthrange(year, month)[1]
+        month_days = (1 << (days_in_month + 1)) - 2
+        return self.day_of_month_mask & self._days_by_first_weekday[first_weekday] & month_days
+
+    def next_fire(self, after: datetime.datetime) -> Optional[datetime.datetime]:
+        """
+        The first fire time after naive datetime, None if crontab is never due.
+        """
+        t = after.replace(second=0, microsecond=0) + MINUTE
+        year, month, day, hour, minute = t.year, t.month, t.day, t.hour, t.minute
+        for _ in range(MAX_SEARCH_MONTHS):
+            if self.month_mask >> month & 1:
+                next_day = _next_bit(self._day_mask(year, month), day)
+                if next_day != day:
+                    hour, minute = 0, 0
+                day = next_day
+                while day is not None:
+                    next_hour = _next_bit(self.hour_mask, hour)
+                    if next_hour != hour:
+                        minute = 0
+                    hour = next_hour
+                    if hour is not None:
+                        minute = _next_bit(self.minute_mask, minute)
+                        if minute is not None:
+                            return datetime.datetime(year, month, day, hour, minute)
+                        hour, minute = hour + 1, 0
+                        continue
+                    day = _next_bit(self._day_mask(year, month), day + 1)
+                    hour, minute = 0, 0
+            next_month = _next_bit(self.month_mask, month + 1)
+            if next_month is None:
+                year, next_month = year + 1, _next_bit(self.month_mask, 1)
+            month, day, hour, minute = next_month, 1, 0, 0
+        return None
+
+    def _next_fire_after(self, after: datetime.datetime) -> Optional[datetime.datetime]:
+        """
+        The first fire time after aware datetime, None if crontab is never due.
+        """
+        tz = self.tz
+        next_fire = self.next_fire(after.astimezone(tz).replace(tzinfo=None))
+        return None if next_fire is None else localize(next_fire, tz)
+
+    def next_fire_at(self, last_run_at: datetime.datetime) -> Optional[datetime.datetime]:
+        """
+        Aware first fire time after last run, None if crontab is never due.
+        """
+        if last_run_at == self._last_run_at:
+            return self._next_fire_at
+        self._next_fire_at = self._next_fire_after(self.maybe_make_aware(last_run_at))
+        self._last_run_at = last_run_at
+        return self._next_fire_at
+
+    def remaining_estimate(self, last_run_at: datetime.datetime) -> Optional[datetime.timedelta]:
+        """
+        Time from now to the first fire time after last run, None if crontab is never due.
+        """
+        next_fire_at = self.next_fire_at(last_run_at)
+        if next_fire_at is None:
+            return None
+        return next_fire_at - self.maybe_make_aware(self.now())
+
+    def is_due(self, last_run_at: datetime.datetime) -> schedstate:
+        rem_delta = self.remaining_estimate(last_run_at)
+        if rem_delta is None:
+            return schedstate(False, NEVER_CHECK_TIMEOUT)
+        rem = max(rem_delta.total_seconds(), 0)
+        due = rem == 0
+        if due:
+            rem_delta = self.remaining_estimate(self.now())
+            rem = max(rem_delta.total_seconds(), 0) if rem_delta is not None else NEVER_CHECK_TIMEOUT
+        return schedstate(due, rem)
+
+    def __repr__(self):
+        return (f'<bitset crontab: {self._orig_minute} {self._orig_hour} {self._orig_day_of_week} '
+                f'{self._orig_day_of_month} {self._orig_month_of_year} (m/h/d/dM/MY)>')
+
+    def __reduce__(self):
+        return (self.__class__, (self._orig_minute, self._orig_hour, self._orig_day_of_week,
+                                 self._orig_day_of_month, self._orig_month_of_year, self._tz))
+
+    def __eq__(self, other):
+        if isinstance(other, BitsetCrontab):
+            return (self.minute_mask, self.hour_mask, self.day_of_week_mask, self.day_of_month_mask,
+                    self.month_mask, self._tz) == (other.minute_mask, other.hour_mask, other.day_of_week_mask,
+                                                   other.day_of_month_mask, other.month_mask, other._tz)
+        return NotImplemented
+
+    def __ne__(self, other):
+        res = self.__eq__(other)
+        if res is NotImplemented:
+            return True
+        return not res
+
+
+class BitsetCrontabDjangoSchedule(CrontabSchedule):
+    """
+    Crontab schedule stored in django_celery_beat crontab table, periodic task can refer only to its schedule
+    tables; periodic task is marked in kwargs ('bitset_crontab'), incremental scheduler runs it as BitsetCrontab.
+    """
+
+    class Meta:
+        proxy = True
+        app_label = 'BitsetCrontabDjangoSchedule'
+
+    @property
+    def schedule(self) -> BitsetCrontab:
+        return BitsetCrontab.from_crontab(super().schedule)
+
+
+BitsetCrontabFormat = CrontabFormat
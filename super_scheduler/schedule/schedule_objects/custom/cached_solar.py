@@ -0,0 +1,126 @@
+from celery.schedules import solar
+from typing import Dict, List, Optional
+import datetime
+import threading
+
+
+# days of solar events computed in one batch
+PRECOMPUTE_DAYS = 7
+# the longest period without solar event searched (polar day or night)
+MAX_SEARCH_DAYS = 366
+# rounding of coordinates in cache key, 0.001 degree changes time of event less than a second
+CACHE_DECIMAL_PLACES = 3
+NEVER_CHECK_TIMEOUT = datetime.timedelta(days=1)
+
+MINUTE = datetime.timedelta(minutes=1)
+DAY = datetime.timedelta(days=1)
+
+
+class SolarEventCache:
+    """
+    Process cache of solar event times by (event, rounded latitude, rounded longitude, utc date),
+    shared by all solar schedules. Missing date is computed with ephem together with next days.
+    """
+
+    _events: Dict[tuple, List[datetime.datetime]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def key(event: str, lat: float, lon: float, date: datetime.date) -> tuple:
+        return event, round(float(lat), CACHE_DECIMAL_PLACES), round(float(lon), CACHE_DECIMAL_PLACES), date
+
+    @classmethod
+    def _compute(cls, schedule: solar, start_date: datetime.date, days: int) -> Dict[tuple, List[datetime.datetime]]:
+        """
+        Utc times of solar event of schedule on dates [start_date, start_date + days).
+        """
+        ephem = schedule.ephem
+        event, lat, lon, _ = cls.key(schedule.event, schedule.lat, schedule.lon, start_date)
+        cal = ephem.Observer()
+        cal.lat = str(lat)
+        cal.lon = str(lon)
+        cal.elev = 0
+        cal.horizon = schedule._horizons[event]
+        cal.pressure = 0
+        method = getattr(cal, schedule.method)
+        kwargs = {'use_center': True} if schedule.use_center else {}
+
+        events = {cls.key(event, lat, lon, start_date + i * DAY): [] for i in range(days)}
+        # ephem works with naive utc datetimes
+        start = datetime.datetime.combine(start_date, datetime.time())
+        end = start + days * DAY
+        while start < end:
+            try:
+                next_utc = method(ephem.Sun(), start=start, **kwargs).datetime()
+            except ephem.CircumpolarError:
+                # no event today, continue after next anti-transit
+                cal.date = start
+                start = cal.next_antitransit(ephem.Sun()).datetime() + MINUTE
+                continue
+            if next_utc >= end:
+                break
+            events[cls.key(event, lat, lon, next_utc.date())].append(next_utc.replace(tzinfo=datetime.timezone.utc))
+            start = next_utc + MINUTE
+        return events
+
+    @classmethod
+    def events(cls, schedule: solar, date: datetime.date) -> List[datetime.datetime]:
+        """
+        Utc times of solar event of schedule on date.
+        """
+        key = cls.key(schedule.event, schedule.lat, schedule.lon, date)
+        events = cls._events.get(key)
+        if events is None:
+            computed = cls._compute(schedule, date, PRECOMPUTE_DAYS)
+            with cls._lock:
+                # forget passed days
+                yesterday = datetime.datetime.now(datetime.timezone.utc).date() - DAY
+                for old_key in [key_ for key_ in cls._events if key_[3] < yesterday]:
+                    del cls._events[old_key]
+                cls._events.update(computed)
+            events = computed[key]
+        return events
+
+    @classmethod
+    def next_event(cls, schedule: solar, after: datetime.datetime,
+                   now: datetime.datetime) -> Optional[datetime.datetime]:
+        """
+        The first solar event after aware datetime, None if there is no event before now + MAX_SEARCH_DAYS.
+        """
+        after = max(after, now - MAX_SEARCH_DAYS * DAY).astimezone(datetime.timezone.utc)
+        date, last_date = after.date(), (now + MAX_SEARCH_DAYS * DAY).astimezone(datetime.timezone.utc).date()
+        while date <= last_date:
+            for event in cls.events(schedule, date):
+                if event > after:
+                    return event
+            date += DAY
+        return None
+
+
+class CachedSolar(solar):
+    """
+    Solar schedule with event times from shared SolarEventCache instead of ephem computation on every check.
+    """
+
+    def __init__(self, event, lat, lon, **kwargs):
+        super().__init__(event, lat, lon, **kwargs)
+        # the last found event: beat checks entry with the same last run time until it's due
+        self._last_run_at = None
+        self._next_event_at = None
+
+    @classmethod
+    def from_solar(cls, schedule: solar) -> 'CachedSolar':
+        return cls(schedule.event, schedule.lat, schedule.lon, nowfun=schedule.nowfun, app=schedule._app)
+
+    def remaining_estimate(self, last_run_at: datetime.datetime) -> datetime.timedelta:
+        """
+        Time from now to the first solar event after last run; if the sun doesn't rise or set,
+        the time of next check.
+        """
+        now = self.maybe_make_aware(self.now())
+        if last_run_at != self._last_run_at:
+            next_event_at = SolarEventCache.next_event(self, self.maybe_make_aware(last_run_at), now)
+            if next_event_at is None:
+                return NEVER_CHECK_TIMEOUT
+            self._last_run_at, self._next_event_at = last_run_at, next_event_at
+        return self._next_event_at - now
@@ -0,0 +1,154 @@
+from django_celery_beat.models import CrontabSchedule
+from celery.schedules import crontab
+from typing import Dict, Iterable, List, Optional, Tuple
+import datetime
+import hashlib
+import operator
+
+from ....settings import SPREAD_WINDOW
+from ..crontab import CrontabFormat
+from .bitset_crontab import BitsetCrontab
+
+
+# kwargs key of periodic task with spread window (sec); crontab table has no column for it
+SPREAD_WINDOW_KWARG = 'spread_window'
+MAX_SPREAD_WINDOW = 3600
+# schedule param -> periodic task param & default
+SPREAD_TASK_PARAMS = {
+    'window': (SPREAD_WINDOW_KWARG, SPREAD_WINDOW),
+}
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def spread_offset(name: str, window: int) -> int:
+    """
+    Stable offset (sec) of periodic task in window, derived from hash of periodic task name.
+    """
+    digest = hashlib.sha256(name.encode()).digest()
+    return int.from_bytes(digest[:8], 'big') % window
+
+
+class SpreadCrontab(BitsetCrontab):
+    """
+    Crontab with every fire time shifted by offset (sec): cadence of crontab is kept,
+    periodic tasks with the same crontab start at different seconds.
+    """
+
+    def __init__(self, minute='*', hour='*', day_of_week='*', day_of_month='*', month_of_year='*',
+                 tz=None, nowfun=None, app=None, offset: int = 0):
+        self.offset = datetime.timedelta(seconds=offset)
+        super().__init__(minute, hour, day_of_week, day_of_month, month_of_year, tz=tz, nowfun=nowfun, app=app)
+
+    def _next_fire_after(self, after: datetime.datetime) -> Optional[datetime.datetime]:
+        next_fire_at = super()._next_fire_after(after - self.offset)
+        return None if next_fire_at is None else next_fire_at + self.offset
+
+    def __repr__(self):
+        return (f'<spread crontab: {self._orig_minute} {self._orig_hour} {self._orig_day_of_week} '
+                f'{self._orig_day_of_month} {self._orig_month_of_year} (m/h/d/dM/MY) '
+                f'+{int(self.offset.total_seconds())}s>')
+
+    def __reduce__(self):
+        return (self.__class__, (self._orig_minute, self._orig_hour, self._orig_day_of_week,
+                                 self._orig_day_of_month, self._orig_month_of_year, self._tz,
+                                 None, None, int(self.offset.total_seconds())))
+
+    def __eq__(self, other):
+        if isinstance(other, BitsetCrontab):
+            return isinstance(other, SpreadCrontab) and self.offset == other.offset and super().__eq__(other)
+        return NotImplemented
+
+
+class SpreadBalancer:
+    """
+    Projected task starts per second of day; offsets of spread periodic tasks are chosen where starts are fewest.
+    Crontab fire times are projected by hour and minute, days are ignored. Offset preferred by name hash
+    is taken on equal load, so offsets are stable while load doesn't change.
+    """
+
+    def __init__(self):
+        self._load = [0] * DAY_SECONDS
+        # periodic task name -> starts (sec of day) without offset, window, offset
+        self._placed: Dict[str, Tuple[Tuple[int, ...], Optional[int], int]] = {}
+
+    @staticmethod
+    def _starts(schedule: crontab) -> Tuple[int, ...]:
+        return tuple(hour * 3600 + minute * 60 for hour in sorted(schedule.hour) for minute in sorted(schedule.minute))
+
+    def _add(self, name: str, starts: Tuple[int, ...], window: Optional[int], offset: int):
+        self._placed[name] = starts, window, offset
+        load = self._load
+        for start in starts:
+            load[(start + offset) % DAY_SECONDS] += 1
+
+    def remove(self, name: str):
+        placed = self._placed.pop(name, None)
+        if placed is None:
+            return
+        starts, _, offset = placed
+        load = self._load
+        for start in starts:
+            load[(start + offset) % DAY_SECONDS] -= 1
+
+    def add(self, name: str, schedule: crontab):
+        """
+        Add periodic task starting without offset.
+        """
+        starts = self._starts(schedule)
+        if self._placed.get(name) != (starts, None, 0):
+            self.remove(name)
+            self._add(name, starts, None, 0)
+
+    def place(self, name: str, schedule: crontab, window: int) -> int:
+        """
+        Offset of spread periodic task; placed task keeps its offset while its crontab and window are the same.
+        """
+        starts = self._starts(schedule)
+        placed = self._placed.get(name)
+        if placed is not None and placed[:2] == (starts, window):
+            return placed[2]
+        self.remove(name)
+
+        load = self._load
+        costs = [0] * window
+        for start in starts:
+            end = start + window
+            row = load[start:end] if end <= DAY_SECONDS else load[start:] + load[:end - DAY_SECONDS]
+            costs = list(map(operator.add, costs, row))
+        preferred = spread_offset(name, window)
+        offset = min(range(window), key=lambda offset_: (costs[offset_], (offset_ - preferred) % window))
+        self._add(name, starts, window, offset)
+        return offset
+
+    def rebalance(self, items: Iterable[Tuple[str, crontab, Optional[int]]]):
+        """
+        Place all periodic tasks again: tasks without offset first, then spread ones from the most frequent.
+
+        :param items: periodic task name, crontab, spread window or None
+        """
+        self._load = [0] * DAY_SECONDS
+        self._placed.clear()
+        spread: List[Tuple[str, crontab, int]] = []
+        for name, schedule, window in items:
+            if window:
+                spread.append((name, schedule, window))
+            else:
+                self.add(name, schedule)
+        spread.sort(key=lambda item: (-len(item[1].hour) * len(item[1].minute), spread_offset(item[0], DAY_SECONDS)))
+        for name, schedule, window in spread:
+            self.place(name, schedule, window)
+
+
+class SpreadDjangoSchedule(CrontabSchedule):
+    """
+    Crontab schedule stored in django_celery_beat crontab table; window is kept in periodic task kwargs
+    ('spread_window'), incremental scheduler runs periodic task as SpreadCrontab.
+    """
+
+    class Meta:
+        proxy = True
+        app_label = 'SpreadDjangoSchedule'
+
+
+SpreadFormat = CrontabFormat
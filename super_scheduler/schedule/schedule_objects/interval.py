@@ -1,10 +1,20 @@
 from django_celery_beat.models import IntervalSchedule
-from pydantic import validator
+from pydantic import validator, root_validator
 from pydantic.fields import Field
 
 from .base import BaseScheduleFormat
 
 
+# from the largest period
+PERIOD_MICROSECONDS = {
+    IntervalSchedule.DAYS: 24 * 60 * 60 * 10 ** 6,
+    IntervalSchedule.HOURS: 60 * 60 * 10 ** 6,
+    IntervalSchedule.MINUTES: 60 * 10 ** 6,
+    IntervalSchedule.SECONDS: 10 ** 6,
+    IntervalSchedule.MICROSECONDS: 1,
+}
+
+
 class IntervalFormat(BaseScheduleFormat):
 
     every: int = Field(
@@ -41,5 +51,17 @@ class IntervalFormat(BaseScheduleFormat):
             raise ValueError(f"Not correct 'period' param. Available period formats: {period_formats}")
         return value
 
+    @root_validator(skip_on_failure=True)
+    def canonicalize(cls, values):
+        """
+        Express interval in the largest period it's divided by, e.g. 60 seconds -> 1 minutes.
+        """
+        microseconds = values['every'] * PERIOD_MICROSECONDS[values['period']]
+        for period, period_microseconds in PERIOD_MICROSECONDS.items():
+            if microseconds % period_microseconds == 0:
+                values['every'], values['period'] = microseconds // period_microseconds, period
+                break
+        return values
+
 
 IntervalDjangoSchedule = IntervalSchedule
@@ -1,10 +1,13 @@
 from django_celery_beat.models import SolarSchedule, SOLAR_SCHEDULES
 from typing import Union
-from pydantic import validator
+from pydantic import validator, root_validator
 
 from .base import BaseScheduleFormat
 
 
+COORDINATES_DECIMAL_PLACES = SolarSchedule._meta.get_field('latitude').decimal_places
+
+
 class SolarFormat(BaseScheduleFormat):
     event: str
     latitude: Union[int, float]
@@ -38,5 +41,14 @@ class SolarFormat(BaseScheduleFormat):
             raise ValueError("'Longitude' param must be >= -180 and <= 180")
         return value
 
+    @root_validator(skip_on_failure=True)
+    def canonicalize(cls, values):
+        """
+        Round coordinates to precision of database.
+        """
+        for field in ('latitude', 'longitude'):
+            values[field] = round(float(values[field]), COORDINATES_DECIMAL_PLACES)
+        return values
+
 
 SolarDjangoSchedule = SolarSchedule
@@ -0,0 +1,254 @@
+from typing import Dict, Iterable, Optional, Set
+import datetime
+import json
+import logging
+import time
+
+from celery.schedules import crontab, solar
+from django.db.models import Max
+from django.utils import timezone
+from django_celery_beat.schedulers import DatabaseScheduler, ModelEntry
+from redis.exceptions import RedisError
+
+from .utils.redis_client import get_redis_connection
+from .utils.due_heap import HeapTickMixin
+from .schedule.schedule_objects.custom.bitset_crontab import BitsetCrontab, BITSET_CRONTAB_KWARG
+from .schedule.schedule_objects.custom.cached_solar import CachedSolar
+from .schedule.schedule_objects.custom.spread import SpreadCrontab, SpreadBalancer, SPREAD_WINDOW_KWARG, spread_offset
+from .settings import SPREAD_REBALANCE, SOLAR_CACHE
+from .utils.schedule_changes import CHANGES_CHANNEL
+
+
+logger = logging.getLogger("super_scheduler.scheduler")
+
+# beat wakes up often, incremental sync costs only reading notifications
+DEFAULT_MAX_INTERVAL = 1  # seconds
+# check of django_celery_beat change marker for changes without notification (admin, beat itself, lost messages)
+CHANGE_CHECK_INTERVAL = 5  # seconds
+# periodic tasks changed during lag before last sync are read again: 'date_changed' is set before commit
+# and by clocks of other hosts, so rows can be committed with timestamps older than already read ones
+SYNC_LAG = datetime.timedelta(seconds=60)
+# notified periodic tasks are read by names in chunks
+NAMES_CHUNK_SIZE = 500
+
+
+class CompiledScheduleEntry(ModelEntry):
+    """
+    Entry of periodic task; crontab schedules of periodic tasks created as 'bitset_crontab' are compiled into
+    BitsetCrontab, of periodic tasks with spread window - into SpreadCrontab; other crontab schedules keep
+    celery crontab. Solar schedules take event times from cache (CachedSolar) if 'cache' is set in [solar] section
+    of config.
+    """
+
+    # offsets of spread crontab schedules are chosen by projected load, None - by hash of periodic task name
+    balancer: Optional[SpreadBalancer] = None
+
+    def __init__(self, model, app=None):
+        super().__init__(model, app=app)
+        if isinstance(self.schedule, crontab):
+            self.schedule = self._compile_crontab(self.schedule)
+            return
+        if self.balancer is not None:
+            # schedule type of periodic task was changed
+            self.balancer.remove(self.name)
+        if SOLAR_CACHE and isinstance(self.schedule, solar) and not isinstance(self.schedule, CachedSolar):
+            self.schedule = CachedSolar.from_solar(self.schedule)
+
+    def _compile_crontab(self, schedule: crontab):
+        window = self.kwargs.get(SPREAD_WINDOW_KWARG)
+        if not window:
+            if self.balancer is not None:
+                self.balancer.add(self.name, schedule)
+            if self.kwargs.get(BITSET_CRONTAB_KWARG):
+                return BitsetCrontab.from_crontab(schedule)
+            return schedule
+        window = int(window)
+        if self.balancer is not None:
+            offset = self.balancer.place(self.name, schedule, window)
+        else:
+            offset = spread_offset(self.name, window)
+        return SpreadCrontab.from_crontab(schedule, offset=offset)
+
+
+class RebalancedScheduleEntry(CompiledScheduleEntry):
+    """
+    Entry with offset of spread crontab schedule chosen by projected starts of all crontab entries.
+    """
+
+    balancer = SpreadBalancer()
+
+
+class IncrementalDatabaseScheduler(HeapTickMixin, DatabaseScheduler):
+    """
+    Database scheduler applying changes of periodic tasks incrementally.
+    Schedule is read from database once; after that only periodic tasks with 'date_changed' after last sync
+    (minus SYNC_LAG) and notified ones are read and replace their entries, entries of deleted and disabled
+    periodic tasks are removed. Changes made through super_scheduler api are published with names of periodic tasks
+    in redis channel 'super_scheduler:beat:changes', other changes are found by django_celery_beat change marker.
+    Entries are kept in min-heap by next fire time, tick checks only due entries.
+    Crontab schedules of periodic tasks created as 'bitset_crontab' run as BitsetCrontab ('crontab'
+    and 'bitset_crontab' schedule types share table, periodic task is marked in kwargs),
+    solar schedules run as CachedSolar if 'cache' is set in [solar] section of config.
+    Spread crontab offsets are chosen by projected load if 'rebalance' is set in [spread] section of config.
+
+    Usage: celery beat -S super_scheduler.scheduler:IncrementalDatabaseScheduler
+    """
+
+    Entry = RebalancedScheduleEntry if SPREAD_REBALANCE else CompiledScheduleEntry
+
+    def __init__(self, *args, **kwargs):
+        self._last_sync = None
+        self._last_change_check = 0
+        self._pubsub = None
+        self._notified_names: Set[str] = set()
+        # changes without notification can be deletions, they are found by full scan of periodic task names
+        self._scan_deleted = False
+        kwargs['max_interval'] = kwargs.get('max_interval') or DEFAULT_MAX_INTERVAL
+        super().__init__(*args, **kwargs)
+
+    def _subscribe(self):
+        try:
+            self._pubsub = get_redis_connection().pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(CHANGES_CHANNEL)
+        except RedisError as err:
+            logger.warning(f"Can't subscribe to changes of periodic tasks, only change marker is checked: {err}")
+            self._pubsub = None
+
+    def _notified(self) -> bool:
+        """
+        Read all published notifications, names of changed periodic tasks are kept for next apply of changes.
+
+        :return: periodic tasks were changed
+        """
+        if self._pubsub is None:
+            self._subscribe()
+            # changes made before subscription are found by change marker
+            self._scan_deleted = True
+            return self._pubsub is not None
+        notified = False
+        try:
+            while True:
+                message = self._pubsub.get_message(timeout=0)
+                if message is None:
+                    break
+                names = json.loads(message['data'])
+                logger.debug(f"Changed periodic tasks: {names}")
+                self._notified_names.update(names)
+                notified = True
+        except RedisError as err:
+            logger.warning(f"Lost subscription to changes of periodic tasks: {err}")
+            self._pubsub = None
+            self._scan_deleted = True
+            return True
+        return notified
+
+    def _changed(self) -> bool:
+        notified = self._notified()
+        now = time.monotonic()
+        if now - self._last_change_check < CHANGE_CHECK_INTERVAL:
+            return notified
+        self._last_change_check = now
+        # keep change marker timestamp in sync even if notification was received
+        if self.schedule_changed():
+            self._scan_deleted = True
+            return True
+        return notified
+
+    def _rebalance(self):
+        """
+        Place spread crontab schedules again by projected starts of all enabled crontab periodic tasks.
+        """
+        models = self.Model.objects.enabled().filter(crontab__isnull=False).select_related('crontab')
+        items = []
+        for model in models.iterator():
+            window = json.loads(model.kwargs or '{}').get(SPREAD_WINDOW_KWARG)
+            items.append((model.name, model.crontab.schedule, int(window) if window else None))
+        self.Entry.balancer.rebalance(items)
+        logger.info(f'Spread offsets rebalanced, crontab periodic tasks: {len(items)}')
+
+    def _remove_entry(self, name: str) -> bool:
+        """
+        :return: entry was in schedule
+        """
+        self.heap_remove(name)
+        if self.Entry.balancer is not None:
+            self.Entry.balancer.remove(name)
+        return self._schedule.pop(name, None) is not None
+
+    def all_as_schedule(self) -> Dict[str, DatabaseScheduler.Entry]:
+        last_sync = self.Model.objects.aggregate(last=Max('date_changed'))['last']
+        self._last_sync = last_sync and min(last_sync, timezone.now())
+        self._notified_names.clear()
+        self._scan_deleted = False
+        if self.Entry.balancer is not None:
+            self._rebalance()
+        return super().all_as_schedule()
+
+    def _changed_models(self, names: Iterable[str]):
+        """
+        Periodic tasks changed after last sync (with lag) and notified ones.
+        """
+        changed = self.Model.objects.all()
+        if self._last_sync is not None:
+            changed = changed.filter(date_changed__gte=self._last_sync - SYNC_LAG)
+        yield from changed.iterator()
+        if self._last_sync is None:
+            return
+        names = sorted(names)
+        for i in range(0, len(names), NAMES_CHUNK_SIZE):
+            yield from self.Model.objects.filter(name__in=names[i:i + NAMES_CHUNK_SIZE]).iterator()
+
+    def apply_changes(self) -> int:
+        """
+        Update schedule by periodic tasks changed after last sync and notified ones.
+        Notified periodic tasks which aren't found are deleted; all names are read only after change
+        without notification (change marker, lost subscription).
+
+        :return: count of added, updated and removed entries
+        """
+        names, self._notified_names = self._notified_names, set()
+        scan_deleted, self._scan_deleted = self._scan_deleted, False
+        # timestamps of hosts with clock ahead don't move last sync beyond own clock
+        now = timezone.now()
+
+        count, applied = 0, set()
+        for model in self._changed_models(names):
+            if model.name in applied:
+                continue
+            applied.add(model.name)
+            if self._last_sync is None or model.date_changed > self._last_sync:
+                self._last_sync = min(model.date_changed, now)
+            # rows read again during lag replace their entries idempotently
+            if not model.enabled:
+                count += self._remove_entry(model.name)
+                continue
+            try:
+                entry = self._schedule[model.name] = self.Entry(model, app=self.app)
+            except ValueError:
+                continue
+            self.heap_push(entry)
+            count += 1
+
+        # deleted periodic tasks can't be found by 'date_changed'
+        for name in names - applied:
+            count += self._remove_entry(name)
+        if scan_deleted:
+            enabled = set(self.Model.objects.enabled().values_list('name', flat=True))
+            for name in [name for name in self._schedule if name not in enabled]:
+                count += self._remove_entry(name)
+        return count
+
+    @property
+    def schedule(self) -> Dict[str, DatabaseScheduler.Entry]:
+        if self._initial_read:
+            logger.debug('Initial read of schedule')
+            self._initial_read = False
+            self._subscribe()
+            self._last_change_check = time.monotonic()
+            self.schedule_changed()
+            self._schedule = self.all_as_schedule()
+        elif self._changed():
+            self.sync()
+            count = self.apply_changes()
+            logger.info(f'Schedule changed, updated entries: {count}')
+        return self._schedule
@@ -48,6 +48,21 @@ JOBSMANAGER_TRANSIT = ini_config['api'].get('jobmanager', None)
 AUTH_URL = ini_config['api'].get('auth', None)
 SUPER_SCHEDULER_URL = ini_config['api'].get('super_scheduler_task', None)
 
+# HTTP
+
+http_config = ini_config['http'] if 'http' in ini_config else {}
+HTTP_POOL_SIZE = int(http_config.get('pool_size', '10'))
+HTTP_CONNECT_TIMEOUT = float(http_config.get('connect_timeout', '5'))
+HTTP_READ_TIMEOUT = float(http_config.get('read_timeout', '30'))
+
+# RESULTS
+
+result_config = ini_config['result'] if 'result' in ini_config else {}
+RESULT_SPOOL_DIR = result_config.get('spool_dir', str(Path(__file__).parent / 'tmp' / 'results'))
+RESULT_ROW_LIMIT = int(result_config.get('row_limit', '1000'))
+RESULT_SPOOL_MAX_SIZE = int(result_config.get('max_size_mb', '1024')) * 1024 * 1024
+RESULT_SPOOL_MAX_AGE = int(result_config.get('max_age', '86400'))
+
 # CELERY
 
 if 'celery' not in ini_config:
@@ -57,6 +72,31 @@ RETRY_JITTER = int(ini_config['celery'].get('retry_jitter', '3'))
 MAX_RETRY_BACKOFF = int(ini_config['celery'].get('max_retry_backoff', '300'))
 AUTO_DISABLE = bool(ini_config['celery'].get('auto-disable', 'True'))
 WAIT_FINISH_PREV_TASK = bool(ini_config['celery'].get('wait_finish_task', 'True'))
+LEASE_TTL = int(ini_config['celery'].get('lease_ttl', '60'))
+FAILURE_WINDOW = int(ini_config['celery'].get('failure_window', '3600'))
+BREAKER_OPEN_TIMEOUT = int(ini_config['celery'].get('breaker_open_timeout', '300'))
+POLL_POLICY = ini_config['celery'].get('poll_policy', 'exponential')
+POLL_INTERVAL = float(ini_config['celery'].get('poll_interval', '1'))
+POLL_MAX_INTERVAL = float(ini_config['celery'].get('poll_max_interval', '30'))
+GROUP_CONCURRENCY = int(ini_config['celery'].get('group_concurrency', '1'))
+OTL_COALESCING = ini_config['celery'].get('otl_coalescing', 'False').lower() == 'true'
+
+# SPREAD SCHEDULE
+
+spread_config = ini_config['spread'] if 'spread' in ini_config else {}
+SPREAD_WINDOW = int(spread_config.get('window', '60'))
+SPREAD_REBALANCE = spread_config.get('rebalance', 'False').lower() == 'true'
+
+# SOLAR SCHEDULE
+
+solar_config = ini_config['solar'] if 'solar' in ini_config else {}
+SOLAR_CACHE = solar_config.get('cache', 'False').lower() == 'true'
+
+# SCHEDULE LOAD
+
+load_config = ini_config['load'] if 'load' in ini_config else {}
+LOAD_HOURS = int(load_config.get('hours', '24'))
+LOAD_THRESHOLD = int(load_config.get('threshold', '50'))
 
 # STATIC SCHEDULES
 
@@ -1,31 +1,58 @@
-from django_celery_beat.models import PeriodicTask
+from celery.exceptions import Ignore
+from celery import chord, states
 from requests.exceptions import RequestException
-from pottery import RedisCounter
-from typing import Optional
-from redis import Redis
+from typing import Optional, Union, Iterator
 import requests
 import logging
 import celery
 import uuid
+import socket
 import json
 import time
 import os
 
 from core.celeryapp import app
-from core.settings.base import REDIS_CONNECTION_STRING
 from .settings import \
     COMPLEX_REST_ADDRESS, JOBSMANAGER_TRANSIT, \
-    MAX_RETRIES, RETRY_JITTER, MAX_RETRY_BACKOFF, AUTO_DISABLE, WAIT_FINISH_PREV_TASK
+    MAX_RETRIES, RETRY_JITTER, MAX_RETRY_BACKOFF, AUTO_DISABLE, WAIT_FINISH_PREV_TASK, LEASE_TTL, \
+    FAILURE_WINDOW, BREAKER_OPEN_TIMEOUT, \
+    POLL_POLICY, POLL_INTERVAL, POLL_MAX_INTERVAL, GROUP_CONCURRENCY, OTL_COALESCING, \
+    RESULT_SPOOL_DIR, RESULT_ROW_LIMIT, RESULT_SPOOL_MAX_SIZE, RESULT_SPOOL_MAX_AGE
 from .utils.del_schedule import del_unused_schedules
 from .utils.client_task import get_periodic_task_names_by_task_kwargs, \
     get_periodic_task_names_by_task_name, \
     get_task_name_by_class
-from .utils.get_task import get_all_active_tasks
+from .utils.task_lease import TaskLease
+from .utils.running_tasks import RunningTask
+from .utils.http_session import HttpSessions
+from .utils.polling_policy import BasePollingPolicy, FixedPollingPolicy, get_polling_policy
+from .utils.task_duration import record_task_duration
+from .utils.otl_coalescing import OtlJobCoalescer
+from .utils.result_spool import ResultSpool, CHUNK_SIZE
+from .utils.group_progress import start_group_progress, record_group_line, finish_group_progress
+from .utils.otl_group import OtlGroupExecutor, parse_dependencies, STOP_ON_FAILURE
+from .utils.failure_tracker import FailureTracker, SKIP as BREAKER_SKIP, PROBE as BREAKER_PROBE
 
 
 log = logging.getLogger("super_scheduler.tasks")
 
 
+class LeaseLostError(RuntimeError):
+    """
+    Re-enqueued run can't take lease of periodic task back.
+    """
+
+
+def get_otl_coalescer(otl_line: str, complex_rest_address: str, tws: int, twf: int, username: str, timeout: int,
+                      row_limit: int) -> Optional[OtlJobCoalescer]:
+    """
+    Single-flight of otl job; None if coalescing is off.
+    """
+    if not OTL_COALESCING:
+        return None
+    return OtlJobCoalescer(otl_line, complex_rest_address, tws, twf, username, timeout, row_limit)
+
+
 # os.getlogin() now work for WSL
 def get_current_user() -> str:
     try:
@@ -39,11 +66,20 @@ class BaseTask(celery.Task):
 
     MAX_ERROR_COUNTER = MAX_RETRIES
 
+    # state of run is kept in request (thread-local), task instance is shared by threads of worker
+    @property
+    def p_task_name(self) -> Optional[str]:
+        return getattr(self.request, 'p_task_name', None)
+
+    @property
+    def logger(self) -> logging.Logger:
+        return getattr(self.request, 'logger', log)
+
     # my init
     def init(self, task_id, args, kwargs):
-        self.p_task_name = self._get_p_task_name(args, kwargs)
+        self.request.p_task_name = self._get_p_task_name(args, kwargs)
         # self.logger = logging.getLogger(f"super_scheduler.tasks {self.request.hostname} {self.p_task_name} {task_id}")
-        self.logger = logging.getLogger(f"super_scheduler.task {self.p_task_name} {task_id}")
+        self.request.logger = logging.getLogger(f"super_scheduler.task {self.p_task_name} {task_id}")
 
     def _get_p_task_names(self, args, kwargs) -> list:
         """
@@ -70,63 +106,183 @@ class BaseTask(celery.Task):
 
         return p_task_name
 
-    def _check_another_running_task(self, task_id, args, kwargs):
-        if not WAIT_FINISH_PREV_TASK:
-            return
+    def _get_max_parallel(self, kwargs) -> Optional[int]:
+        """
+        Max parallel running instances of periodic task; None - unlimited.
+        """
+        max_parallel = kwargs.get('max_parallel', None)
+        if max_parallel is not None:
+            return int(max_parallel)
+        return 1 if WAIT_FINISH_PREV_TASK else None
 
-        p_task_name = self._get_p_task_name(args, kwargs)
-        p_task_id = task_id
+    def _acquire_lease(self, task_id, args, kwargs):
+        """
+        Take cluster-wide lease of periodic task; raise error if previous runs haven't been finished yet.
+        """
+        self.request.lease = None
 
-        running_tasks: list = get_all_active_tasks()[self.request.hostname]
+        max_parallel = self._get_max_parallel(kwargs)
+        if max_parallel is None:
+            return
 
-        running_task: dict
-        for running_task in running_tasks:
-            running_p_task_id = running_task['id']
-            args, kwargs = running_task['args'], running_task['kwargs']
-            running_p_task_name = self._get_p_task_name(args, kwargs)
+        # re-enqueued run of detached task continues lease of first run
+        lease_id = kwargs.get('lease_id', task_id)
+        lease = TaskLease(self.p_task_name, lease_id, max_parallel=max_parallel, ttl=LEASE_TTL)
+        if 'lease_id' in kwargs:
+            self._retake_lease(lease, args, kwargs)
+            return
+        if not lease.acquire():
+            log.error(f"Previous started periodic task with name {self.p_task_name} "
+                      f"haven't been finished yet")
+            raise ProcessLookupError(f"Previous started periodic task with name {self.p_task_name} "
+                                     f"haven't been finished yet")
+        self.request.lease = lease
+
+    def _retake_lease(self, lease: TaskLease, args, kwargs):
+        """
+        Take lease back by re-enqueued run regardless of running instances: lease could expire while message
+        was delayed or its place could be taken by new run, started job must be finished anyway.
+        """
+        try:
+            acquired = lease.acquire(force=True)
+        except Exception as err:
+            self.logger.error(f"Can't take lease back: {err}")
+            acquired = False
+        if not acquired:
+            # job is abandoned, identical tasks mustn't wait for it
+            self._release_coalescer(args, kwargs)
+            raise LeaseLostError(f"Lease of periodic task {self.p_task_name} can't be taken back by re-enqueued run")
+        self.request.lease = lease
+
+    def _release_coalescer(self, args, kwargs):
+        """
+        Release single-flight key of otl job made by re-enqueued run.
+        """
+        if not (kwargs.get('job_leader') and kwargs.get('sid') and args):
+            return
+        coalescer = get_otl_coalescer(args[0], kwargs['complex_rest_address'], kwargs['tws'], kwargs['twf'],
+                                      kwargs['username'], kwargs['timeout'], kwargs['row_limit'])
+        if coalescer is None:
+            return
+        try:
+            coalescer.release(kwargs['sid'])
+        except Exception as err:
+            self.logger.error(f"Can't release otl job {kwargs['sid']}: {err}")
 
-            if running_p_task_name == p_task_name and running_p_task_id != p_task_id:
-                log.error(f"Previous started periodic task with name {running_p_task_name} "
-                          f"haven't been finished yet")
-                raise ProcessLookupError(f"Previous started periodic task with name {running_p_task_name} "
-                                         f"haven't been finished yet")
+    def _keep_lease(self, ttl: int):
+        """
+        Keep lease after return for re-enqueued run of task.
 
-    @staticmethod
-    def _get_redis_task_attribute(p_task_name: str):
-        redis = Redis.from_url(REDIS_CONNECTION_STRING)
-        attribute = RedisCounter(redis=redis, key=p_task_name)
-        return attribute
+        :param ttl: seconds to hold lease without heartbeat
+        """
+        lease = getattr(self.request, 'lease', None)
+        if lease is not None:
+            lease.detach(ttl)
+            self.request.lease = None
+
+    def _release_lease(self):
+        lease = getattr(self.request, 'lease', None)
+        if lease is not None:
+            lease.release()
+            self.request.lease = None
+
+    def _register_running(self, task_id, kwargs):
+        """
+        Add run to registry of running tasks, read by API instead of broadcast inspect.
+        """
+        self.request.running_task = RunningTask(
+            self.p_task_name, task_id, self.name, self.request.hostname or socket.gethostname(),
+            sid=kwargs.get('sid'), ttl=LEASE_TTL,
+        )
+        self.request.running_task.register()
+
+    def _unregister_running(self):
+        running_task = getattr(self.request, 'running_task', None)
+        if running_task is not None:
+            running_task.unregister()
+            self.request.running_task = None
+
+    def _get_failure_tracker(self, p_task_name: str) -> FailureTracker:
+        return FailureTracker(p_task_name, threshold=self.MAX_ERROR_COUNTER, window=FAILURE_WINDOW,
+                              open_timeout=BREAKER_OPEN_TIMEOUT, enabled=AUTO_DISABLE)
+
+    def _check_circuit_breaker(self):
+        """
+        Skip run of periodic task with open circuit breaker; let through one probe run every open timeout.
+        """
+        decision = self._get_failure_tracker(self.p_task_name).allow()
+        if decision == BREAKER_SKIP:
+            self.logger.warning(f"Circuit breaker of periodic task '{self.p_task_name}' is open. Skip run.")
+            raise Ignore()
+        if decision == BREAKER_PROBE:
+            self.logger.info(f"Circuit breaker of periodic task '{self.p_task_name}' is half-open. Probe run.")
 
-    def _disable_task_after_fails(self, args, kwargs, exc):
+    def _track_failure(self, args, kwargs, exc):
 
         p_task_name = self._get_p_task_name(args, kwargs)
 
-        p_task_redis = self._get_redis_task_attribute(p_task_name)
-        p_task_redis['errors_counter'] += 1
+        count, opened = self._get_failure_tracker(p_task_name).record_failure()
 
         self.logger.error(f'Exception message: {exc}')
-        self.logger.error(f"Total errors with task {p_task_name}: {p_task_redis['errors_counter']}")
+        self.logger.error(f"Total errors with task {p_task_name} in last {FAILURE_WINDOW} sec: {count}")
+
+        if opened:
+            self.logger.error(f"Too many errors. Open circuit breaker of periodic task '{p_task_name}', "
+                              f"next probe run in {BREAKER_OPEN_TIMEOUT} sec.")
 
-        if AUTO_DISABLE and p_task_redis['errors_counter'] > self.MAX_ERROR_COUNTER:
-            self.logger.error(f"Too many errors. Disable periodic task '{p_task_name}'.")
+    def _track_success(self, args, kwargs):
+
+        p_task_name = self._get_p_task_name(args, kwargs)
 
-            p_task = PeriodicTask.objects.get(name=p_task_name)
-            p_task.enabled = False
-            p_task.save()
+        if self._get_failure_tracker(p_task_name).record_success():
+            self.logger.info(f"Probe run succeeded. Close circuit breaker of periodic task '{p_task_name}'.")
 
-            p_task_redis['errors_counter'] = 0
+    @staticmethod
+    def _is_group_line(kwargs) -> bool:
+        return 'group_id' in kwargs and 'group_name' in kwargs
 
     def before_start(self, task_id, args, kwargs):
 
         self.init(task_id, args, kwargs)
-        self._check_another_running_task(task_id, args, kwargs)
+        # re-enqueued run must finish started job, don't skip it;
+        # line of distributed group is accounted by breaker of group task, skipped line would block chord
+        if 'lease_id' not in kwargs and not self._is_group_line(kwargs):
+            self._check_circuit_breaker()
+        self._acquire_lease(task_id, args, kwargs)
+        self._register_running(task_id, kwargs)
 
     def on_retry(self, exc: str, task_id: str, args: list, kwargs: dict, einfo: str):
 
-        self._disable_task_after_fails(args, kwargs, exc)
+        # after_return isn't called for retried task, release lease here;
+        # re-enqueued run keeps lease for retry of started job
+        if 'lease_id' in kwargs:
+            self._keep_lease(MAX_RETRY_BACKOFF + LEASE_TTL)
+        else:
+            self._release_lease()
+        self._unregister_running()
+        self._track_failure(args, kwargs, exc)
+
+    def on_failure(self, exc, task_id: str, args: list, kwargs: dict, einfo):
+
+        # not started because of running previous task or not periodic task
+        if isinstance(exc, ProcessLookupError) or not get_periodic_task_names_by_task_kwargs(kwargs):
+            return
+        self._track_failure(args, kwargs, exc)
+
+    def after_return(self, status, retval, task_id: str, args: list, kwargs: dict, einfo):
+
+        self._release_lease()
+        self._unregister_running()
+        # line of distributed group
+        if self._is_group_line(kwargs):
+            record_group_line(kwargs['group_name'], kwargs['group_id'], status == states.SUCCESS)
 
     def on_success(self, retval, task_id: str, args: list, kwargs: dict):
-        pass
+
+        # run re-enqueued itself, job hasn't been finished yet
+        if getattr(self.request, 'reenqueued', False):
+            return
+        self._track_success(args, kwargs)
 
 
 @app.task(
@@ -175,32 +331,93 @@ def test_logger_msg_with_sleep(self, time_sleep: str, **kwargs) -> None:
         'retry_backoff_max': MAX_RETRY_BACKOFF,
     },
 )
-def trash_cleaner(self, clean_old_schedule: bool = True, **kwargs) -> None:
+def trash_cleaner(self, clean_old_schedule: bool = True, clean_results: bool = True, dry_run: bool = False,
+                  **kwargs) -> dict:
     """
     Clean trash in database: delete unused schedules.
+    Clean result spool: delete old results.
 
     :param clean_old_schedule: delete unused schedules
+    :param clean_results: delete saved otl results by age and spool size
+    :param dry_run: only count unused schedules
+    :return: metrics of deleting schedules: {schedule type: {"unused": ..., "deleted": ...}}
     """
     # sid = str(self.request.id)  # uuid.uuid4()
     self.logger.info(f'Trash cleaning...')
 
+    metrics = {}
     if clean_old_schedule:
-        del_unused_schedules()
+        metrics = del_unused_schedules(dry_run=str(dry_run).lower() == 'true')
+        self.logger.info(f'Unused schedules: {metrics}.')
+
+    if clean_results:
+        deleted = ResultSpool(RESULT_SPOOL_DIR).evict(RESULT_SPOOL_MAX_SIZE, RESULT_SPOOL_MAX_AGE)
+        if deleted:
+            self.logger.info(f'Deleted saved results: {deleted}.')
 
     self.logger.info(f'Trash cleaned.')
+    return metrics
+
+
+OTL_SUBMITTED, OTL_POLLING, OTL_DONE = 'submitted', 'polling', 'done'
 
 
 class OtlTaskMethods:
 
     base_url = f'http://{COMPLEX_REST_ADDRESS}/{JOBSMANAGER_TRANSIT}'
-    makejob_url = base_url + '/makejob'
-    checkjob_url = base_url + '/checkjob'
-    getresult_url = base_url + '/getresult'
 
-    def __init__(self, data, logger, complex_rest_address):
+    @property
+    def makejob_url(self) -> str:
+        return self.base_url + '/makejob'
+
+    @property
+    def checkjob_url(self) -> str:
+        return self.base_url + '/checkjob'
+
+    @property
+    def getresult_url(self) -> str:
+        return self.base_url + '/getresult'
+
+    def __init__(self, data, logger, complex_rest_address,
+                 polling_policy: Optional[BasePollingPolicy] = None, p_task_name: Optional[str] = None):
+        """
+        :param data: job data
+        :param logger: task logger
+        :param complex_rest_address: complex_rest address 'host:port'
+        :param polling_policy: policy of waiting between checkjob requests, default - fixed 1 sec
+        :param p_task_name: periodic task name for saving job durations
+        """
         self.base_url = f'http://{complex_rest_address}/{JOBSMANAGER_TRANSIT}'
+        self.complex_rest_address = complex_rest_address
         self.data = data
         self.logger = logger
+        self.polling_policy = polling_policy or FixedPollingPolicy()
+        self.p_task_name = p_task_name
+
+    @property
+    def checkjob_timeout(self) -> float:
+        """
+        Max time of waiting job, derived from job timeout.
+        """
+        return float(self.data['timeout'])
+
+    def record_duration(self, duration: float):
+        if self.p_task_name:
+            record_task_duration(self.p_task_name, duration)
+
+    @staticmethod
+    def job_data(sid: str, otl_line: str, tws: int, twf: int, username: str, ttl: int, timeout: int,
+                 row_limit: int = RESULT_ROW_LIMIT) -> dict:
+        row_limit = int(row_limit)
+        return {'sid': sid,
+                'original_otl': f'{otl_line} |head {row_limit}' if row_limit > 0 else otl_line,
+                'tws': tws,
+                'twf': twf,
+                'username': username,
+                'preview': 'false',
+                'field_extraction': 'false',
+                'cache_ttl': ttl,
+                'timeout': timeout}
 
     def request_error(self, content):
         self.logger.error(f'Content text: {content.text}.')
@@ -210,9 +427,9 @@ class OtlTaskMethods:
     def send_post_request_response_status(self, _url, _data, post=False, get=False) -> \
             (requests.Response, Optional[str]):
         if post:
-            response = requests.post(_url, data=_data)
+            response = HttpSessions.request('POST', _url, self.complex_rest_address, data=_data)
         elif get:
-            response = requests.get(_url, data=_data)
+            response = HttpSessions.request('GET', _url, self.complex_rest_address, data=_data)
         else:
             return None, None
         job_status = json.loads(response.content)['status'] if response.status_code == 200 else None
@@ -229,25 +446,99 @@ class OtlTaskMethods:
         self.logger.info(f'Created job.')
         return response
 
+    def makejob_coalesced(self, coalescer: Optional[OtlJobCoalescer] = None) -> bool:
+        """
+        Make job or attach to the same running job of another task; job sid is set in data.
+
+        :param coalescer: single-flight of identical jobs, None - always make job
+        :return: flag job was made by this task
+        """
+        if coalescer is None:
+            self.makejob()
+            return True
+
+        job_sid, job_leader = coalescer.join(self.data['sid'])
+        if not job_leader:
+            self.logger.info(f'Attached to the same running job {job_sid}.')
+            self.data = {**self.data, 'sid': job_sid}
+            return False
+
+        try:
+            self.makejob()
+        except Exception:
+            coalescer.release(job_sid)
+            raise
+        return True
+
     def checkjob(self) -> requests.Response:
 
         self.logger.info(f'Sending request on url: {self.checkjob_url}.')
 
+        time_start = time.time()
         response, job_status = self.send_post_request_response_status(self.checkjob_url, self.data, get=True)
 
-        time_start = time.time()
+        attempt = 0
         while job_status == 'running':
-            time.sleep(1)
+            elapsed = time.time() - time_start
+            if elapsed > self.checkjob_timeout:
+                raise TimeoutError(f"Job hasn't been finished in {self.checkjob_timeout} sec")
+            interval = self.polling_policy.next_interval(attempt, elapsed)
+            time.sleep(max(min(interval, self.checkjob_timeout - elapsed), 0))
+            attempt += 1
             response, job_status = self.send_post_request_response_status(self.checkjob_url, self.data, get=True)
-            if time.time() - time_start > 60:
-                raise TimeoutError
 
         if response.status_code != 200:
             self.request_error(response)
 
+        self.record_duration(time.time() - time_start)
         self.logger.info(f'Checked job.')
         return response
 
+    def checkjob_once(self) -> Optional[str]:
+        """
+        Check job without waiting.
+
+        :return: job status
+        """
+        self.logger.info(f'Sending request on url: {self.checkjob_url}.')
+
+        response, job_status = self.send_post_request_response_status(self.checkjob_url, self.data, get=True)
+
+        if response.status_code != 200:
+            self.request_error(response)
+
+        self.logger.info(f'Checked job, status: {job_status}.')
+        return job_status
+
+    def _iter_content(self, url: str) -> Iterator[bytes]:
+        with HttpSessions.request('GET', url, self.complex_rest_address, stream=True) as response:
+            if response.status_code != 200:
+                self.request_error(response)
+            yield from response.iter_content(chunk_size=CHUNK_SIZE)
+
+    def iter_result(self) -> Iterator[Iterator[bytes]]:
+        """
+        Stream data files of job result by chunks, without loading them in memory.
+
+        :return: iterator of byte chunks per data file
+        """
+        response = self.getresult()
+        for data_url in json.loads(response.content).get('data_urls', []):
+            yield self._iter_content(f'http://{self.complex_rest_address}/{data_url.lstrip("/")}')
+
+    def save_result(self, row_limit: int = RESULT_ROW_LIMIT) -> dict:
+        """
+        Save job result in local spool.
+
+        :param row_limit: max rows
+        :return: result meta
+        """
+        sid = self.data['sid']
+        meta = ResultSpool(RESULT_SPOOL_DIR).save(sid, self.iter_result(), row_limit=int(row_limit),
+                                                  p_task_name=self.p_task_name, username=self.data['username'])
+        self.logger.info(f"Saved result of job {sid}: {meta['rows']} rows.")
+        return meta
+
     def getresult(self) -> requests.Response:
 
         self.logger.info(f'Sending request on url: {self.getresult_url}.')
@@ -275,12 +566,16 @@ class OtlTaskMethods:
 )
 def otl(self, otl_line: str, complex_rest_address: str = COMPLEX_REST_ADDRESS,
         tws: int = 0, twf: int = 0, sid: Optional[str] = None, ttl: int = 100, timeout: int = 100,
-        username: str = 'admin', **kwargs) -> int:
+        username: str = 'admin', detached: bool = False, polling_policy: str = POLL_POLICY,
+        state: str = OTL_SUBMITTED, poll_attempt: int = 0, submitted_at: Optional[float] = None,
+        job_leader: bool = True, save_result: bool = False, row_limit: int = RESULT_ROW_LIMIT, **kwargs) -> int:
     """
     Run the OTL line on a schedule.
     For task.request: https://docs.celeryq.dev/en/stable/userguide/tasks.html#task-request-info.
     Frequently Asked Questions: https://docs.celeryq.dev/en/stable/faq.html#faq-acks-late-vs-retry.
 
+    Detached mode doesn't hold worker while job is running: after makejob task re-enqueues itself with countdown
+    and checks job once per run (state machine: submitted -> polling -> done), countdown is set by polling policy.
 
     :param otl_line: OTL line
     :param complex_rest_address: complex_rest address 'host:port'
@@ -290,39 +585,91 @@ def otl(self, otl_line: str, complex_rest_address: str = COMPLEX_REST_ADDRESS,
     :param ttl: timeout cache_ttl
     :param timeout: timeout
     :param username: username
+    :param detached: release worker while job is running
+    :param polling_policy: policy of waiting between job checks: fixed, exponential or predicted
+    :param state: state of detached task, set by task itself
+    :param poll_attempt: number of checkjob in detached task, set by task itself
+    :param submitted_at: time of makejob (epoch) in detached task, set by task itself
+    :param job_leader: job was made by this task, not attached to the same running job; set by task itself
+    :param save_result: save job result in local spool, read it with 'result' endpoint
+    :param row_limit: max rows of job result, 0 - no limit
     :return:
     """
 
     self.logger.info(f'Starting task...')
 
     sid = sid if sid else str(self.request.id)
+    detached = str(detached).lower() == 'true'
+    save_result = str(save_result).lower() == 'true'
 
     if not JOBSMANAGER_TRANSIT:
         self.logger.error("Add plugin jobsmanager.")
         raise ImportError("Add plugin jobsmanager.")
 
-    data = {'sid': sid,
-            'original_otl': f'{otl_line} |head 1000',
-            'tws': tws,
-            'twf': twf,
-            'username': username,
-            'preview': 'false',
-            'field_extraction': 'false',
-            'cache_ttl': ttl,
-            'timeout': timeout}
+    data = OtlTaskMethods.job_data(sid, otl_line, tws, twf, username, ttl, timeout, row_limit)
 
-    otl_manager = OtlTaskMethods(data, self.logger, complex_rest_address)
+    policy = get_polling_policy(polling_policy, interval=POLL_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+                                p_task_name=self.p_task_name)
+    otl_manager = OtlTaskMethods(data, self.logger, complex_rest_address, policy, self.p_task_name)
+    coalescer = get_otl_coalescer(otl_line, complex_rest_address, tws, twf, username, timeout, row_limit)
 
-    # make job
-    response = otl_manager.makejob()
+    try:
+        if state == OTL_SUBMITTED:
+            # make job or attach to the same running one
+            job_leader = otl_manager.makejob_coalesced(coalescer)
+            sid = otl_manager.data['sid']
+            submitted_at = time.time()
+
+            if not detached:
+                # check job; wait finish
+                response = otl_manager.checkjob()
+                state = OTL_DONE
 
-    # check job; wait finish
-    response = otl_manager.checkjob()
+        else:
+            # check job once in detached mode
+            job_status = otl_manager.checkjob_once()
+            elapsed = time.time() - submitted_at
+            if job_status != 'running':
+                otl_manager.record_duration(elapsed)
+                state = OTL_DONE
+            elif elapsed > otl_manager.checkjob_timeout:
+                raise TimeoutError(f"Job hasn't been finished in {otl_manager.checkjob_timeout} sec")
+    except Exception:
+        # failed leader doesn't wait job anymore, identical tasks make their own job instead of waiting key ttl
+        if job_leader and coalescer:
+            coalescer.release(sid)
+        raise
+
+    if state == OTL_DONE and job_leader and coalescer:
+        coalescer.release(sid)
+
+    if state != OTL_DONE:
+        elapsed = time.time() - submitted_at
+        countdown = max(min(policy.next_interval(poll_attempt, elapsed), otl_manager.checkjob_timeout - elapsed), 0)
+        self.logger.info(f'Job {sid} is running. Next check in {countdown} sec.')
+        self._keep_lease(countdown + LEASE_TTL)
+        self.apply_async(
+            args=(otl_line,),
+            kwargs={
+                **kwargs,
+                'complex_rest_address': complex_rest_address,
+                'tws': tws, 'twf': twf, 'sid': sid, 'ttl': ttl, 'timeout': timeout, 'username': username,
+                'detached': True, 'polling_policy': polling_policy,
+                'state': OTL_POLLING, 'poll_attempt': poll_attempt + 1, 'submitted_at': submitted_at,
+                'job_leader': job_leader, 'save_result': save_result, 'row_limit': row_limit,
+                'lease_id': kwargs.get('lease_id', self.request.id),
+            },
+            countdown=countdown,
+        )
+        self.request.reenqueued = True
+        return
 
     # get job
-    # response = otl_manager.getresult()
+    if save_result:
+        otl_manager.save_result(row_limit)
 
     self.logger.info(f'Finished task.')
+    self.logger.debug(f'Http connections stats: {HttpSessions.stats()}')
 
 
 @app.task(
@@ -339,9 +686,15 @@ def otl(self, otl_line: str, complex_rest_address: str = COMPLEX_REST_ADDRESS,
 )
 def group_otl(self, *otl_lines, complex_rest_address: str = COMPLEX_REST_ADDRESS,
               tws: int = 0, twf: int = 0, ttl: int = 100, timeout: int = 100,
-              username: str = 'admin', **kwargs):
+              username: str = 'admin', polling_policy: str = POLL_POLICY,
+              concurrency: int = GROUP_CONCURRENCY, depends: Optional[Union[str, dict]] = None,
+              failure_mode: str = STOP_ON_FAILURE, distributed: bool = False,
+              save_result: bool = False, row_limit: int = RESULT_ROW_LIMIT, **kwargs):
     """
-    Calculate OTL consistently in the group. If one fail, task stop.
+    Calculate OTL in the group: up to 'concurrency' lines at once, line waits for lines from 'depends'.
+    With 'stop' failure mode task stops after first fail; with 'continue' runs all lines which dependencies succeeded.
+    Concurrency 1 (default of config) without dependencies calculates lines consistently.
+    Distributed group sends lines to all workers as 'otl' subtasks joined by chord, task returns after sending.
 
     :param otl_lines: OTL lines
     :param complex_rest_address: complex_rest address 'host:port'
@@ -350,33 +703,110 @@ def group_otl(self, *otl_lines, complex_rest_address: str = COMPLEX_REST_ADDRESS
     :param ttl: timeout cache_ttl
     :param timeout: timeout
     :param username: username
+    :param polling_policy: policy of waiting between job checks: fixed, exponential or predicted
+    :param concurrency: max lines running at once, 'group_concurrency' of config by default
+    :param depends: dependencies of lines, numbers start from 0; example: {"2": [0, 1]} - line 2 waits lines 0 and 1
+    :param failure_mode: 'stop' or 'continue'
+    :param distributed: run lines as 'otl' subtasks on all workers; not supported with 'depends'
+    :param save_result: save job results of lines in local spool, read them with 'result' endpoint
+    :param row_limit: max rows of job result, 0 - no limit
     :return:
     """
 
     self.logger.info(f'Starting task...')
     self.logger.info(f"Got otl lines: {otl_lines}")
 
-    for otl_line in otl_lines:
-
+    dependencies = parse_dependencies(depends, len(otl_lines))
+
+    if str(distributed).lower() == 'true':
+        if dependencies:
+            raise ValueError("Dependencies of lines aren't supported in distributed group")
+
+        group_id = str(uuid.uuid4())
+        lease_id = kwargs.get('lease_id', self.request.id)
+        header = [
+            otl.s(otl_line, complex_rest_address=complex_rest_address, tws=tws, twf=twf, ttl=ttl, timeout=timeout,
+                  username=username, polling_policy=polling_policy, save_result=save_result, row_limit=row_limit,
+                  name=f'{self.p_task_name}:{line_number}', group_name=self.p_task_name, group_id=group_id)
+            for line_number, otl_line in enumerate(otl_lines)
+        ]
+        callback = group_otl_result.s(group_id=group_id, name=self.p_task_name, lease_id=lease_id)
+        callback.on_error(group_otl_error.s(group_id=group_id, name=self.p_task_name, lease_id=lease_id))
+
+        start_group_progress(self.p_task_name, group_id, len(otl_lines))
+        # lease is held until chord callback; upper bound - lines are calculated one by one
+        self._keep_lease(int(timeout) * len(otl_lines) + LEASE_TTL)
+        chord(header)(callback)
+
+        self.logger.info(f'Sent {len(otl_lines)} otl lines to workers, group id: {group_id}.')
+        return
+    p_task_name = self.p_task_name
+    logger = self.logger
+
+    def run_line(line_number: int):
+        otl_line = otl_lines[line_number]
         sid = str(uuid.uuid4())
 
-        self.logger.info(f'Starting otl line: {otl_line}.')
-        data = {'sid': sid,
-                'original_otl': f'{otl_line} |head 1000',
-                'tws': tws,
-                'twf': twf,
-                'username': username,
-                'preview': 'false',
-                'field_extraction': 'false',
-                'cache_ttl': ttl,
-                'timeout': timeout}
+        logger.info(f'Starting otl line: {otl_line}.')
+        data = OtlTaskMethods.job_data(sid, otl_line, tws, twf, username, ttl, timeout, row_limit)
+
+        # job durations are saved per line of group
+        line_name = f'{p_task_name}:{line_number}'
+        policy = get_polling_policy(polling_policy, interval=POLL_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+                                    p_task_name=line_name)
+        otl_manager = OtlTaskMethods(data, logger, complex_rest_address, policy, line_name)
+        coalescer = get_otl_coalescer(otl_line, complex_rest_address, tws, twf, username, timeout, row_limit)
+        job_leader = otl_manager.makejob_coalesced(coalescer)
+        try:
+            response = otl_manager.checkjob()
+        finally:
+            if job_leader and coalescer:
+                coalescer.release(sid)
+        if str(save_result).lower() == 'true':
+            otl_manager.save_result(row_limit)
+        logger.info(f'Finished otl line: {otl_line}.')
+
+    statuses = OtlGroupExecutor(
+        run_line, len(otl_lines),
+        concurrency=int(concurrency), dependencies=dependencies, failure_mode=failure_mode, logger=logger,
+    ).run()
+
+    self.logger.info(f'Finished task. Lines statuses: {statuses}')
+    self.logger.debug(f'Http connections stats: {HttpSessions.stats()}')
 
-        otl_manager = OtlTaskMethods(data, self.logger, complex_rest_address)
-        response = otl_manager.makejob()
-        response = otl_manager.checkjob()
-        self.logger.info(f'Finished otl line: {otl_line}.')
 
-    self.logger.info(f'Finished task.')
+@app.task(
+    base=BaseTask,
+    bind=True,  # use for more info in self param
+    result_extended=True,
+)
+def group_otl_result(self, results: list, group_id: str, **kwargs):
+    """
+    Chord callback of distributed group_otl: all lines succeeded.
+
+    :param results: results of lines
+    :param group_id: group id
+    """
+    finish_group_progress(self.p_task_name, group_id, success=True)
+    self.logger.info(f'Finished distributed group {group_id}.')
+
+
+@app.task(
+    base=BaseTask,
+    bind=True,  # use for more info in self param
+    result_extended=True,
+)
+def group_otl_error(self, task_id: str, group_id: str, **kwargs):
+    """
+    Chord errback of distributed group_otl: one of lines failed.
+    Raise error for failure accounting of periodic task.
+
+    :param task_id: chord callback id
+    :param group_id: group id
+    """
+    finish_group_progress(self.p_task_name, group_id, success=False)
+    self.logger.error(f'Failed distributed group {group_id}.')
+    raise RuntimeError(f"Distributed group {group_id} of periodic task {self.p_task_name} failed")
 
 
 # Выполнение bash-скриптов, проблемы безопасности
@@ -1,9 +1,18 @@
 from django.urls import re_path
 from .views.hello import HelloView
 from .views.task import TaskView
+from .views.task_bulk import TaskBulkView
+from .views.task_export import TaskExportView, TaskImportView
+from .views.task_load import TaskLoadView
+from .views.result import ResultView
 
 
 urlpatterns = [
     re_path('hello/', HelloView.as_view()),
     re_path(r'^task/?$', TaskView.as_view()),
+    re_path(r'^task/bulk/?$', TaskBulkView.as_view()),
+    re_path(r'^task/export/?$', TaskExportView.as_view()),
+    re_path(r'^task/import/?$', TaskImportView.as_view()),
+    re_path(r'^task/load/?$', TaskLoadView.as_view()),
+    re_path(r'^result/?$', ResultView.as_view()),
 ]
@@ -1,11 +1,11 @@
 from typing import Optional
-import ast
 
-from django_celery_beat.models import PeriodicTask
 import celery
 
 import logging
 
+from .task_fingerprint import TaskFingerprintIndex, task_fingerprint
+
 
 logger = logging.getLogger("super_scheduler")
 
@@ -19,18 +19,17 @@ def get_periodic_task_names_by_task_name(
         args: Optional[list] = None,
         kwargs: Optional[dict] = None,
 ) -> Optional[list]:
-    if not args:
-        args = []
+    """
+    Find periodic task names by fingerprint index of task, args and kwargs.
+    If kwargs have periodic task name, only this periodic task can be found.
+    """
     if not kwargs:
         kwargs = {}
-    all_periodic_tasks = PeriodicTask.objects.values('name', 'task', 'args', 'kwargs')
-    p_task_names = []
-    for p_task in all_periodic_tasks:
-        if p_task['task'] == task_name and \
-                ast.literal_eval(p_task['args']) == args and \
-                ast.literal_eval(p_task['kwargs']) == kwargs:
-            logger.info(f"Found periodic task {p_task['task']} with name {p_task['name']}")
-            p_task_names += [p_task['name']]
+    p_task_names = TaskFingerprintIndex.names(task_fingerprint(task_name, args, kwargs))
+    if 'name' in kwargs:
+        p_task_names = [p_task_name for p_task_name in p_task_names if p_task_name == kwargs['name']]
+    for p_task_name in p_task_names:
+        logger.info(f"Found periodic task {task_name} with name {p_task_name}")
     return p_task_names if p_task_names else None
 
 
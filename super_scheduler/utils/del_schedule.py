@@ -1,18 +1,53 @@
-from .get_schedule import get_all_schedules, get_all_schedules_subclasses, filter_unused_schedules_in_tasks
+from typing import Dict
+import logging
 
+from django.db import transaction, IntegrityError
 
-def del_unused_schedules():
-    """
-    Delete unused schedules.
+from ..schedule.schedule_objects import SCHEDULES
+from .schedule_cache import ScheduleCache
+
+
+logger = logging.getLogger("super_scheduler")
+
+BATCH_SIZE = 1000
+
+
+def del_unused_schedules(dry_run: bool = False, batch_size: int = BATCH_SIZE) -> Dict[str, Dict[str, int]]:
     """
-    all_schedule_classes = list(get_all_schedules())
-    all_schedule_subclasses = list(get_all_schedules_subclasses(all_schedule_classes))
-    schedule_dict = {str(subclass_): class_
-                     for class_, subclass_ in zip(all_schedule_classes, all_schedule_subclasses)}
+    Delete schedules not used by any periodic task.
+    Each schedule table is processed in batches of primary keys with anti-join query; delete statement checks
+    usage again, so schedule taken by periodic task created meanwhile isn't deleted; if periodic task takes it after
+    that check, foreign key of periodic task fails delete of batch and batch is skipped.
 
-    # delete used schedules from dict
-    schedule_dict = filter_unused_schedules_in_tasks(schedule_dict)
+    :param dry_run: only count unused schedules
+    :param batch_size: max schedules in one delete statement
+    :return: {schedule type: {"unused": unused schedules found, "deleted": deleted schedules}}
+    """
+    metrics = {}
+    for schedule_name, (schedule_class, schedule_format) in SCHEDULES.items():
+        if schedule_class._meta.proxy:
+            continue  # custom schedule in table of other schedule type
+        unused = schedule_class.objects.exclude(periodictask__isnull=False)
+        unused_count, deleted, last_pk = 0, 0, None
+        while True:
+            batch = unused.order_by('pk')
+            if last_pk is not None:
+                batch = batch.filter(pk__gt=last_pk)
+            pks = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            unused_count += len(pks)
+            last_pk = pks[-1]
+            if dry_run:
+                continue
+            try:
+                with transaction.atomic():
+                    # schedules are unused, so nothing is deleted in cascade
+                    deleted += unused.filter(pk__in=pks).delete()[0]
+            except IntegrityError as err:
+                logger.warning(f"Skip deleting batch of {schedule_name} schedules, they are used: {err}")
+        metrics[schedule_name] = {'unused': unused_count, 'deleted': deleted}
 
-    # delete unused schedules
-    for key, val in schedule_dict.items():
-        val.delete()
+    if any(metric['deleted'] for metric in metrics.values()):
+        ScheduleCache.invalidate()
+    return metrics
@@ -0,0 +1,130 @@
+from typing import Dict, List, Optional
+import itertools
+import heapq
+import time
+
+
+# the least delay of re-checked entry, entry isn't checked twice in one tick
+MIN_DELAY = 0.001
+
+
+class HeapItem:
+    """
+    Schedule entry with precomputed next fire time (unix timestamp).
+    """
+    __slots__ = ('due_at', 'seq', 'name', 'entry')
+
+    def __init__(self, due_at: float, seq: int, name: str, entry):
+        self.due_at = due_at
+        self.seq = seq
+        self.name = name
+        self.entry = entry
+
+    def __lt__(self, other: 'HeapItem') -> bool:
+        return (self.due_at, self.seq) < (other.due_at, other.seq)
+
+
+class DueTimeHeap:
+    """
+    Min-heap of schedule entries by next fire time, one item per entry name.
+    Replaced and removed items stay in heap and are skipped on reaching the top;
+    heap is rebuilt when stale items outnumber alive ones.
+    """
+
+    def __init__(self):
+        self._heap: List[HeapItem] = []
+        self._items: Dict[str, HeapItem] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, name: str, entry, due_at: float):
+        """
+        Add entry or replace entry with the same name.
+        """
+        item = HeapItem(due_at, next(self._seq), name, entry)
+        self._items[name] = item
+        heapq.heappush(self._heap, item)
+        if len(self._heap) > 2 * len(self._items) + 64:
+            self._compact()
+
+    def remove(self, name: str):
+        self._items.pop(name, None)
+
+    def peek(self) -> Optional[HeapItem]:
+        """
+        Item with the earliest fire time.
+        """
+        heap = self._heap
+        while heap and self._items.get(heap[0].name) is not heap[0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _compact(self):
+        self._heap = list(self._items.values())
+        heapq.heapify(self._heap)
+
+
+class HeapTickMixin:
+    """
+    Tick of celery beat scheduler over min-heap of entries by next fire time.
+    Celery Scheduler.tick compares all entries with copy of schedule on every tick; here tick touches only
+    entries whose precomputed fire time has come, schedule changes are applied by heap_push and heap_remove.
+    Mix in before celery Scheduler subclass.
+    """
+
+    _due_heap: Optional[DueTimeHeap] = None
+
+    def _due_at(self, entry, now: float) -> float:
+        is_due, next_time_to_run = self.is_due(entry)
+        return now if is_due else now + max(next_time_to_run, MIN_DELAY)
+
+    def populate_heap(self, *args, **kwargs):
+        now = time.time()
+        self._due_heap = DueTimeHeap()
+        for name, entry in self.schedule.items():
+            self._due_heap.push(name, entry, self._due_at(entry, now))
+
+    def heap_push(self, entry):
+        """
+        Add new or changed entry of schedule.
+        """
+        if self._due_heap is not None:
+            self._due_heap.push(entry.name, entry, self._due_at(entry, time.time()))
+
+    def heap_remove(self, name: str):
+        """
+        Remove entry of deleted or disabled periodic task.
+        """
+        if self._due_heap is not None:
+            self._due_heap.remove(name)
+
+    def tick(self, *args, **kwargs) -> float:
+        """
+        Send all due tasks.
+
+        :return: delay in seconds for next call
+        """
+        if self._due_heap is None:
+            self.populate_heap()
+        else:
+            # schedule changes are applied to heap on access
+            self.schedule
+
+        now = time.time()
+        heap = self._due_heap
+        while True:
+            item = heap.peek()
+            if item is None:
+                return self.max_interval
+            if item.due_at > now:
+                return min(self.adjust(item.due_at - now) or self.max_interval, self.max_interval)
+
+            entry = item.entry
+            is_due, next_time_to_run = self.is_due(entry)
+            if is_due:
+                next_entry = self.reserve(entry)
+                self.apply_entry(entry, producer=self.producer)
+                entry = next_entry
+            heap.push(item.name, entry, now + max(next_time_to_run, MIN_DELAY))
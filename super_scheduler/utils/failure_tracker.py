@@ -0,0 +1,155 @@
+from typing import Tuple
+import time
+import uuid
+
+from .redis_client import get_redis_connection
+
+FAILURES_KEY_PREFIX = 'super_scheduler:failures:'
+BREAKER_KEY_PREFIX = 'super_scheduler:breaker:'
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+SKIP, ALLOW, PROBE = 0, 1, 2
+
+# KEYS[1] - breaker key; ARGV: now (ms), open timeout (ms), key ttl (ms)
+_ALLOW_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state or state == 'closed' then
+    return 1
+end
+local changed_at = tonumber(redis.call('HGET', KEYS[1], 'changed_at') or '0')
+if tonumber(ARGV[1]) - changed_at < tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'state', 'half_open', 'changed_at', ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 2
+"""
+
+# KEYS[1] - failures key, KEYS[2] - breaker key; ARGV: now (ms), window (ms), failure id, threshold, key ttl (ms)
+# negative threshold - only count failures
+_FAILURE_SCRIPT = """
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+local count = redis.call('ZCARD', KEYS[1])
+local threshold = tonumber(ARGV[4])
+if threshold < 0 then
+    return {count, 0}
+end
+local state = redis.call('HGET', KEYS[2], 'state')
+if state == 'half_open' or (state ~= 'open' and count > threshold) then
+    redis.call('HSET', KEYS[2], 'state', 'open', 'changed_at', ARGV[1])
+    redis.call('PEXPIRE', KEYS[2], ARGV[5])
+    return {count, 1}
+end
+return {count, 0}
+"""
+
+# KEYS[1] - failures key, KEYS[2] - breaker key
+# success of run started before breaker opened doesn't close open breaker
+_SUCCESS_SCRIPT = """
+local state = redis.call('HGET', KEYS[2], 'state')
+if state == 'half_open' then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+return 0
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class FailureTracker:
+    """
+    Failures of periodic task over sliding time window with circuit breaker (closed -> open -> half_open).
+    Closed: task runs, failures are counted. After more than 'threshold' failures in 'window' breaker opens.
+    Open: task runs are skipped. After 'open_timeout' one run is let through as a probe (half_open).
+    Half_open: probe success closes breaker, probe failure opens it again.
+    All transitions are done by lua scripts, so they are atomic across workers.
+    """
+
+    _allow_script = None
+    _failure_script = None
+    _success_script = None
+
+    def __init__(self, p_task_name: str, threshold: int, window: int = 3600, open_timeout: int = 300,
+                 enabled: bool = True):
+        """
+        :param p_task_name: periodic task name
+        :param threshold: max failures in window before breaker opens
+        :param window: sliding window in seconds
+        :param open_timeout: seconds between probes of opened breaker
+        :param enabled: if False, only count failures and never open breaker
+        """
+        self.p_task_name = p_task_name
+        self.failures_key = FAILURES_KEY_PREFIX + p_task_name
+        self.breaker_key = BREAKER_KEY_PREFIX + p_task_name
+        self.threshold = threshold
+        self.window_ms = window * 1000
+        self.open_timeout_ms = open_timeout * 1000
+        self.enabled = enabled
+
+    @property
+    def _breaker_ttl_ms(self) -> int:
+        return self.window_ms + self.open_timeout_ms
+
+    @classmethod
+    def _register_scripts(cls, redis):
+        if cls._allow_script is None:
+            cls._allow_script = redis.register_script(_ALLOW_SCRIPT)
+            cls._failure_script = redis.register_script(_FAILURE_SCRIPT)
+            cls._success_script = redis.register_script(_SUCCESS_SCRIPT)
+
+    def allow(self) -> int:
+        """
+        Check breaker before task start.
+
+        :return: SKIP - breaker is open, ALLOW - breaker is closed, PROBE - run is a probe of half-opened breaker
+        """
+        if not self.enabled:
+            return ALLOW
+        redis = get_redis_connection()
+        self._register_scripts(redis)
+        return int(self._allow_script(
+            keys=[self.breaker_key],
+            args=[_now_ms(), self.open_timeout_ms, self._breaker_ttl_ms],
+            client=redis,
+        ))
+
+    def record_failure(self) -> Tuple[int, bool]:
+        """
+        Add failure in window.
+
+        :return: failures count in window & flag breaker has been opened
+        """
+        redis = get_redis_connection()
+        self._register_scripts(redis)
+        threshold = self.threshold if self.enabled else -1
+        count, opened = self._failure_script(
+            keys=[self.failures_key, self.breaker_key],
+            args=[_now_ms(), self.window_ms, uuid.uuid4().hex, threshold, self._breaker_ttl_ms],
+            client=redis,
+        )
+        return int(count), bool(opened)
+
+    def record_success(self) -> bool:
+        """
+        Close breaker after successful probe.
+
+        :return: flag breaker has been closed
+        """
+        redis = get_redis_connection()
+        self._register_scripts(redis)
+        return bool(self._success_script(keys=[self.failures_key, self.breaker_key], client=redis))
+
+    def state(self) -> str:
+        """
+        Current breaker state.
+        """
+        state = get_redis_connection().hget(self.breaker_key, 'state')
+        return state.decode() if state else CLOSED
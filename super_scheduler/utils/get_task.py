@@ -1,15 +1,42 @@
-from django_celery_beat.models import PeriodicTask
+from typing import Iterable, List, Optional, Tuple
+import datetime
+import base64
+import json
+
+from django.db.models import QuerySet, JSONField
+from django.db.models.functions import Cast
+from django_celery_beat.models import PeriodicTask, PeriodicTasks
 
 from core.celeryapp import app
 
+from .running_tasks import get_running_tasks_by_host
+from .validation_context import ValidationContext
+
+
+PERIODIC_TASK_FIELDS = (
+    'task', 'name', 'args', 'kwargs', 'enabled', 'one_off', 'priority', 'total_run_count',
+    'start_time', 'expires', 'date_changed', 'last_run_at',
+)
+# changed by beat on every run without notification of changes ('date_changed' is auto_now)
+PERIODIC_TASK_RUN_FIELDS = ('total_run_count', 'last_run_at', 'date_changed')
+# schedule type -> foreign key of periodic task
+SCHEDULE_TYPE_FIELDS = {
+    'interval': 'interval',
+    'crontab': 'crontab',
+    'solar': 'solar',
+    'clocked': 'clocked',
+}
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 
 def get_all_active_tasks() -> dict:
     """
-    Return all active tasks.
+    Return all running tasks from registry of BaseTask, without broadcast to workers.
 
-    return format: {hostname: [{task1: {"name": ..., }}]}
+    return format: {hostname: [{"name": ..., "task_id": ..., "task": ..., "host": ..., "started_at": ..., "sid": ...}]}
     """
-    return app.control.inspect().active()
+    return get_running_tasks_by_host()
 
 
 def get_all_periodic_tasks() -> set:
@@ -23,34 +50,93 @@ def get_all_periodic_task_names() -> list:
     """
     Return all periodic task names from django model.
     """
-    return [periodic_task.name for periodic_task in get_all_periodic_tasks()]
+    return list(PeriodicTask.objects.values_list('name', flat=True))
 
 
 def get_all_periodic_task_full():
-    res_p_tasks = {}
-    p_task: PeriodicTask
-    for p_task in get_all_periodic_tasks():
-        tmp_p_task = {'task': p_task.task,
-                      'name': p_task.name,
-                      'args': p_task.args,
-                      'kwargs': p_task.kwargs,
-                      'enabled': p_task.enabled,
-                      'one_off': p_task.one_off,
-                      'priority': p_task.priority,
-                      'total_run_count': p_task.total_run_count,
-                      'start_time': p_task.start_time,
-                      'expires': p_task.expires,
-                      'date_changed': p_task.date_changed,
-                      'last_run_at': p_task.last_run_at,}
-        res_p_tasks[p_task.name] = tmp_p_task
-    return res_p_tasks
+    return {p_task['name']: p_task for p_task in PeriodicTask.objects.values(*PERIODIC_TASK_FIELDS)}
+
+
+def get_periodic_tasks_last_update() -> Optional[datetime.datetime]:
+    """
+    Time of last change of periodic tasks, maintained by django_celery_beat; None if tasks haven't been changed.
+    """
+    return PeriodicTasks.last_change()
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([name]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Periodic task name after which page starts.
+    """
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))[0]
+    except (ValueError, TypeError, IndexError):
+        raise ValueError(f"Not correct cursor {cursor}")
+
+
+def filter_periodic_tasks(enabled: Optional[bool] = None, task: Optional[str] = None,
+                          name_prefix: Optional[str] = None, schedule_type: Optional[str] = None,
+                          owner: Optional[str] = None) -> QuerySet:
+    """
+    Periodic tasks filtered in database.
+
+    :param enabled: enabled or disabled tasks
+    :param task: task name
+    :param name_prefix: periodic task name prefix
+    :param schedule_type: interval, crontab, solar or clocked
+    :param owner: top-level 'username' kwarg of task
+    """
+    queryset = PeriodicTask.objects.all()
+    if enabled is not None:
+        queryset = queryset.filter(enabled=enabled)
+    if task:
+        queryset = queryset.filter(task=task)
+    if name_prefix:
+        queryset = queryset.filter(name__startswith=name_prefix)
+    if schedule_type:
+        queryset = queryset.filter(**{f'{SCHEDULE_TYPE_FIELDS[schedule_type]}__isnull': False})
+    if owner:
+        # kwargs are saved with json.dumps: cheap substring match first, then exact top-level key of parsed kwargs
+        queryset = queryset.filter(kwargs__contains=json.dumps({'username': owner})[1:-1]).alias(
+            kwargs_json=Cast('kwargs', JSONField())).filter(kwargs_json__username=owner)
+    return queryset
+
+
+def get_periodic_tasks_page(queryset: QuerySet, fields: Optional[Iterable[str]] = None,
+                            cursor: Optional[str] = None,
+                            limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[dict], Optional[str]]:
+    """
+    Page of periodic tasks ordered by name; only selected fields are queried.
+
+    :param queryset: filtered periodic tasks
+    :param fields: periodic task fields, None - all fields
+    :param cursor: cursor of previous page
+    :param limit: max periodic tasks in page
+    :return: periodic tasks & cursor of next page or None if it's the last page
+    """
+    fields = list(fields or PERIODIC_TASK_FIELDS)
+    if 'name' not in fields:
+        fields.append('name')
+    if cursor:
+        queryset = queryset.filter(name__gt=decode_cursor(cursor))
+    p_tasks = list(queryset.order_by('name').values(*fields)[:limit + 1])
+
+    next_cursor = None
+    if len(p_tasks) > limit:
+        p_tasks = p_tasks[:limit]
+        next_cursor = encode_cursor(p_tasks[-1]['name'])
+    return p_tasks, next_cursor
 
 
 def get_all_task_names() -> set:
     """
     Return all task names.
     """
-    return set(app.tasks.keys())
+    return set(ValidationContext.registered_tasks())
     # set_app_tasks = set(app.tasks.keys())
     # set_file_tasks = get_all_task_names_in_file()
     # return set_file_tasks
@@ -0,0 +1,85 @@
+from typing import Dict
+import time
+
+from .redis_client import get_redis_connection
+
+
+GROUPS_KEY = 'super_scheduler:group_progress'
+GROUP_KEY_PREFIX = 'super_scheduler:group_progress:'
+GROUP_TTL = 24 * 60 * 60
+
+RUNNING, SUCCESS, FAILED = 'running', 'success', 'failed'
+
+# KEYS[1] - group key; ARGV: group id, counter field
+_LINE_DONE_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'group_id') ~= ARGV[1] then
+    return 0
+end
+return redis.call('HINCRBY', KEYS[1], ARGV[2], 1)
+"""
+
+
+def start_group_progress(p_task_name: str, group_id: str, total: int):
+    """
+    Start tracking of distributed group run; replaces previous run of periodic task.
+
+    :param p_task_name: periodic task name
+    :param group_id: id of celery group
+    :param total: count of lines
+    """
+    key = GROUP_KEY_PREFIX + p_task_name
+    pipe = get_redis_connection().pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping={
+        'group_id': group_id,
+        'status': RUNNING,
+        'total': total,
+        'succeeded': 0,
+        'failed': 0,
+        'started_at': time.time(),
+    })
+    pipe.expire(key, GROUP_TTL)
+    pipe.sadd(GROUPS_KEY, p_task_name)
+    pipe.execute()
+
+
+def record_group_line(p_task_name: str, group_id: str, success: bool):
+    """
+    Count finished line of group run.
+    """
+    redis = get_redis_connection()
+    redis.eval(_LINE_DONE_SCRIPT, 1, GROUP_KEY_PREFIX + p_task_name, group_id, 'succeeded' if success else 'failed')
+
+
+def finish_group_progress(p_task_name: str, group_id: str, success: bool):
+    """
+    Set final status of group run.
+    """
+    key = GROUP_KEY_PREFIX + p_task_name
+    redis = get_redis_connection()
+    if redis.hget(key, 'group_id') != group_id.encode():
+        return
+    redis.hset(key, mapping={'status': SUCCESS if success else FAILED, 'finished_at': time.time()})
+
+
+def get_all_groups_progress() -> Dict[str, dict]:
+    """
+    Progress of last distributed group run of each periodic task.
+
+    return format: {periodic task name: {"group_id": ..., "status": ..., "total": ..., "succeeded": ..., ...}}
+    """
+    redis = get_redis_connection()
+    p_task_names = [name.decode() for name in redis.smembers(GROUPS_KEY)]
+    pipe = redis.pipeline()
+    for p_task_name in p_task_names:
+        pipe.hgetall(GROUP_KEY_PREFIX + p_task_name)
+
+    result, expired = {}, []
+    for p_task_name, progress in zip(p_task_names, pipe.execute()):
+        if not progress:
+            expired.append(p_task_name)
+            continue
+        result[p_task_name] = {key.decode(): value.decode() for key, value in progress.items()}
+    if expired:
+        redis.srem(GROUPS_KEY, *expired)
+    return result
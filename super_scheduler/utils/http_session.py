@@ -0,0 +1,95 @@
+from typing import Dict, Tuple
+import threading
+import os
+
+from celery.signals import worker_process_init
+from requests.adapters import HTTPAdapter
+import requests
+
+from ..settings import COMPLEX_REST_ADDRESS, HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+
+
+class HttpSessions:
+    """
+    Keep-alive http sessions of worker process, one session with connection pool per complex_rest address.
+    """
+
+    pool_size = HTTP_POOL_SIZE
+    timeout: Tuple[float, float] = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    _sessions: Dict[str, requests.Session] = {}
+    _lock = threading.Lock()
+    _pid = None
+
+    @classmethod
+    def _create_session(cls) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=cls.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @classmethod
+    def get(cls, complex_rest_address: str) -> requests.Session:
+        """
+        Get session for complex_rest address 'host:port'.
+        """
+        with cls._lock:
+            # sockets of parent process must not be shared with forked one
+            if cls._pid != os.getpid():
+                cls._sessions = {}
+                cls._pid = os.getpid()
+            session = cls._sessions.get(complex_rest_address)
+            if session is None:
+                session = cls._sessions[complex_rest_address] = cls._create_session()
+            return session
+
+    @classmethod
+    def reset(cls):
+        """
+        Close all sessions of process.
+        """
+        with cls._lock:
+            if cls._pid == os.getpid():
+                for session in cls._sessions.values():
+                    session.close()
+            cls._sessions = {}
+            cls._pid = os.getpid()
+
+    @classmethod
+    def request(cls, method: str, url: str, complex_rest_address: str, **kwargs) -> requests.Response:
+        """
+        Send request with keep-alive session; default timeout from config.
+        """
+        kwargs.setdefault('timeout', cls.timeout)
+        return cls.get(complex_rest_address).request(method, url, **kwargs)
+
+    @classmethod
+    def stats(cls) -> Dict[str, dict]:
+        """
+        Connection reuse stats per complex_rest address.
+
+        return format: {address: {"requests": ..., "connections": ..., "reused": ...}}
+        """
+        result = {}
+        with cls._lock:
+            sessions = dict(cls._sessions)
+        for address, session in sessions.items():
+            requests_count, connections_count = 0, 0
+            for adapter in set(session.adapters.values()):
+                for key in adapter.poolmanager.pools.keys():
+                    pool = adapter.poolmanager.pools[key]
+                    requests_count += pool.num_requests
+                    connections_count += pool.num_connections
+            result[address] = {
+                'requests': requests_count,
+                'connections': connections_count,
+                'reused': requests_count - connections_count,
+            }
+        return result
+
+
+@worker_process_init.connect
+def init_http_sessions(**kwargs):
+    HttpSessions.reset()
+    HttpSessions.get(COMPLEX_REST_ADDRESS)
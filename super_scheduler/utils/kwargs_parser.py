@@ -19,16 +19,17 @@ class BaseFormat(BaseModel):
 class KwargsParser:
 
     @classmethod
-    def parse_kwargs(cls, kwargs: dict, kwargs_format) -> Tuple[Optional[dict], Optional[str]]:
+    def parse_kwargs(cls, kwargs: dict, kwargs_format, context=None) -> Tuple[Optional[dict], Optional[str]]:
         """
         Parse kwargs.
 
         :param kwargs: task kwargs
         :param kwargs_format: pydantic kwargs format
+        :param context: optional validation context of request
         :return: parsed kwargs & None | None & msg error
         """
         try:
-            kwargs = validate_format(kwargs, kwargs_format)
+            kwargs = validate_format(kwargs, kwargs_format, context)
             return kwargs.dict(), None
         except Exception as err:
             return None, str(err)
@@ -0,0 +1,99 @@
+from typing import Tuple
+import hashlib
+import json
+import re
+
+from .redis_client import get_redis_connection
+
+
+JOB_KEY_PREFIX = 'super_scheduler:otl_job:'
+STATS_KEY = 'super_scheduler:otl_coalescing'
+
+_QUOTED = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+_SPACES = re.compile(r'\s+')
+
+# KEYS[1] - job key, KEYS[2] - stats key; ARGV: sid, ttl (sec)
+_JOIN_SCRIPT = """
+redis.call('HINCRBY', KEYS[2], 'total', 1)
+local job_sid = redis.call('GET', KEYS[1])
+if job_sid then
+    redis.call('HINCRBY', KEYS[2], 'coalesced', 1)
+    return {job_sid, 0}
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return {ARGV[1], 1}
+"""
+
+# KEYS[1] - job key; ARGV: sid
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def normalize_otl_line(otl_line: str) -> str:
+    """
+    Collapse whitespaces outside of quoted strings.
+    """
+    parts = _QUOTED.split(otl_line.strip())
+    return ''.join(part if i % 2 else _SPACES.sub(' ', part) for i, part in enumerate(parts))
+
+
+class OtlJobCoalescer:
+    """
+    Single-flight of identical OTL jobs: the first task makes job, concurrent tasks with the same
+    otl line, complex_rest address, time window and username attach to its sid and wait for the same job.
+    """
+
+    def __init__(self, otl_line: str, complex_rest_address: str, tws: int, twf: int, username: str, ttl: int,
+                 row_limit: int = 0):
+        """
+        :param otl_line: OTL line
+        :param complex_rest_address: complex_rest address 'host:port', jobs of different hosts are not coalesced
+        :param tws: Start search time (epoch)
+        :param twf: End search time (epoch)
+        :param username: username, jobs of different users are not coalesced
+        :param ttl: max seconds job is available for attaching
+        :param row_limit: max rows of job result
+        """
+        job_hash = hashlib.sha1(json.dumps(
+            [normalize_otl_line(otl_line), complex_rest_address, int(tws), int(twf), username, int(row_limit)]
+        ).encode()).hexdigest()
+        self.key = JOB_KEY_PREFIX + job_hash
+        self.ttl = max(int(ttl), 1)
+
+    def join(self, sid: str) -> Tuple[str, bool]:
+        """
+        Become leader of job or attach to running one.
+
+        :param sid: own search id
+        :return: job search id & flag own job must be made
+        """
+        job_sid, leader = get_redis_connection().eval(_JOIN_SCRIPT, 2, self.key, STATS_KEY, sid, self.ttl)
+        if isinstance(job_sid, bytes):
+            job_sid = job_sid.decode()
+        return job_sid, bool(leader)
+
+    def release(self, sid: str):
+        """
+        Finish job of leader, next tasks will make new job.
+        """
+        get_redis_connection().eval(_RELEASE_SCRIPT, 1, self.key, sid)
+
+
+def get_coalescing_stats() -> dict:
+    """
+    Count of otl jobs and jobs attached to running ones.
+
+    return format: {"total": ..., "coalesced": ..., "ratio": ...}
+    """
+    stats = get_redis_connection().hgetall(STATS_KEY)
+    total = int(stats.get(b'total', 0))
+    coalesced = int(stats.get(b'coalesced', 0))
+    return {
+        'total': total,
+        'coalesced': coalesced,
+        'ratio': coalesced / total if total else 0.0,
+    }
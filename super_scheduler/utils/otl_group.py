@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Union
+import json
+
+
+SUCCESS, FAILED, SKIPPED = 'success', 'failed', 'skipped'
+
+STOP_ON_FAILURE = 'stop'
+CONTINUE_ON_FAILURE = 'continue'
+FAILURE_MODES = (STOP_ON_FAILURE, CONTINUE_ON_FAILURE)
+
+
+def parse_dependencies(depends: Optional[Union[str, dict]], lines_count: int) -> Dict[int, List[int]]:
+    """
+    Parse and check dependencies of group lines.
+
+    :param depends: {line number: [line numbers it waits for]}, dict or json string; numbers start from 0
+    :param lines_count: count of lines in group
+    :return: dependencies with int keys
+    """
+    if not depends:
+        return {}
+    if isinstance(depends, str):
+        depends = json.loads(depends)
+
+    dependencies = {}
+    for line, line_depends in depends.items():
+        line = int(line)
+        line_depends = [int(dependency) for dependency in (
+            line_depends if isinstance(line_depends, (list, tuple)) else [line_depends])]
+        for number in [line] + line_depends:
+            if not 0 <= number < lines_count:
+                raise ValueError(f"Not correct line number {number} in dependencies; lines count: {lines_count}")
+        dependencies[line] = line_depends
+
+    # check cycles
+    visited, in_path = set(), set()
+
+    def visit(line_: int):
+        if line_ in in_path:
+            raise ValueError(f"Cycle in dependencies with line {line_}")
+        if line_ in visited:
+            return
+        in_path.add(line_)
+        for dependency_ in dependencies.get(line_, []):
+            visit(dependency_)
+        in_path.remove(line_)
+        visited.add(line_)
+
+    for line in dependencies:
+        visit(line)
+
+    return dependencies
+
+
+class OtlGroupExecutor:
+    """
+    Run lines of group concurrently with limit; line starts after all lines it depends on succeeded.
+    Failure modes:
+      stop - don't start new lines after first failure, wait running ones and raise the first error;
+      continue - run all lines which dependencies succeeded, raise the first error at the end.
+    """
+
+    def __init__(self, run_line: Callable[[int], None], lines_count: int, concurrency: int = 1,
+                 dependencies: Optional[Dict[int, List[int]]] = None, failure_mode: str = STOP_ON_FAILURE,
+                 logger=None):
+        """
+        :param run_line: function running line by its number
+        :param lines_count: count of lines in group
+        :param concurrency: max lines running at once
+        :param dependencies: {line number: [line numbers it waits for]}
+        :param failure_mode: 'stop' or 'continue'
+        :param logger: task logger
+        """
+        if failure_mode not in FAILURE_MODES:
+            raise ValueError(f"Not correct failure mode {failure_mode}. Available: {FAILURE_MODES}")
+        self.run_line = run_line
+        self.lines_count = lines_count
+        self.concurrency = max(int(concurrency), 1)
+        self.dependencies = dependencies or {}
+        self.failure_mode = failure_mode
+        self.logger = logger
+        self.statuses: Dict[int, str] = {}
+
+    def _ready_lines(self, pending: List[int]) -> List[int]:
+        return [line for line in pending
+                if all(self.statuses.get(dependency) == SUCCESS for dependency in self.dependencies.get(line, []))]
+
+    def _skip_unreachable_lines(self, pending: List[int]):
+        for line in pending:
+            if any(self.statuses.get(dependency) in (FAILED, SKIPPED)
+                   for dependency in self.dependencies.get(line, [])):
+                self.statuses[line] = SKIPPED
+                if self.logger:
+                    self.logger.warning(f'Skip otl line {line}: its dependencies failed.')
+
+    def run(self) -> Dict[int, str]:
+        """
+        Run group.
+
+        :return: line statuses: success, failed, skipped
+        """
+        pending = list(range(self.lines_count))
+        first_error = None
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            running = {}
+            while pending or running:
+                stop = first_error is not None and self.failure_mode == STOP_ON_FAILURE
+                if not stop:
+                    for line in self._ready_lines(pending)[:self.concurrency - len(running)]:
+                        pending.remove(line)
+                        running[executor.submit(self.run_line, line)] = line
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    line = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        self.statuses[line] = SUCCESS
+                    else:
+                        self.statuses[line] = FAILED
+                        first_error = first_error or error
+                        if self.logger:
+                            self.logger.error(f'Otl line {line} failed: {error}')
+
+                # repeat until no more lines become unreachable
+                skipped_count = None
+                while skipped_count != len(self.statuses):
+                    skipped_count = len(self.statuses)
+                    self._skip_unreachable_lines([line for line in pending if line not in self.statuses])
+                    pending = [line for line in pending if line not in self.statuses]
+
+        for line in pending:
+            self.statuses[line] = SKIPPED
+
+        if first_error is not None:
+            raise first_error
+        return self.statuses
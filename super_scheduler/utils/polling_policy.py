@@ -0,0 +1,82 @@
+from typing import Optional
+
+from .task_duration import get_task_duration
+
+
+class BasePollingPolicy:
+    """
+    Policy of waiting between checkjob requests.
+    """
+
+    def next_interval(self, attempt: int, elapsed: float) -> float:
+        """
+        :param attempt: number of done checks after the first one
+        :param elapsed: seconds since job was made
+        :return: seconds to sleep before next check
+        """
+        raise NotImplementedError()
+
+
+class FixedPollingPolicy(BasePollingPolicy):
+
+    def __init__(self, interval: float = 1, **kwargs):
+        self.interval = interval
+
+    def next_interval(self, attempt: int, elapsed: float) -> float:
+        return self.interval
+
+
+class ExponentialPollingPolicy(BasePollingPolicy):
+
+    def __init__(self, interval: float = 1, max_interval: float = 30, factor: float = 2, **kwargs):
+        self.interval = interval
+        self.max_interval = max_interval
+        self.factor = factor
+
+    def next_interval(self, attempt: int, elapsed: float) -> float:
+        return min(self.interval * self.factor ** attempt, self.max_interval)
+
+
+class PredictedPollingPolicy(BasePollingPolicy):
+    """
+    Sleep until job of periodic task is likely done (median of previous durations),
+    then fall back to exponential policy.
+    """
+
+    def __init__(self, p_task_name: Optional[str] = None, interval: float = 1, max_interval: float = 30, **kwargs):
+        self.p_task_name = p_task_name
+        self.interval = interval
+        self.fallback = ExponentialPollingPolicy(interval=interval, max_interval=max_interval)
+        self._predicted = None
+        self._predicted_loaded = False
+
+    @property
+    def predicted(self) -> Optional[float]:
+        if not self._predicted_loaded:
+            self._predicted = get_task_duration(self.p_task_name) if self.p_task_name else None
+            self._predicted_loaded = True
+        return self._predicted
+
+    def next_interval(self, attempt: int, elapsed: float) -> float:
+        if self.predicted is not None and self.predicted - elapsed > self.interval:
+            return self.predicted - elapsed
+        return self.fallback.next_interval(attempt, elapsed)
+
+
+POLLING_POLICIES = {
+    'fixed': FixedPollingPolicy,
+    'exponential': ExponentialPollingPolicy,
+    'predicted': PredictedPollingPolicy,
+}
+
+
+def get_polling_policy(name: str, **kwargs) -> BasePollingPolicy:
+    """
+    Polling policy by name.
+
+    :param name: policy name from POLLING_POLICIES
+    :param kwargs: policy params: interval, max_interval, p_task_name
+    """
+    if name not in POLLING_POLICIES:
+        raise ValueError(f"Not correct polling policy {name}. Available: {list(POLLING_POLICIES)}")
+    return POLLING_POLICIES[name](**kwargs)
@@ -0,0 +1,17 @@
+from redis import ConnectionPool, Redis
+
+from core.settings.base import REDIS_CONNECTION_STRING
+
+
+_connection_pool = None
+
+
+def get_redis_connection() -> Redis:
+    """
+    Return redis client on top of the process-wide connection pool.
+    Pool checks pid itself, so it is safe to use after worker fork.
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = ConnectionPool.from_url(REDIS_CONNECTION_STRING)
+    return Redis(connection_pool=_connection_pool)
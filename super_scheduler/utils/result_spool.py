@@ -0,0 +1,336 @@
+"""
+Local spool of OTL job results in columnar format.
+
+Result directory '<spool dir>/<sid>/':
+  meta.json - {"sid": ..., "columns": [{"name": ..., "type": "int" | "float" | "str"}, ...], "rows": ..., ...}
+  <column number>.data - int64 / float64 values or utf-8 strings of column one after another
+  <column number>.offsets - uint64 offsets of strings in .data file (rows + 1 values), only for 'str' columns
+Files are memory-mapped on reading, so slice of result is read without loading the whole result.
+Nulls of 'float' columns are NaN, nulls of 'str' columns are empty strings; 'int' columns with nulls become 'float'.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+from array import array
+import shutil
+import uuid
+import mmap
+import json
+import time
+import re
+import os
+
+
+INT, FLOAT, STR = 'int', 'float', 'str'
+TYPECODES = {INT: 'q', FLOAT: 'd'}
+OFFSETS_TYPECODE = 'Q'
+
+META_FILE = 'meta.json'
+FLUSH_ROWS = 4096
+CHUNK_SIZE = 64 * 1024
+
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+_SID_PATTERN = re.compile(r'^[\w.-]+$')
+
+
+def _check_sid(sid: str) -> str:
+    if not _SID_PATTERN.match(sid) or sid.startswith('.'):
+        raise ValueError(f"Not correct sid {sid}")
+    return sid
+
+
+def _value_type(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (bool, int)):
+        return INT if _INT64_MIN <= value <= _INT64_MAX else STR
+    if isinstance(value, float):
+        return FLOAT
+    return STR
+
+
+def _merge_types(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    if current is None or new is None:
+        return current or new
+    if STR in (current, new):
+        return STR
+    if FLOAT in (current, new):
+        return FLOAT
+    return INT
+
+
+def _str_value(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def iter_records(path: Path, row_limit: int) -> Iterator[dict]:
+    """
+    Records of newline-delimited json file.
+    """
+    rows = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if row_limit and rows >= row_limit:
+                return
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                record = {'_raw': record}
+            rows += 1
+            yield record
+
+
+class ResultSpool:
+    """
+    Write results to spool and read slices of them.
+    """
+
+    def __init__(self, spool_dir: str):
+        self.spool_dir = Path(spool_dir)
+
+    def result_dir(self, sid: str) -> Path:
+        return self.spool_dir / _check_sid(sid)
+
+    def save(self, sid: str, chunks: Iterable[Iterable[bytes]], row_limit: int = 0, **meta) -> dict:
+        """
+        Save result from streams of newline-delimited json chunks. Memory doesn't depend on result size:
+        chunks are written to temporary file, then columns types are inferred and columns are written row by row.
+
+        :param sid: search id
+        :param chunks: iterables of byte chunks, one per data file of result
+        :param row_limit: max rows, 0 - no limit
+        :param meta: additional info saved in meta
+        :return: meta
+        """
+        result_dir = self.result_dir(sid)
+        # unique temporary directory: tasks attached to the same job can save its result at once
+        tmp_dir = self.spool_dir / f'.{sid}.{uuid.uuid4().hex}.tmp'
+        tmp_dir.mkdir(parents=True)
+        try:
+            raw_path = tmp_dir / 'raw.json'
+            with open(raw_path, 'wb') as raw:
+                for data_chunks in chunks:
+                    for chunk in data_chunks:
+                        raw.write(chunk)
+                    raw.write(b'\n')
+
+            columns, rows = self._infer_columns(raw_path, row_limit)
+            self._write_columns(tmp_dir, raw_path, columns, rows)
+            raw_path.unlink()
+
+            meta = {
+                **meta,
+                'sid': sid,
+                'columns': [{'name': name, 'type': type_} for name, type_ in columns],
+                'rows': rows,
+                'created_at': time.time(),
+            }
+            with open(tmp_dir / META_FILE, 'w') as f:
+                json.dump(meta, f)
+
+            shutil.rmtree(result_dir, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, result_dir)
+            except OSError:
+                # result has been saved by another task at the same time
+                if not (result_dir / META_FILE).exists():
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return meta
+
+    @staticmethod
+    def _infer_columns(raw_path: Path, row_limit: int) -> Tuple[List[Tuple[str, str]], int]:
+        types, has_nulls, rows = {}, set(), 0
+        for record in iter_records(raw_path, row_limit):
+            rows += 1
+            for name in types:
+                if name not in record:
+                    has_nulls.add(name)
+            for name, value in record.items():
+                if name not in types:
+                    types[name] = None
+                    if rows > 1:
+                        has_nulls.add(name)
+                value_type = _value_type(value)
+                if value_type is None:
+                    has_nulls.add(name)
+                types[name] = _merge_types(types[name], value_type)
+
+        columns = []
+        for name, type_ in types.items():
+            if type_ is None:
+                type_ = STR
+            elif type_ == INT and name in has_nulls:
+                type_ = FLOAT
+            columns.append((name, type_))
+        return columns, rows
+
+    @staticmethod
+    def _write_columns(result_dir: Path, raw_path: Path, columns: List[Tuple[str, str]], rows: int):
+        files, offsets_files, buffers, offsets, positions = [], [], [], [], []
+        for number, (name, type_) in enumerate(columns):
+            files.append(open(result_dir / f'{number}.data', 'wb'))
+            if type_ == STR:
+                offsets_files.append(open(result_dir / f'{number}.offsets', 'wb'))
+                buffers.append([])
+                offsets.append(array(OFFSETS_TYPECODE, [0]))
+                positions.append(0)
+            else:
+                offsets_files.append(None)
+                buffers.append(array(TYPECODES[type_]))
+                offsets.append(None)
+                positions.append(None)
+
+        def flush():
+            for number_, (name_, type_) in enumerate(columns):
+                if type_ == STR:
+                    files[number_].write(b''.join(buffers[number_]))
+                    buffers[number_] = []
+                    offsets[number_].tofile(offsets_files[number_])
+                    offsets[number_] = array(OFFSETS_TYPECODE)
+                else:
+                    buffers[number_].tofile(files[number_])
+                    buffers[number_] = array(TYPECODES[type_])
+
+        try:
+            for row, record in enumerate(iter_records(raw_path, rows), start=1):
+                for number, (name, type_) in enumerate(columns):
+                    value = record.get(name)
+                    if type_ == STR:
+                        encoded = _str_value(value).encode()
+                        buffers[number].append(encoded)
+                        positions[number] += len(encoded)
+                        offsets[number].append(positions[number])
+                    elif type_ == FLOAT:
+                        buffers[number].append(float('nan') if value is None else float(value))
+                    else:
+                        buffers[number].append(int(value))
+                if row % FLUSH_ROWS == 0:
+                    flush()
+            flush()
+        finally:
+            for f in files + offsets_files:
+                if f is not None:
+                    f.close()
+
+    def meta(self, sid: str) -> Optional[dict]:
+        """
+        Meta of saved result or None if result doesn't exist.
+        """
+        meta_path = self.result_dir(sid) / META_FILE
+        if not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def read_slice(self, sid: str, offset: int = 0, limit: int = 100,
+                   columns: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        Read rows [offset, offset + limit) of saved result; only required parts of files are read.
+
+        :param sid: search id
+        :param offset: first row
+        :param limit: max rows
+        :param columns: column names, None - all columns
+        :return: {"sid": ..., "columns": [...], "rows": total rows, "offset": ..., "data": [{...}, ...]} or None
+        """
+        meta = self.meta(sid)
+        if meta is None:
+            return None
+
+        start = min(max(offset, 0), meta['rows'])
+        stop = min(start + max(limit, 0), meta['rows'])
+        result_dir = self.result_dir(sid)
+
+        selected = [(number, column) for number, column in enumerate(meta['columns'])
+                    if columns is None or column['name'] in columns]
+        values = {}
+        for number, column in selected:
+            values[column['name']] = self._read_column(result_dir, number, column['type'], start, stop)
+
+        data = [{name: column_values[row] for name, column_values in values.items()}
+                for row in range(stop - start)]
+        return {
+            'sid': sid,
+            'columns': [column for number, column in selected],
+            'rows': meta['rows'],
+            'offset': start,
+            'data': data,
+        }
+
+    @staticmethod
+    def _mmap(path: Path) -> Optional[mmap.mmap]:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def _read_column(cls, result_dir: Path, number: int, type_: str, start: int, stop: int) -> list:
+        if start >= stop:
+            return []
+        data = cls._mmap(result_dir / f'{number}.data')
+        if type_ != STR:
+            try:
+                with memoryview(data) as view:
+                    values = view.cast(TYPECODES[type_])[start:stop].tolist()
+                # NaN isn't valid json
+                return [None if value != value else value for value in values]
+            finally:
+                data.close()
+
+        offsets_map = cls._mmap(result_dir / f'{number}.offsets')
+        try:
+            with memoryview(offsets_map) as view:
+                offsets = view.cast(OFFSETS_TYPECODE)[start:stop + 1].tolist()
+            if data is None:
+                return [''] * (stop - start)
+            return [data[offsets[i]:offsets[i + 1]].decode() for i in range(stop - start)]
+        finally:
+            offsets_map.close()
+            if data is not None:
+                data.close()
+
+    def evict(self, max_size: int, max_age: int) -> List[str]:
+        """
+        Delete results older than max_age, then the oldest results while spool size is over max_size.
+
+        :param max_size: max spool size in bytes
+        :param max_age: max result age in seconds
+        :return: deleted sids
+        """
+        if not self.spool_dir.exists():
+            return []
+
+        results = []
+        for result_dir in self.spool_dir.iterdir():
+            if not result_dir.is_dir():
+                continue
+            # unfinished result of crashed worker
+            if result_dir.name.startswith('.'):
+                if time.time() - result_dir.stat().st_mtime > max_age:
+                    shutil.rmtree(result_dir, ignore_errors=True)
+                continue
+            size = sum(f.stat().st_size for f in result_dir.iterdir())
+            results.append((result_dir.stat().st_mtime, size, result_dir))
+        results.sort()
+
+        deleted = []
+        total_size = sum(size for _, size, _ in results)
+        now = time.time()
+        for mtime, size, result_dir in results:
+            if now - mtime <= max_age and total_size <= max_size:
+                break
+            shutil.rmtree(result_dir, ignore_errors=True)
+            total_size -= size
+            deleted.append(result_dir.name)
+        return deleted
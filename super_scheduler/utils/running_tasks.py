@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional
+import json
+import time
+
+from .redis_client import get_redis_connection
+from .task_lease import LeaseHeartbeat
+
+
+RUNNING_KEY = 'super_scheduler:running'
+RUNNING_EXPIRE_KEY = 'super_scheduler:running:expire'
+
+# KEYS[1] - expire key; ARGV: expire at (ms), task id
+_RENEW_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+# KEYS[1] - running key, KEYS[2] - expire key; ARGV: now (ms)
+_PURGE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+if #expired > 0 then
+    redis.call('HDEL', KEYS[1], unpack(expired))
+    redis.call('ZREM', KEYS[2], unpack(expired))
+end
+return #expired
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class RunningTask:
+    """
+    Entry of running tasks registry.
+    Entries are stored in redis hash 'super_scheduler:running' by task id, expire times are in sorted set,
+    entry is renewed by lease heartbeat of worker process and removed on reading after ttl of crashed worker.
+    """
+
+    key = RUNNING_EXPIRE_KEY
+
+    def __init__(self, p_task_name: str, task_id: str, task: str, host: str, sid: Optional[str] = None,
+                 ttl: int = 60):
+        """
+        :param p_task_name: periodic task name
+        :param task_id: task id
+        :param task: task function name
+        :param host: worker hostname
+        :param sid: search id of otl task
+        :param ttl: seconds entry is alive without heartbeat
+        """
+        self.holder_id = task_id
+        self.ttl_ms = ttl * 1000
+        self.entry = {
+            'name': p_task_name,
+            'task_id': task_id,
+            'task': task,
+            'host': host,
+            'started_at': time.time(),
+            'sid': sid,
+        }
+
+    def register(self):
+        """
+        Add entry to registry and start heartbeat.
+        """
+        pipe = get_redis_connection().pipeline()
+        pipe.hset(RUNNING_KEY, self.holder_id, json.dumps(self.entry))
+        pipe.zadd(RUNNING_EXPIRE_KEY, {self.holder_id: _now_ms() + self.ttl_ms})
+        pipe.execute()
+        LeaseHeartbeat.add(self)
+
+    def renew(self) -> bool:
+        """
+        Prolong entry on ttl.
+
+        :return: False if entry was removed
+        """
+        return bool(get_redis_connection().eval(
+            _RENEW_SCRIPT, 1, RUNNING_EXPIRE_KEY, _now_ms() + self.ttl_ms, self.holder_id))
+
+    def unregister(self):
+        """
+        Remove entry. Safe to call when entry doesn't exist.
+        """
+        LeaseHeartbeat.remove(self)
+        pipe = get_redis_connection().pipeline()
+        pipe.hdel(RUNNING_KEY, self.holder_id)
+        pipe.zrem(RUNNING_EXPIRE_KEY, self.holder_id)
+        pipe.execute()
+
+
+def get_running_tasks() -> List[dict]:
+    """
+    Alive entries of running tasks registry; entries of crashed workers are removed.
+
+    return format: [{"name": ..., "task_id": ..., "task": ..., "host": ..., "started_at": ..., "sid": ...}]
+    """
+    redis = get_redis_connection()
+    redis.eval(_PURGE_SCRIPT, 2, RUNNING_KEY, RUNNING_EXPIRE_KEY, _now_ms())
+    entries = [json.loads(entry) for entry in redis.hvals(RUNNING_KEY)]
+    return sorted(entries, key=lambda entry: entry['started_at'])
+
+
+def get_running_tasks_by_host() -> Dict[str, List[dict]]:
+    """
+    Alive entries of running tasks registry grouped by worker hostname.
+
+    return format: {hostname: [{"name": ..., "task_id": ..., ...}]}
+    """
+    result = {}
+    for entry in get_running_tasks():
+        result.setdefault(entry['host'], []).append(entry)
+    return result
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from typing import Optional
+import threading
+
+from .redis_client import get_redis_connection
+
+
+VERSION_KEY = 'super_scheduler:schedule_cache_version'
+MAX_SIZE = 1024
+
+
+class ScheduleCache:
+    """
+    Process LRU cache of schedules by canonical schedule kwargs.
+    Cache of all processes is dropped when schedules are deleted: deleting process increments version in redis,
+    other processes compare it with their version on lookup.
+    """
+
+    _schedules: 'OrderedDict[tuple, object]' = OrderedDict()
+    _lock = threading.Lock()
+    _version = None
+
+    @staticmethod
+    def key(schedule_name: str, schedule_kwargs: dict) -> tuple:
+        return schedule_name, tuple(sorted(schedule_kwargs.items()))
+
+    @classmethod
+    def _check_version(cls):
+        version = get_redis_connection().get(VERSION_KEY)
+        if version != cls._version:
+            cls._schedules.clear()
+            cls._version = version
+
+    @classmethod
+    def get(cls, schedule_name: str, schedule_kwargs: dict) -> Optional[object]:
+        with cls._lock:
+            cls._check_version()
+            key = cls.key(schedule_name, schedule_kwargs)
+            schedule = cls._schedules.get(key)
+            if schedule is not None:
+                cls._schedules.move_to_end(key)
+            return schedule
+
+    @classmethod
+    def put(cls, schedule_name: str, schedule_kwargs: dict, schedule):
+        with cls._lock:
+            cls._schedules[cls.key(schedule_name, schedule_kwargs)] = schedule
+            while len(cls._schedules) > MAX_SIZE:
+                cls._schedules.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Drop cache of all processes, call after deleting schedules.
+        """
+        with cls._lock:
+            cls._schedules.clear()
+            # the same type as GET result
+            cls._version = str(get_redis_connection().incr(VERSION_KEY)).encode()
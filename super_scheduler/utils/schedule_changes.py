@@ -0,0 +1,24 @@
+from typing import Iterable
+import logging
+import json
+
+from redis.exceptions import RedisError
+
+from .redis_client import get_redis_connection
+
+
+CHANGES_CHANNEL = 'super_scheduler:beat:changes'
+
+logger = logging.getLogger("super_scheduler")
+
+
+def notify_schedule_changed(names: Iterable[str]):
+    """
+    Publish names of changed periodic tasks to beat scheduler.
+    Changes are already saved in database, so failed notification is only logged:
+    scheduler finds them with periodical check of django_celery_beat change marker.
+    """
+    try:
+        get_redis_connection().publish(CHANGES_CHANNEL, json.dumps(list(names)))
+    except RedisError as err:
+        logger.warning(f"Can't notify beat about changed periodic tasks: {err}")
@@ -0,0 +1,346 @@
+from django.utils import timezone
+from django_celery_beat.models import PeriodicTask
+from celery.utils.time import localize
+from django.db import connection
+from typing import Dict, Optional, Set, Tuple
+import threading
+import datetime
+import logging
+import json
+
+import numpy as np
+
+from ..schedule.schedule_objects.custom.bitset_crontab import BitsetCrontab
+from ..schedule.schedule_objects.custom.cached_solar import CachedSolar, SolarEventCache
+from ..schedule.schedule_objects.custom.spread import SpreadCrontab, SPREAD_WINDOW_KWARG, spread_offset
+from .task_duration import get_task_durations
+
+
+HOUR_SECONDS = 60 * 60
+DAY_SECONDS = 24 * HOUR_SECONDS
+MAX_HOURS = 7 * 24
+# duration (sec) of periodic task without history of job durations
+DEFAULT_DURATION = 1
+# max overloaded seconds in response, the most loaded first
+MAX_OVERLOADED_SECONDS = 100
+# projected starts of all periodic tasks are reused by checks of new periodic tasks during ttl
+STARTS_CACHE_TTL = 10 * 60  # seconds
+
+# start seconds from now & count of starts in each of them
+Fires = Tuple[np.ndarray, np.ndarray]
+
+logger = logging.getLogger("super_scheduler")
+
+
+def _bits(mask: int, count: int) -> np.ndarray:
+    return np.array([value for value in range(count) if mask >> value & 1], dtype=np.int64)
+
+
+def _crontab_fires(schedule: BitsetCrontab, now: datetime.datetime, horizon: int) -> np.ndarray:
+    """
+    Fire times of crontab: seconds of day matching hour and minute added to start of every matching day.
+    """
+    tz = schedule.tz
+    seconds_of_day = (_bits(schedule.hour_mask, 24)[:, None] * HOUR_SECONDS +
+                      _bits(schedule.minute_mask, 60)[None, :] * 60).ravel()
+    if isinstance(schedule, SpreadCrontab):
+        seconds_of_day += int(schedule.offset.total_seconds())
+
+    day = now.astimezone(tz).date()
+    day_starts = []
+    for _ in range(horizon // DAY_SECONDS + 2):
+        if schedule.month_mask >> day.month & 1 and schedule._day_mask(day.year, day.month) >> day.day & 1:
+            day_start = localize(datetime.datetime.combine(day, datetime.time()), tz)
+            day_starts.append(int((day_start - now).total_seconds()))
+        day += datetime.timedelta(days=1)
+    if not day_starts:
+        return np.empty(0, dtype=np.int64)
+    return (np.array(day_starts, dtype=np.int64)[:, None] + seconds_of_day[None, :]).ravel()
+
+
+def _interval_fires(p_task: PeriodicTask, now: datetime.datetime, horizon: int) -> Fires:
+    """
+    Fire times of interval: periodic task without last run is due after interval from now.
+    Interval shorter than a second is counted per second instead of listing every fire,
+    so arrays are never longer than horizon.
+    """
+    every = p_task.interval.schedule.run_every.total_seconds()
+    last_run_at = p_task.last_run_at or now
+    first = max((last_run_at - now).total_seconds() + every, 0)
+    if every >= 1:
+        seconds = np.floor(np.arange(first, horizon, every)).astype(np.int64)
+        return seconds, np.ones(len(seconds), dtype=np.int64)
+    # fires before start of every second since the first fire
+    bounds = np.arange(int(first), horizon + 1, dtype=np.int64)
+    fires_before = np.maximum(np.ceil((bounds - first) / every), 0).astype(np.int64)
+    return bounds[:-1], np.diff(fires_before)
+
+
+def _solar_fires(p_task: PeriodicTask, now: datetime.datetime, horizon: int) -> np.ndarray:
+    """
+    Fire times of solar events; missed event is due now.
+    """
+    schedule = CachedSolar.from_solar(p_task.solar.schedule)
+    end = now + datetime.timedelta(seconds=horizon)
+    fires = []
+    after = p_task.last_run_at or now
+    while True:
+        event = SolarEventCache.next_event(schedule, after, now)
+        if event is None or event >= end:
+            break
+        fires.append(max(int((event - now).total_seconds()), 0))
+        after = max(event, now)
+    return np.array(fires, dtype=np.int64)
+
+
+def _clocked_fires(p_task: PeriodicTask, now: datetime.datetime, horizon: int) -> np.ndarray:
+    clocked_time = p_task.clocked.clocked_time
+    if p_task.last_run_at is not None and p_task.last_run_at >= clocked_time:
+        return np.empty(0, dtype=np.int64)
+    return np.array([max(int((clocked_time - now).total_seconds()), 0)], dtype=np.int64)
+
+
+def task_fires(p_task: PeriodicTask, now: datetime.datetime, horizon: int) -> Fires:
+    """
+    Projected start times of enabled periodic task.
+
+    :param p_task: periodic task with schedule
+    :param now: aware start of projection
+    :param horizon: length of projection (sec)
+    :return: sorted distinct seconds from now in [0, horizon) & count of starts in each of them
+    """
+    counts = None
+    if p_task.crontab is not None:
+        window = json.loads(p_task.kwargs or '{}').get(SPREAD_WINDOW_KWARG)
+        if window:
+            offset = spread_offset(p_task.name, int(window))
+            schedule = SpreadCrontab.from_crontab(p_task.crontab.schedule, offset=offset)
+        else:
+            schedule = BitsetCrontab.from_crontab(p_task.crontab.schedule)
+        fires = _crontab_fires(schedule, now, horizon)
+    elif p_task.interval is not None:
+        fires, counts = _interval_fires(p_task, now, horizon)
+    elif p_task.solar is not None:
+        fires = _solar_fires(p_task, now, horizon)
+    elif p_task.clocked is not None:
+        fires = _clocked_fires(p_task, now, horizon)
+    else:
+        raise ValueError("No schedule in periodic task")
+
+    low, high = 0, horizon
+    if p_task.start_time is not None:
+        low = max(low, int(np.ceil((p_task.start_time - now).total_seconds())))
+    if p_task.expires is not None:
+        high = min(high, int(np.ceil((p_task.expires - now).total_seconds())))
+    if counts is None:
+        counts = np.ones(len(fires), dtype=np.int64)
+    inside = (fires >= low) & (fires < high)
+    fires, counts = fires[inside], counts[inside]
+    order = np.argsort(fires, kind='stable')
+    fires, counts = fires[order], counts[order]
+    if p_task.one_off:
+        fires, counts = fires[:1], np.minimum(counts[:1], 1)
+    return fires, counts
+
+
+def project_fires(now: datetime.datetime, horizon: int) -> Tuple[Dict[str, Fires], Dict[str, str]]:
+    """
+    Projected start times of all enabled periodic tasks.
+
+    :return: start times by periodic task name & errors of periodic tasks which can't be projected
+    """
+    p_tasks = PeriodicTask.objects.filter(enabled=True).select_related('interval', 'crontab', 'solar', 'clocked')
+    fires, skipped = {}, {}
+    for p_task in p_tasks.iterator():
+        try:
+            fires[p_task.name] = task_fires(p_task, now, horizon)
+        except (ImportError, ValueError) as err:
+            # solar schedules need ephem
+            skipped[p_task.name] = str(err)
+    return fires, skipped
+
+
+def _histogram(seconds: np.ndarray, counts: np.ndarray, length: int) -> np.ndarray:
+    return np.bincount(seconds, weights=counts, minlength=length)[:length].astype(np.int64)
+
+
+def _concatenate(fires: Dict[str, Fires], index: int) -> np.ndarray:
+    if not fires:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate([task_fires_[index] for task_fires_ in fires.values()])
+
+
+def starts_per_second(fires: Dict[str, Fires], horizon: int) -> np.ndarray:
+    """
+    Histogram of projected task starts per second.
+    """
+    return _histogram(_concatenate(fires, 0), _concatenate(fires, 1), horizon)
+
+
+class ScheduleLoad:
+    """
+    Histograms of projected task starts and running tasks per second.
+    Running tasks (concurrency) are counted with median of last job durations of every periodic task.
+    """
+
+    def __init__(self, fires: Dict[str, Fires], now: datetime.datetime, horizon: int):
+        self.now = now
+        self.horizon = horizon
+        self.fires = fires
+        names = list(fires)
+        durations = get_task_durations(names)
+        lengths = np.array([len(fires[name][0]) for name in names], dtype=np.int64)
+        seconds, counts = _concatenate(fires, 0), _concatenate(fires, 1)
+        # whole seconds, at least one
+        task_durations = np.array([durations.get(name, DEFAULT_DURATION) for name in names], dtype=float)
+        fire_durations = np.repeat(np.maximum(np.ceil(task_durations), 1).astype(np.int64), lengths)
+
+        self.starts = _histogram(seconds, counts, horizon)
+        ends = np.minimum(seconds + fire_durations, horizon)
+        self.concurrency = np.cumsum(
+            _histogram(seconds, counts, horizon + 1) - _histogram(ends, counts, horizon + 1))[:horizon]
+
+    @classmethod
+    def project(cls, hours: int, now: Optional[datetime.datetime] = None) -> Tuple['ScheduleLoad', Dict[str, str]]:
+        """
+        Project load of all enabled periodic tasks for next hours.
+
+        :return: load & errors of periodic tasks which can't be projected
+        """
+        now = (now or timezone.now()).replace(microsecond=0)
+        horizon = hours * HOUR_SECONDS
+        fires, skipped = project_fires(now, horizon)
+        return cls(fires, now, horizon), skipped
+
+    def time_at(self, second: int) -> str:
+        return (self.now + datetime.timedelta(seconds=int(second))).isoformat()
+
+    def overloaded(self, threshold: int) -> np.ndarray:
+        """
+        Seconds with more task starts than threshold, the most loaded first.
+        """
+        seconds = np.flatnonzero(self.starts > threshold)
+        return seconds[np.argsort(-self.starts[seconds], kind='stable')]
+
+    def summary(self, threshold: int) -> dict:
+        hours = self.horizon // HOUR_SECONDS
+        overloaded = self.overloaded(threshold)
+        return {
+            'start': self.now.isoformat(),
+            'hours': hours,
+            'threshold': threshold,
+            'tasks': len(self.fires),
+            'starts': {
+                'total': int(self.starts.sum()),
+                'max_per_second': int(self.starts.max(initial=0)),
+                'per_hour': self.starts.reshape(hours, HOUR_SECONDS).sum(axis=1).tolist(),
+            },
+            'concurrency': {
+                'max': int(self.concurrency.max(initial=0)),
+                'mean': round(float(self.concurrency.mean()), 3) if self.horizon else 0.0,
+                'max_per_hour': self.concurrency.reshape(hours, HOUR_SECONDS).max(axis=1).tolist(),
+            },
+            'overloaded_seconds_count': len(overloaded),
+            'overloaded_seconds': [
+                {'time': self.time_at(second), 'starts': int(self.starts[second]),
+                 'concurrency': int(self.concurrency[second])}
+                for second in overloaded[:MAX_OVERLOADED_SECONDS]
+            ],
+        }
+
+
+def simulate_schedule_load(hours: int, threshold: int) -> dict:
+    """
+    Projected load of all enabled periodic tasks for next hours.
+
+    :param hours: length of projection
+    :param threshold: max task starts in one second, seconds with more starts are reported
+    :return: summary of load with 'skipped' periodic tasks
+    """
+    load, skipped = ScheduleLoad.project(hours)
+    return {**load.summary(threshold), 'skipped': skipped}
+
+
+class LoadNotCheckedError(Exception):
+    """
+    Starts of periodic tasks haven't been projected yet.
+    """
+
+
+class StartsCache:
+    """
+    Process cache of projected task starts per second of all enabled periodic tasks by hours of projection.
+    Missing or expired starts are projected in background thread, the expired ones are used until then;
+    projection covers ttl more than hours, so shifted window of check is inside it.
+    """
+
+    # hours -> start of projection, starts per second, ids of projected periodic tasks by name
+    _starts: Dict[int, Tuple[datetime.datetime, np.ndarray, Dict[str, int]]] = {}
+    _refreshing: Set[int] = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def _refresh(cls, hours: int):
+        try:
+            now = timezone.now().replace(microsecond=0)
+            ids = dict(PeriodicTask.objects.filter(enabled=True).values_list('name', 'id'))
+            fires, _ = project_fires(now, hours * HOUR_SECONDS + STARTS_CACHE_TTL)
+            starts = starts_per_second(fires, hours * HOUR_SECONDS + STARTS_CACHE_TTL)
+            ids = {name: ids[name] for name in fires if name in ids}
+            with cls._lock:
+                cls._starts[hours] = now, starts, ids
+        except Exception as err:
+            logger.warning(f"Can't project starts of periodic tasks: {err}")
+        finally:
+            with cls._lock:
+                cls._refreshing.discard(hours)
+            connection.close()
+
+    @classmethod
+    def get(cls, hours: int) -> Optional[Tuple[datetime.datetime, np.ndarray, Dict[str, int]]]:
+        """
+        Cached starts or None if they haven't been projected yet.
+        """
+        with cls._lock:
+            cached = cls._starts.get(hours)
+            expired = cached is None or (timezone.now() - cached[0]).total_seconds() > STARTS_CACHE_TTL
+            if expired and hours not in cls._refreshing:
+                cls._refreshing.add(hours)
+                threading.Thread(target=cls._refresh, args=(hours,), daemon=True).start()
+        return cached
+
+
+def check_task_load(name: str, hours: int, threshold: int) -> Optional[str]:
+    """
+    Warning if periodic task starts in seconds with more task starts than threshold.
+    Only starts of periodic task are projected, starts of other periodic tasks are taken from StartsCache;
+    starts of deleted periodic task with the same name are counted until cache is refreshed.
+
+    :param name: periodic task name
+    :return: optional warning msg
+    """
+    cached = StartsCache.get(hours)
+    if cached is None:
+        raise LoadNotCheckedError("Starts of periodic tasks are being projected, load isn't checked; "
+                                  "check it with 'task/load' endpoint or retry later")
+    p_task = PeriodicTask.objects.filter(name=name, enabled=True).select_related(
+        'interval', 'crontab', 'solar', 'clocked').first()
+    if p_task is None:
+        return None
+
+    now = timezone.now().replace(microsecond=0)
+    seconds, counts = task_fires(p_task, now, hours * HOUR_SECONDS)
+    cached_now, starts, ids = cached
+    index = seconds + int((now - cached_now).total_seconds())
+    inside = index < len(starts)
+    seconds, counts, index = seconds[inside], counts[inside], index[inside]
+    # periodic task created after projection isn't in cached starts, even if name was taken by deleted one
+    task_starts = starts[index] if ids.get(name) == p_task.id else starts[index] + counts
+
+    overloaded = np.flatnonzero(task_starts > threshold)
+    if not len(overloaded):
+        return None
+    most_loaded = overloaded[np.argmax(task_starts[overloaded])]
+    time_at = (now + datetime.timedelta(seconds=int(seconds[most_loaded]))).isoformat()
+    return (f"Periodic task {name} starts {len(overloaded)} times in next {hours} h together with more than "
+            f"{threshold} tasks; the most loaded: {int(task_starts[most_loaded])} starts at {time_at}")
@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional
+import statistics
+
+from .redis_client import get_redis_connection
+
+
+DURATIONS_KEY_PREFIX = 'super_scheduler:durations:'
+DURATIONS_HISTORY = 20
+DURATIONS_TTL = 7 * 24 * 60 * 60
+
+
+def record_task_duration(p_task_name: str, duration: float):
+    """
+    Save job duration of periodic task, keep last DURATIONS_HISTORY values.
+
+    :param p_task_name: periodic task name
+    :param duration: seconds
+    """
+    key = DURATIONS_KEY_PREFIX + p_task_name
+    pipe = get_redis_connection().pipeline()
+    pipe.lpush(key, round(duration, 3))
+    pipe.ltrim(key, 0, DURATIONS_HISTORY - 1)
+    pipe.expire(key, DURATIONS_TTL)
+    pipe.execute()
+
+
+def get_task_duration(p_task_name: str) -> Optional[float]:
+    """
+    Median of last job durations of periodic task.
+
+    :param p_task_name: periodic task name
+    :return: seconds or None if no history
+    """
+    durations = get_redis_connection().lrange(DURATIONS_KEY_PREFIX + p_task_name, 0, -1)
+    if not durations:
+        return None
+    return statistics.median(float(duration) for duration in durations)
+
+
+def get_task_durations(p_task_names: List[str]) -> Dict[str, float]:
+    """
+    Medians of last job durations of periodic tasks, read in one round trip.
+
+    :param p_task_names: periodic task names
+    :return: seconds by periodic task name, tasks without history are missed
+    """
+    pipe = get_redis_connection().pipeline(transaction=False)
+    for p_task_name in p_task_names:
+        pipe.lrange(DURATIONS_KEY_PREFIX + p_task_name, 0, -1)
+    return {
+        p_task_name: statistics.median(float(duration) for duration in durations)
+        for p_task_name, durations in zip(p_task_names, pipe.execute()) if durations
+    }
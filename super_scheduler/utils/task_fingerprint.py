@@ -0,0 +1,137 @@
+from typing import Iterable, List, Optional, Tuple
+import hashlib
+import json
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django_celery_beat.models import PeriodicTask
+
+from .redis_client import get_redis_connection
+
+
+NAMES_KEY = 'super_scheduler:fingerprint:names'
+FINGERPRINT_KEY_PREFIX = 'super_scheduler:fingerprint:'
+BUILT_KEY = 'super_scheduler:fingerprint:built'
+# index is rebuilt from database after ttl, changes saved without signals are picked up
+BUILT_TTL = 3600
+CHUNK_SIZE = 2000
+
+# kwargs key of periodic task name, it is unique for each periodic task, so it's not a part of definition
+NAME_KWARG = 'name'
+
+# KEYS[1] - names key; ARGV: fingerprint key prefix, periodic task name, fingerprint
+_SET_SCRIPT = """
+local old = redis.call('HGET', KEYS[1], ARGV[2])
+if old == ARGV[3] then
+    return 0
+end
+if old then
+    redis.call('SREM', ARGV[1] .. old, ARGV[2])
+end
+redis.call('SADD', ARGV[1] .. ARGV[3], ARGV[2])
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+return 1
+"""
+
+# KEYS[1] - names key; ARGV: fingerprint key prefix, periodic task name
+_REMOVE_SCRIPT = """
+local old = redis.call('HGET', KEYS[1], ARGV[2])
+if not old then
+    return 0
+end
+redis.call('SREM', ARGV[1] .. old, ARGV[2])
+redis.call('HDEL', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def task_fingerprint(task: str, args: Optional[list] = None, kwargs: Optional[dict] = None) -> str:
+    """
+    Stable hash of periodic task definition: task and canonical json of args and kwargs without periodic task name.
+    """
+    kwargs = {key: value for key, value in (kwargs or {}).items() if key != NAME_KWARG}
+    definition = json.dumps([task, args or [], kwargs], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(definition.encode()).hexdigest()
+
+
+def periodic_task_fingerprint(task: str, args: Optional[str], kwargs: Optional[str]) -> str:
+    """
+    Fingerprint of periodic task with django format of args and kwargs - json strings.
+    """
+    return task_fingerprint(task, json.loads(args or '[]'), json.loads(kwargs or '{}'))
+
+
+class TaskFingerprintIndex:
+    """
+    Redis index of periodic task names by fingerprint of definition.
+    Fingerprint of periodic task is in hash 'super_scheduler:fingerprint:names', names with the same fingerprint
+    are in set 'super_scheduler:fingerprint:<fingerprint>'. Index is kept by django signals of periodic task,
+    bulk writes update it explicitly; it is rebuilt from database when it's missing or older than ttl.
+    """
+
+    @staticmethod
+    def set(name: str, fingerprint: str):
+        get_redis_connection().eval(_SET_SCRIPT, 1, NAMES_KEY, FINGERPRINT_KEY_PREFIX, name, fingerprint)
+
+    @staticmethod
+    def set_many(items: Iterable[Tuple[str, str]]):
+        """
+        :param items: periodic task name & fingerprint
+        """
+        pipe = get_redis_connection().pipeline(transaction=False)
+        for name, fingerprint in items:
+            pipe.eval(_SET_SCRIPT, 1, NAMES_KEY, FINGERPRINT_KEY_PREFIX, name, fingerprint)
+        pipe.execute()
+
+    @staticmethod
+    def remove(name: str):
+        get_redis_connection().eval(_REMOVE_SCRIPT, 1, NAMES_KEY, FINGERPRINT_KEY_PREFIX, name)
+
+    @classmethod
+    def rebuild(cls, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Build index from all periodic tasks.
+
+        :return: count of indexed periodic tasks
+        """
+        redis = get_redis_connection()
+        rows = PeriodicTask.objects.values_list('name', 'task', 'args', 'kwargs').iterator(chunk_size=chunk_size)
+        fingerprints = {name: periodic_task_fingerprint(task, args, kwargs) for name, task, args, kwargs in rows}
+
+        old_fingerprints = {fingerprint.decode() for fingerprint in redis.hvals(NAMES_KEY)}
+        pipe = redis.pipeline()
+        pipe.delete(NAMES_KEY, *[FINGERPRINT_KEY_PREFIX + fingerprint for fingerprint in old_fingerprints])
+        if fingerprints:
+            pipe.hset(NAMES_KEY, mapping=fingerprints)
+        names_by_fingerprint = {}
+        for name, fingerprint in fingerprints.items():
+            names_by_fingerprint.setdefault(fingerprint, []).append(name)
+        for fingerprint, names in names_by_fingerprint.items():
+            pipe.sadd(FINGERPRINT_KEY_PREFIX + fingerprint, *names)
+        pipe.set(BUILT_KEY, 1, ex=BUILT_TTL)
+        pipe.execute()
+        return len(fingerprints)
+
+    @classmethod
+    def names(cls, fingerprint: str) -> List[str]:
+        """
+        Names of periodic tasks with fingerprint.
+        """
+        redis = get_redis_connection()
+        if not redis.exists(BUILT_KEY):
+            cls.rebuild()
+        return sorted(name.decode() for name in redis.smembers(FINGERPRINT_KEY_PREFIX + fingerprint))
+
+
+# index is changed after commit, rolled back changes don't get into it
+@receiver(post_save, sender=PeriodicTask)
+def index_periodic_task(sender, instance: PeriodicTask, using=None, **kwargs):
+    name, fingerprint = instance.name, periodic_task_fingerprint(instance.task, instance.args, instance.kwargs)
+    transaction.on_commit(lambda: TaskFingerprintIndex.set(name, fingerprint), using=using)
+
+
+@receiver(post_delete, sender=PeriodicTask)
+def unindex_periodic_task(sender, instance: PeriodicTask, using=None, **kwargs):
+    name = instance.name
+    transaction.on_commit(lambda: TaskFingerprintIndex.remove(name), using=using)
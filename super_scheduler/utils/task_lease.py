@@ -0,0 +1,176 @@
+from typing import Dict, Tuple
+import threading
+import logging
+import time
+import os
+
+from .redis_client import get_redis_connection
+
+
+logger = logging.getLogger("super_scheduler.lease")
+
+LEASE_KEY_PREFIX = 'super_scheduler:lease:'
+
+# KEYS[1] - lease key; ARGV: now (ms), expire at (ms), max holders, holder id, key ttl (ms), force (0/1)
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if ARGV[6] ~= '1' and not redis.call('ZSCORE', KEYS[1], ARGV[4])
+        and redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+# KEYS[1] - lease key; ARGV: expire at (ms), holder id, key ttl (ms)
+_RENEW_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class TaskLease:
+    """
+    Cluster-wide lease of periodic task.
+    Holders are stored in redis sorted set 'super_scheduler:lease:<periodic task name>' with score = expire time,
+    so acquiring and releasing cost O(1) redis calls and crashed workers are released after ttl.
+    """
+
+    _acquire_script = None
+    _renew_script = None
+
+    def __init__(self, p_task_name: str, holder_id: str, max_parallel: int = 1, ttl: int = 60):
+        """
+        :param p_task_name: periodic task name
+        :param holder_id: task id
+        :param max_parallel: max parallel running instances of periodic task
+        :param ttl: lease ttl in seconds, renewed by heartbeat while lease is held
+        """
+        self.key = LEASE_KEY_PREFIX + p_task_name
+        self.holder_id = holder_id
+        self.max_parallel = max_parallel
+        self.ttl_ms = ttl * 1000
+
+    @classmethod
+    def _register_scripts(cls, redis):
+        if cls._acquire_script is None:
+            cls._acquire_script = redis.register_script(_ACQUIRE_SCRIPT)
+            cls._renew_script = redis.register_script(_RENEW_SCRIPT)
+
+    def acquire(self, force: bool = False) -> bool:
+        """
+        Try to take lease; start heartbeat renewal on success.
+
+        :param force: take lease even if max parallel holders are running, e.g. back by run continuing started job
+        :return: success status
+        """
+        redis = get_redis_connection()
+        self._register_scripts(redis)
+        now = _now_ms()
+        acquired = bool(self._acquire_script(
+            keys=[self.key],
+            args=[now, now + self.ttl_ms, self.max_parallel, self.holder_id, self.ttl_ms, int(force)],
+            client=redis,
+        ))
+        if acquired:
+            LeaseHeartbeat.add(self)
+        return acquired
+
+    def renew(self) -> bool:
+        """
+        Prolong lease on ttl.
+
+        :return: False if lease was lost (expired or released)
+        """
+        redis = get_redis_connection()
+        self._register_scripts(redis)
+        return bool(self._renew_script(
+            keys=[self.key],
+            args=[_now_ms() + self.ttl_ms, self.holder_id, self.ttl_ms],
+            client=redis,
+        ))
+
+    def detach(self, ttl: int) -> bool:
+        """
+        Stop heartbeat and prolong lease on ttl, lease is held until next acquire with the same holder id.
+
+        :param ttl: seconds to hold lease
+        :return: False if lease was lost
+        """
+        LeaseHeartbeat.remove(self)
+        self.ttl_ms = int(ttl * 1000)
+        return self.renew()
+
+    def release(self):
+        """
+        Release lease. Safe to call when lease is not held.
+        """
+        LeaseHeartbeat.remove(self)
+        get_redis_connection().zrem(self.key, self.holder_id)
+
+    def holders(self) -> int:
+        """
+        Count of alive lease holders.
+        """
+        redis = get_redis_connection()
+        return redis.zcount(self.key, _now_ms(), '+inf')
+
+
+class LeaseHeartbeat:
+    """
+    One daemon thread per worker process, renews all leases held by the process every ttl / 3.
+    Any object with 'key', 'holder_id', 'ttl_ms' and 'renew()' can be renewed, e.g. running tasks registry entry.
+    """
+
+    _leases: Dict[Tuple[str, str], TaskLease] = {}
+    _lock = threading.Lock()
+    _thread = None
+    _pid = None
+
+    @classmethod
+    def add(cls, lease: TaskLease):
+        with cls._lock:
+            cls._leases[(lease.key, lease.holder_id)] = lease
+            cls._ensure_thread()
+
+    @classmethod
+    def remove(cls, lease: TaskLease):
+        with cls._lock:
+            cls._leases.pop((lease.key, lease.holder_id), None)
+
+    @classmethod
+    def is_held(cls, lease: TaskLease) -> bool:
+        return (lease.key, lease.holder_id) in cls._leases
+
+    @classmethod
+    def _ensure_thread(cls):
+        # threads do not survive fork, so start new one in each worker process
+        if cls._thread is not None and cls._pid == os.getpid() and cls._thread.is_alive():
+            return
+        cls._pid = os.getpid()
+        cls._thread = threading.Thread(target=cls._run, name='super_scheduler-lease-heartbeat', daemon=True)
+        cls._thread.start()
+
+    @classmethod
+    def _run(cls):
+        while True:
+            with cls._lock:
+                leases = list(cls._leases.values())
+            interval = min((lease.ttl_ms for lease in leases), default=60000) / 3000
+            time.sleep(interval)
+            for lease in leases:
+                try:
+                    if not lease.renew() and cls.is_held(lease):
+                        logger.warning(f"Lease {lease.key} of {lease.holder_id} was lost")
+                        cls.remove(lease)
+                except Exception as err:
+                    logger.error(f"Can't renew lease {lease.key} of {lease.holder_id}: {err}")
@@ -1,3 +1,6 @@
 
-def validate_format(kwargs: dict, kwargs_format):
-    return kwargs_format(**kwargs)
+def validate_format(kwargs: dict, kwargs_format, context=None):
+    if context is None:
+        return kwargs_format(**kwargs)
+    with context.activate():
+        return kwargs_format(**kwargs)
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import FrozenSet, List, Optional
+
+from celery.signals import import_modules, worker_process_init
+from django.db import connection
+from django_celery_beat.models import PeriodicTask
+
+from core.celeryapp import app
+
+from .task_fingerprint import TaskFingerprintIndex, task_fingerprint
+
+
+_current_context: ContextVar[Optional['ValidationContext']] = ContextVar('validation_context', default=None)
+
+
+class ValidationContext:
+    """
+    Existence checks for format validators: indexed exists() queries instead of loading periodic tasks,
+    registered tasks cached per process. Counts database queries made while context is active.
+    """
+
+    _task_names: FrozenSet[str] = frozenset()
+    _task_names_size = -1
+
+    def __init__(self):
+        self.queries = 0
+
+    @contextmanager
+    def activate(self):
+        """
+        Make context current for validators and count queries.
+        """
+        token = _current_context.set(self)
+        try:
+            with connection.execute_wrapper(self._count_query):
+                yield self
+        finally:
+            _current_context.reset(token)
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def periodic_task_exists(self, name: str) -> bool:
+        return PeriodicTask.objects.filter(name=name).exists()
+
+    def task_exists(self, task_name: str) -> bool:
+        return task_name in self.registered_tasks()
+
+    def same_definition_names(self, task_name: str, args: list, kwargs: dict) -> List[str]:
+        """
+        Names of periodic tasks with the same task, args and kwargs (except periodic task name).
+        """
+        return TaskFingerprintIndex.names(task_fingerprint(task_name, args, kwargs))
+
+    @classmethod
+    def registered_tasks(cls) -> FrozenSet[str]:
+        """
+        Names of registered celery tasks, rebuilt only when tasks registry is changed.
+        """
+        tasks = app.tasks
+        # tasks are only added to registry (autodiscover, imports), so size detects changes
+        if len(tasks) != cls._task_names_size:
+            cls._task_names = frozenset(tasks.keys())
+            cls._task_names_size = len(tasks)
+        return cls._task_names
+
+    @classmethod
+    def invalidate(cls):
+        cls._task_names_size = -1
+
+
+def get_validation_context() -> ValidationContext:
+    """
+    Current context or new one for validation outside of request.
+    """
+    return _current_context.get() or ValidationContext()
+
+
+@import_modules.connect
+@worker_process_init.connect
+def invalidate_registered_tasks(**kwargs):
+    ValidationContext.invalidate()
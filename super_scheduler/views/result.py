@@ -0,0 +1,60 @@
+from rest_framework.request import Request
+import logging
+
+from rest.permissions import IsAuthenticated
+from rest.response import Response, status
+from rest.views import APIView
+
+from ..settings import RESULT_SPOOL_DIR
+from ..utils.result_spool import ResultSpool
+
+
+class ResultView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ['get']
+    logger = logging.getLogger('super_scheduler')
+    max_limit = 10000
+
+    @staticmethod
+    def _allowed(request: Request, meta: dict) -> bool:
+        """
+        Result is read by owner ('username' of task which saved it) or staff.
+        """
+        return request.user.is_staff or meta.get('username') == request.user.username
+
+    def get(self, request: Request) -> Response:
+        """
+        Read slice of saved otl result; spool dir is written by workers, so it must be shared with api host.
+        request example: ?sid=<sid>&offset=0&limit=100&columns=_time,count
+        """
+        sid = request.query_params.get('sid')
+        if not sid:
+            return Response(data="Set 'sid' param", status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            offset = int(request.query_params.get('offset', 0))
+            limit = min(int(request.query_params.get('limit', 100)), self.max_limit)
+        except ValueError:
+            return Response(data="'offset' and 'limit' must be int", status=status.HTTP_400_BAD_REQUEST)
+        columns = request.query_params.get('columns')
+        columns = columns.split(',') if columns else None
+
+        spool = ResultSpool(RESULT_SPOOL_DIR)
+        try:
+            meta = spool.meta(sid)
+        except ValueError as err:
+            return Response(data=str(err), status=status.HTTP_400_BAD_REQUEST)
+
+        if meta is None:
+            return Response(data=f"Result of job {sid} does not exist", status=status.HTTP_404_NOT_FOUND)
+        if not self._allowed(request, meta):
+            return Response(data=f"Result of job {sid} belongs to another user", status=status.HTTP_403_FORBIDDEN)
+
+        data = spool.read_slice(sid, offset, limit, columns)
+        if data is None:
+            # result has been evicted
+            return Response(data=f"Result of job {sid} does not exist", status=status.HTTP_404_NOT_FOUND)
+
+        self.logger.info(f"Success get result {sid} rows {data['offset']}-{data['offset'] + len(data['data'])}.")
+        return Response(data=data, status=status.HTTP_200_OK)
@@ -1,15 +1,27 @@
 from rest_framework.request import Request
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
 from typing import Union, Optional
+import hashlib
 import logging
+import json
 import uuid
 
 from rest.permissions import IsAuthenticated
 from rest.response import Response, status
 from rest.views import APIView
 
-from ..utils.get_task import get_all_task_names, get_all_periodic_task_names, get_all_periodic_task_full, get_all_active_tasks
+from ..utils.get_task import get_all_task_names, get_all_active_tasks, filter_periodic_tasks, get_periodic_tasks_page, \
+    get_periodic_tasks_last_update, PERIODIC_TASK_FIELDS, PERIODIC_TASK_RUN_FIELDS
+from ..utils.kwargs_parser import KwargsParser
+from ..utils.validation_context import ValidationContext
+from ..utils.group_progress import get_all_groups_progress
+from ..utils.otl_coalescing import get_coalescing_stats
+from ..utils.schedule_load import check_task_load, LoadNotCheckedError
 from ..periodic_task.periodic_task import PeriodicTask
+from ..periodic_task.format import TaskListFormat
 from ..schedule.schedule import Schedule
+from ..schedule.schedule_objects import move_task_params
+from ..settings import LOAD_HOURS, LOAD_THRESHOLD
 
 
 class TaskView(APIView):
@@ -39,6 +51,9 @@ class TaskView(APIView):
     def post(self, request: Request) -> Response:
         """
         request example: {'task': {'name': 'taskname', ...}, 'schedule': {'name': 'crontab', ...}}
+        Optional 'check_load': true adds warning if the task starts in seconds with more projected task starts
+        than threshold of [load] config section; starts of other tasks are projected in background and cached,
+        response has 'load_checked' flag and 'load_note' if load isn't checked (e.g. cache isn't ready yet).
         """
 
         req_params = dict(request.data)
@@ -49,20 +64,44 @@ class TaskView(APIView):
         if msg_error:
             return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
 
+        schedule_kwargs, task_kwargs = move_task_params(req_params['schedule'], req_params['task'])
+
         # create schedule
-        schedule, msg_error = Schedule.get_or_create(req_params['schedule'])
+        schedule, msg_error = Schedule.get_or_create(schedule_kwargs)
         if schedule is None:
             return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
 
         # create task
-        msg_error = PeriodicTask.get_or_create(schedule=schedule, task_kwargs=req_params['task'])
+        context = ValidationContext()
+        msg_error = PeriodicTask.get_or_create(schedule=schedule, task_kwargs=task_kwargs, context=context)
+        self.logger.debug(f"Validation queries: {context.queries}")
         if msg_error:
             return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
 
         self.logger.info("Success add periodic task.")
         data = {'status': 'success'}
+        if req_params.get('check_load'):
+            data.update(self._check_load(task_kwargs.get('name')))
         return Response(data=data, status=status.HTTP_201_CREATED)
 
+    def _check_load(self, name: str) -> dict:
+        """
+        Load check of new periodic task: 'load_checked' flag with 'warning' of overloaded seconds
+        or 'load_note' why load isn't checked; task is created anyway, so errors are only logged.
+        """
+        try:
+            warning = check_task_load(name, LOAD_HOURS, LOAD_THRESHOLD)
+        except LoadNotCheckedError as err:
+            self.logger.info(f"Load of periodic task {name} isn't checked: {err}")
+            return {'load_checked': False, 'load_note': str(err)}
+        except Exception as err:
+            self.logger.warning(f"Can't check load of periodic task {name}: {err}")
+            return {'load_checked': False, 'load_note': f"Can't check load: {err}"}
+        if warning:
+            self.logger.warning(warning)
+            return {'load_checked': True, 'warning': warning}
+        return {'load_checked': True}
+
     def delete(self, request: Request) -> Response:
         """
         request example: {'task': {'name': 'taskname', ...}, ...}
@@ -76,7 +115,9 @@ class TaskView(APIView):
             return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
 
         # delete task
-        msg_error = PeriodicTask.delete(req_params['task'])
+        context = ValidationContext()
+        msg_error = PeriodicTask.delete(req_params['task'], context=context)
+        self.logger.debug(f"Validation queries: {context.queries}")
         if msg_error:
             return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
 
@@ -84,13 +125,79 @@ class TaskView(APIView):
         data = {'status': 'success'}
         return Response(data=data, status=status.HTTP_200_OK)
 
+    @staticmethod
+    def _get_list_params(request: Request) -> dict:
+        """
+        Query params; client sends them in request body as 'task' dict.
+        """
+        params = request.query_params.dict()
+        if isinstance(request.data, dict) and isinstance(request.data.get('task'), dict):
+            params.update(request.data['task'])
+        return params
+
+    @staticmethod
+    def _get_etag(params: dict, last_update) -> Optional[str]:
+        """
+        ETag of periodic tasks page, changed on every change of periodic tasks in django_celery_beat.
+        None if response has data changed without notification: task run stats or live sections.
+        """
+        if last_update is None or params['running'] or params['stats']:
+            return None
+        if set(params['fields'] or PERIODIC_TASK_FIELDS) & set(PERIODIC_TASK_RUN_FIELDS):
+            return None
+        key = json.dumps([last_update.isoformat(), params], sort_keys=True, default=str)
+        if params['registered']:
+            key += ','.join(sorted(get_all_task_names()))
+        return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, last_update) -> bool:
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or etag in etags
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and int(last_update.timestamp()) <= if_modified_since
+
     def get(self, request: Request) -> Response:
+        """
+        request example: ?enabled=true&schedule_type=crontab&fields=name,task&limit=100&cursor=...&running=true
+        Supports conditional requests (If-None-Match, If-Modified-Since) when run stats fields
+        ('total_run_count', 'last_run_at') and live sections aren't requested.
+        """
+
+        params, msg_error = KwargsParser.parse_kwargs(self._get_list_params(request), TaskListFormat)
+        if params is None:
+            return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
+
+        last_update = get_periodic_tasks_last_update()
+        etag = self._get_etag(params, last_update)
+        headers = {}
+        if etag is not None:
+            headers = {'ETag': etag, 'Last-Modified': http_date(last_update.timestamp()), 'Cache-Control': 'no-cache'}
+            if self._not_modified(request, etag, last_update):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        queryset = filter_periodic_tasks(
+            enabled=params['enabled'], task=params['task'], name_prefix=params['name_prefix'],
+            schedule_type=params['schedule_type'], owner=params['owner'],
+        )
+        try:
+            p_tasks, next_cursor = get_periodic_tasks_page(
+                queryset, fields=params['fields'], cursor=params['cursor'], limit=params['limit'])
+        except ValueError as err:
+            return Response(data=str(err), status=status.HTTP_400_BAD_REQUEST)
 
         data = {
-            'tasks': get_all_task_names(),
-            'periodic_tasks': get_all_periodic_task_full(),
-            'running tasks': get_all_active_tasks(),
+            'periodic_tasks': {p_task['name']: p_task for p_task in p_tasks},
+            'next_cursor': next_cursor,
         }
-        self.logger.info(f"Data: {data}")
-        self.logger.info("Success get periodic tasks.")
-        return Response(data=data, status=status.HTTP_200_OK)
+        if params['registered']:
+            data['tasks'] = get_all_task_names()
+        if params['running']:
+            data['running tasks'] = get_all_active_tasks()
+        if params['stats']:
+            data['groups progress'] = get_all_groups_progress()
+            data['otl coalescing'] = get_coalescing_stats()
+        self.logger.info(f"Success get {len(p_tasks)} periodic tasks.")
+        return Response(data=data, status=status.HTTP_200_OK, headers=headers)
@@ -0,0 +1,40 @@
+from rest_framework.request import Request
+import logging
+
+from rest.permissions import IsAuthenticated
+from rest.response import Response, status
+from rest.views import APIView
+
+from ..periodic_task.bulk import PeriodicTaskBulk, SUCCESS
+
+
+class TaskBulkView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ['post']
+    logger = logging.getLogger('super_scheduler')
+    actions = ('create', 'update', 'delete')
+
+    def post(self, request: Request) -> Response:
+        """
+        request example: {'create': [{'task': {'name': 'taskname', ...}, 'schedule': {'name': 'crontab', ...}}, ...],
+                          'update': [{'task': {...}, 'schedule': {...}}, ...],
+                          'delete': [{'task': {'name': 'taskname'}}, ...]}
+        """
+        req_params = dict(request.data)
+
+        if not any(action in req_params for action in self.actions) or \
+                any(not isinstance(req_params.get(action, []), list) for action in self.actions):
+            msg_error = "Not valid format; expected lists of items in keys: {}, got: {}".format(
+                self.actions, list(req_params))
+            return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
+
+        results = PeriodicTaskBulk.apply(**{action: req_params.get(action) for action in self.actions})
+
+        all_results = [result for action_results in results.values() for result in action_results]
+        succeeded = sum(result['status'] == SUCCESS for result in all_results)
+        data = {
+            'status': 'success' if succeeded == len(all_results) else 'partial' if succeeded else 'failed',
+            **results,
+        }
+        return Response(data=data, status=status.HTTP_200_OK if succeeded else status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,46 @@
+from django.http import StreamingHttpResponse
+from rest_framework.request import Request
+import logging
+
+from rest.permissions import IsAuthenticated
+from rest.response import Response, status
+from rest.views import APIView
+
+from ..periodic_task.export import iter_periodic_task_records, iter_ndjson, import_periodic_task_records
+
+
+class TaskExportView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ['get']
+    logger = logging.getLogger('super_scheduler')
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        """
+        Stream all periodic tasks as newline-delimited json, one {'task': {...}, 'schedule': {...}} per line.
+        """
+        self.logger.info("Export periodic tasks.")
+        response = StreamingHttpResponse(iter_ndjson(iter_periodic_task_records()),
+                                         content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="periodic_tasks.ndjson"'
+        return response
+
+
+class TaskImportView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ['post']
+    logger = logging.getLogger('super_scheduler')
+
+    def post(self, request: Request) -> Response:
+        """
+        Create or replace periodic tasks from newline-delimited json of export; body is read line by line.
+        """
+        stream = request.stream
+        if stream is None:
+            return Response(data="Empty request body", status=status.HTTP_400_BAD_REQUEST)
+
+        summary = import_periodic_task_records(stream)
+        self.logger.info(f"Imported {summary['succeeded']} of {summary['total']} periodic tasks.")
+        code = status.HTTP_200_OK if summary['succeeded'] or not summary['total'] else status.HTTP_400_BAD_REQUEST
+        return Response(data=summary, status=code)
@@ -0,0 +1,35 @@
+from rest_framework.request import Request
+import logging
+
+from rest.permissions import IsAuthenticated
+from rest.response import Response, status
+from rest.views import APIView
+
+from ..utils.kwargs_parser import KwargsParser
+from ..utils.schedule_load import simulate_schedule_load
+from ..periodic_task.format import TaskLoadFormat
+
+
+class TaskLoadView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+    http_method_names = ['get']
+    logger = logging.getLogger('super_scheduler')
+
+    def get(self, request: Request) -> Response:
+        """
+        request example: ?hours=24&threshold=50
+        Projected task starts and running tasks of all enabled periodic tasks for next hours,
+        seconds with more starts than threshold.
+        """
+        params = request.query_params.dict()
+        if isinstance(request.data, dict):
+            params.update(request.data)
+        params, msg_error = KwargsParser.parse_kwargs(params, TaskLoadFormat)
+        if params is None:
+            return Response(data=msg_error, status=status.HTTP_400_BAD_REQUEST)
+
+        data = simulate_schedule_load(params['hours'], params['threshold'])
+        self.logger.info(f"Projected load of {data['tasks']} periodic tasks for {params['hours']} h, "
+                         f"overloaded seconds: {data['overloaded_seconds_count']}.")
+        return Response(data=data, status=status.HTTP_200_OK)
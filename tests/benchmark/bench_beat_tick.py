@@ -0,0 +1,131 @@
+"""
+Benchmark of celery beat tick cost by count of schedule entries.
+
+Compares celery Scheduler.tick with heap tick of super_scheduler scheduler (HeapTickMixin) on in-memory
+crontab and interval entries; sending of tasks is replaced by counter, so only scheduling is measured.
+Django, database and redis aren't needed.
+
+Run from plugin directory:
+    python ./tests/benchmark/bench_beat_tick.py --sizes 1000 10000 100000 --output tick.json
+
+Report for each count of entries: populate time of heap (ms), idle tick - no due entries (us),
+due tick - time per sent task (us).
+"""
+from datetime import timedelta
+from pathlib import Path
+import argparse
+import random
+import json
+import time
+import sys
+
+from celery import Celery
+from celery.beat import Scheduler, ScheduleEntry
+from celery.schedules import crontab, schedule
+
+PLUGIN_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PLUGIN_DIR))
+
+from super_scheduler.utils.due_heap import HeapTickMixin  # noqa: E402
+
+
+class CountingScheduler(Scheduler):
+    producer = None
+
+    def __init__(self, *args, **kwargs):
+        self.sent = 0
+        super().__init__(*args, **kwargs)
+
+    def apply_entry(self, entry, producer=None):
+        self.sent += 1
+
+
+class CeleryTickScheduler(CountingScheduler):
+    pass
+
+
+class HeapTickScheduler(HeapTickMixin, CountingScheduler):
+    pass
+
+
+def make_entries(app: Celery, count: int, due: int, seed: int) -> dict:
+    """
+    Half of entries is crontab at random minute, half is interval from 1 to 60 min;
+    'due' interval entries are overdue.
+    """
+    rnd = random.Random(seed)
+    now = app.now()
+    entries = {}
+    for i in range(count):
+        name = f'bench_{i}'
+        if i < due:
+            every = timedelta(minutes=rnd.randint(1, 60))
+            entry = ScheduleEntry(name, 'bench', last_run_at=now - every * 2, schedule=schedule(every), app=app)
+        elif i % 2:
+            minute = rnd.randrange(60)
+            # crontab at minute closest to now would be due during benchmark
+            minute = minute if minute not in (now.minute, (now.minute + 1) % 60) else (now.minute + 30) % 60
+            entry = ScheduleEntry(name, 'bench', last_run_at=now, schedule=crontab(minute=minute), app=app)
+        else:
+            every = timedelta(minutes=rnd.randint(1, 60))
+            entry = ScheduleEntry(name, 'bench', last_run_at=now, schedule=schedule(every), app=app)
+        entries[name] = entry
+    return entries
+
+
+def measure(scheduler_class, app: Celery, count: int, due: int, ticks: int, seed: int) -> dict:
+    scheduler = scheduler_class(app, lazy=True)
+    scheduler.data = make_entries(app, count, due, seed)
+
+    started_at = time.perf_counter()
+    scheduler.populate_heap()
+    # celery tick repopulates heap if copy of schedule for comparison is missing
+    scheduler.old_schedulers = dict(scheduler.schedule)
+    populate = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    while scheduler.sent < due:
+        scheduler.tick()
+    due_duration = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _ in range(ticks):
+        scheduler.tick()
+    idle_duration = time.perf_counter() - started_at
+
+    return {
+        'populate_ms': round(populate * 1000, 3),
+        'idle_tick_us': round(idle_duration / ticks * 1e6, 3),
+        'due_tick_us': round(due_duration / due * 1e6, 3) if due else 0.0,
+        'sent': scheduler.sent,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000], help='counts of entries')
+    parser.add_argument('--due', type=float, default=0.01, help='share of overdue entries')
+    parser.add_argument('--ticks', type=int, default=100, help='idle ticks')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='save report to json file')
+    args = parser.parse_args()
+
+    app = Celery('bench_beat_tick', broker='memory://', set_as_current=False)
+    app.conf.beat_max_loop_interval = 300
+    report = {'params': vars(args), 'results': {}}
+    print(f"{'entries':>8} {'scheduler':>10} {'populate ms':>12} {'idle tick us':>13} {'due tick us':>12}")
+    for size in args.sizes:
+        due = int(size * args.due)
+        for scheduler_name, scheduler_class in (('celery', CeleryTickScheduler), ('heap', HeapTickScheduler)):
+            result = measure(scheduler_class, app, size, due, args.ticks, args.seed)
+            report['results'].setdefault(str(size), {})[scheduler_name] = result
+            print(f"{size:>8} {scheduler_name:>10} {result['populate_ms']:>12} {result['idle_tick_us']:>13} "
+                  f"{result['due_tick_us']:>12}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+End-to-end throughput benchmark of otl and group_otl tasks.
+
+Tasks run in an in-process celery worker (thread pool) with in-memory broker against local fake jobsmanager,
+so results depend only on the code of plugin and benchmark parameters and are comparable across commits.
+Redis from super_scheduler.conf is required (leases, circuit breaker, coalescing).
+
+Run from complex_rest directory:
+    python ./plugin_dev/super_scheduler/tests/benchmark/bench_otl.py --tasks 200 --concurrency 16 --output base.json
+    python ./plugin_dev/super_scheduler/tests/benchmark/bench_otl.py --tasks 200 --concurrency 16 --compare base.json
+    python ./plugin_dev/super_scheduler/tests/benchmark/bench_otl.py --task group_otl --lines 5 --distributed
+
+Report: throughput (tasks/sec), p50/p99 of task latency (first publish -> last run of task finished),
+tcp connections and requests to jobsmanager, http sessions stats of worker.
+"""
+from collections import defaultdict
+from pathlib import Path
+import subprocess
+import threading
+import argparse
+import json
+import math
+import time
+import sys
+import os
+
+from fake_jobsmanager import FakeJobsManager
+
+
+PLUGIN_DIR = Path(__file__).resolve().parents[2]
+TASK_NAME_PREFIX = 'bench_'
+
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    if not values:
+        return 0.0
+    values = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=PLUGIN_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def setup_environment(settings_module: str):
+    # complex_rest directory (core package) and plugin directory
+    sys.path[:0] = [os.getcwd(), str(PLUGIN_DIR)]
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+class TaskTracker:
+    """
+    Track benchmark tasks by periodic task name through celery signals; re-enqueued runs of detached otl
+    and lines of distributed group_otl belong to the task they were started by.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.first_publish = {}
+        self.last_finish = {}
+        self.outstanding = defaultdict(int)
+        self.failed = set()
+        self.retries = 0
+        self.last_activity = time.time()
+
+    @staticmethod
+    def key(kwargs) -> str:
+        name = (kwargs or {}).get('name') or ''
+        # lines of distributed group are named '<periodic task name>:<line number>'
+        name = name.split(':', 1)[0]
+        return name if name.startswith(TASK_NAME_PREFIX) else None
+
+    def connect(self):
+        from celery.signals import before_task_publish, task_postrun, task_failure, task_retry
+        before_task_publish.connect(self.on_publish, weak=False)
+        task_postrun.connect(self.on_postrun, weak=False)
+        task_failure.connect(self.on_failure, weak=False)
+        task_retry.connect(self.on_retry, weak=False)
+
+    def on_publish(self, body=None, **kwargs):
+        # message protocol 2: (args, kwargs, embed)
+        key = self.key(body[1] if isinstance(body, (list, tuple)) else None)
+        if key is None:
+            return
+        with self._lock:
+            self.first_publish.setdefault(key, time.time())
+            self.outstanding[key] += 1
+            self.last_activity = time.time()
+
+    def on_postrun(self, kwargs=None, **other):
+        key = self.key(kwargs)
+        if key is None:
+            return
+        with self._lock:
+            self.outstanding[key] -= 1
+            self.last_finish[key] = self.last_activity = time.time()
+
+    def on_failure(self, kwargs=None, **other):
+        key = self.key(kwargs)
+        if key is not None:
+            with self._lock:
+                self.failed.add(key)
+
+    def on_retry(self, **kwargs):
+        with self._lock:
+            self.retries += 1
+
+    def wait(self, count: int, timeout: float, settle: float) -> bool:
+        """
+        Wait until all tasks are finished and nothing is published for settle seconds.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                finished = len(self.first_publish) >= count and not any(self.outstanding.values())
+                quiet = time.time() - self.last_activity >= settle
+            if finished and quiet:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def latencies(self) -> list:
+        return [self.last_finish[key] - self.first_publish[key]
+                for key in self.first_publish if key in self.last_finish and not self.outstanding[key]]
+
+
+def send_tasks(args, fake_address: str):
+    from super_scheduler.tasks import otl, group_otl
+
+    run_id = str(int(time.time()))
+    common = {
+        'complex_rest_address': fake_address,
+        'timeout': args.timeout,
+        'polling_policy': args.polling_policy,
+        'save_result': args.save_result,
+    }
+    for i in range(args.tasks):
+        name = f'{TASK_NAME_PREFIX}{args.task}_{i}'
+        # distinct lines aren't coalesced unless it's requested
+        line_number = 0 if args.same_line else i
+        if args.task == 'otl':
+            otl.apply_async(
+                args=(f'| makeresults count={line_number}',),
+                kwargs={**common, 'name': name, 'sid': f'bench-{run_id}-{i}', 'detached': args.detached},
+            )
+        else:
+            lines = [f'| makeresults count={line_number} | eval line={j}' for j in range(args.lines)]
+            group_otl.apply_async(
+                args=lines,
+                kwargs={**common, 'name': name, 'concurrency': args.group_concurrency,
+                        'distributed': args.distributed},
+            )
+
+
+def run(args) -> dict:
+    setup_environment(args.settings)
+    from celery.contrib.testing.worker import start_worker
+    from core.celeryapp import app
+    from super_scheduler.utils.http_session import HttpSessions
+
+    app.conf.update(broker_url=args.broker, result_backend=args.backend)
+
+    server = FakeJobsManager(
+        makejob_latency=args.makejob_latency, checkjob_latency=args.checkjob_latency,
+        getresult_latency=args.checkjob_latency, job_duration=args.job_duration,
+        failure_rate=args.failure_rate, result_rows=args.result_rows, seed=args.seed,
+    ).start()
+    tracker = TaskTracker()
+    tracker.connect()
+    expected = args.tasks
+
+    try:
+        with start_worker(app, pool='threads', concurrency=args.concurrency, perform_ping_check=False,
+                          loglevel='WARNING', shutdown_timeout=args.timeout):
+            started_at = time.time()
+            send_tasks(args, server.address)
+            completed = tracker.wait(expected, args.max_duration, args.settle)
+            duration = max(tracker.last_finish.values(), default=time.time()) - started_at
+            http_stats = HttpSessions.stats().get(server.address, {})
+    finally:
+        server.stop()
+
+    latencies = tracker.latencies()
+    return {
+        'commit': git_commit(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'params': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'completed': completed,
+        'tasks': len(latencies),
+        'failed': len(tracker.failed),
+        'retries': tracker.retries,
+        'duration': round(duration, 3),
+        'throughput': round(len(latencies) / duration, 3) if duration > 0 else 0.0,
+        'latency_p50': round(percentile(latencies, 50), 3),
+        'latency_p99': round(percentile(latencies, 99), 3),
+        'jobsmanager': server.stats(),
+        'http_sessions': http_stats,
+    }
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> bool:
+    """
+    Print changes against baseline report.
+
+    :return: False if throughput dropped or p99 latency grew more than max_regression
+    """
+    ok = True
+    print(f"Compare {report['commit']} with {baseline['commit']}:")
+    rows = (
+        ('throughput', report['throughput'], baseline['throughput'], True),
+        ('latency_p50', report['latency_p50'], baseline['latency_p50'], False),
+        ('latency_p99', report['latency_p99'], baseline['latency_p99'], False),
+        ('connections', report['jobsmanager']['connections'], baseline['jobsmanager']['connections'], False),
+    )
+    for name, value, base_value, higher_is_better in rows:
+        change = (value - base_value) / base_value if base_value else 0.0
+        regression = -change if higher_is_better else change
+        mark = ''
+        if name in ('throughput', 'latency_p99') and regression > max_regression:
+            mark, ok = '  REGRESSION', False
+        print(f'  {name:<12} {base_value:>10} -> {value:>10} ({change:+.1%}){mark}')
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--task', choices=('otl', 'group_otl'), default='otl')
+    parser.add_argument('--tasks', type=int, default=100, help='count of tasks')
+    parser.add_argument('--concurrency', type=int, default=8, help='worker threads')
+    parser.add_argument('--lines', type=int, default=3, help='otl lines of group_otl')
+    parser.add_argument('--group-concurrency', type=int, default=1, help='group_otl concurrency param')
+    parser.add_argument('--distributed', action='store_true', help='group_otl distributed param')
+    parser.add_argument('--detached', action='store_true', help='otl detached param')
+    parser.add_argument('--same-line', action='store_true', help='send the same otl line in all tasks')
+    parser.add_argument('--save-result', action='store_true', help='otl save_result param')
+    parser.add_argument('--polling-policy', default='fixed')
+    parser.add_argument('--timeout', type=int, default=100, help='otl timeout param')
+    parser.add_argument('--makejob-latency', type=float, default=0.01)
+    parser.add_argument('--checkjob-latency', type=float, default=0.005)
+    parser.add_argument('--job-duration', type=float, default=0.5)
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='probability of jobsmanager 500 response')
+    parser.add_argument('--result-rows', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-duration', type=float, default=600, help='max seconds of benchmark')
+    parser.add_argument('--settle', type=float, default=1.0, help='seconds without new tasks to finish')
+    parser.add_argument('--broker', default='memory://')
+    parser.add_argument('--backend', default='cache+memory://')
+    parser.add_argument('--settings', default='core.settings.test', help='django settings module')
+    parser.add_argument('--output', help='save report to json file')
+    parser.add_argument('--compare', help='baseline report json file')
+    parser.add_argument('--max-regression', type=float, default=0.1)
+    args = parser.parse_args()
+
+    report = run(args)
+    print(json.dumps(report, indent=4))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    ok = report['completed']
+    if args.compare:
+        with open(args.compare) as f:
+            ok = compare(report, json.load(f), args.max_regression) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Local stand-in of complex_rest jobsmanager for benchmarks.
+
+Serves '<prefix>/makejob', '<prefix>/checkjob', '<prefix>/getresult' and result data files with configurable latency,
+job duration and failure injection; counts tcp connections and requests.
+
+Run standalone:
+    python fake_jobsmanager.py --port 8111 --job-duration 2 --failure-rate 0.01
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+from collections import Counter
+import argparse
+import threading
+import random
+import json
+import time
+
+
+class FakeJobsManagerHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_form(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode() if length else ''
+        query = urlparse(self.path).query
+        return {key: values[0] for key, values in parse_qs('&'.join(filter(None, (body, query)))).items()}
+
+    def _send(self, code: int, body: bytes, content_type: str = 'application/json'):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, code: int, data: dict):
+        self._send(code, json.dumps(data).encode())
+
+    def _handle(self):
+        server: FakeJobsManager = self.server
+        path = urlparse(self.path).path.rstrip('/')
+        endpoint = path.rsplit('/', 1)[-1]
+        server.count_request(endpoint)
+        form = self._read_form()
+
+        if path.startswith(server.data_prefix):
+            rows = (json.dumps({'_time': i, 'value': i * 0.5, 'sid': endpoint}) for i in range(server.result_rows))
+            return self._send(200, '\n'.join(rows).encode(), 'application/x-ndjson')
+
+        if endpoint not in ('makejob', 'checkjob', 'getresult'):
+            return self._send_json(404, {'status': 'failed', 'error': f'unknown endpoint {path}'})
+
+        time.sleep(server.latency[endpoint])
+        if server.fail():
+            return self._send_json(500, {'status': 'failed', 'error': 'injected failure'})
+
+        sid = form.get('sid')
+        if endpoint == 'makejob':
+            server.make_job(sid)
+            return self._send_json(200, {'status': 'success'})
+        if endpoint == 'checkjob':
+            return self._send_json(200, {'status': server.job_status(sid)})
+        return self._send_json(200, {'status': 'success', 'data_urls': [f'{server.data_prefix}/{sid}']})
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+class FakeJobsManager(ThreadingHTTPServer):
+
+    daemon_threads = True
+    data_prefix = '/fake_jobsmanager_data'
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 makejob_latency: float = 0.01, checkjob_latency: float = 0.005, getresult_latency: float = 0.005,
+                 job_duration: float = 0.5, failure_rate: float = 0.0, result_rows: int = 100, seed: int = 0):
+        """
+        :param makejob_latency: seconds of makejob response
+        :param checkjob_latency: seconds of checkjob response
+        :param getresult_latency: seconds of getresult response
+        :param job_duration: seconds from makejob to 'success' status of job
+        :param failure_rate: probability of 500 response
+        :param result_rows: rows in result data
+        :param seed: random seed of failures
+        """
+        super().__init__((host, port), FakeJobsManagerHandler)
+        self.latency = {'makejob': makejob_latency, 'checkjob': checkjob_latency, 'getresult': getresult_latency}
+        self.job_duration = job_duration
+        self.failure_rate = failure_rate
+        self.result_rows = result_rows
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._thread = None
+        self.connections = 0
+        self.requests = Counter()
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f'{host}:{port}'
+
+    def get_request(self):
+        request = super().get_request()
+        with self._lock:
+            self.connections += 1
+        return request
+
+    def count_request(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.failure_rate
+
+    def make_job(self, sid: str):
+        with self._lock:
+            self._jobs.setdefault(sid, time.time() + self.job_duration)
+
+    def job_status(self, sid: str) -> str:
+        with self._lock:
+            finish_time = self._jobs.get(sid)
+        if finish_time is None:
+            return 'failed'
+        return 'success' if time.time() >= finish_time else 'running'
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'connections': self.connections, 'requests': dict(self.requests), 'jobs': len(self._jobs)}
+
+    def start(self) -> 'FakeJobsManager':
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-jobsmanager', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8111)
+    parser.add_argument('--makejob-latency', type=float, default=0.01)
+    parser.add_argument('--checkjob-latency', type=float, default=0.005)
+    parser.add_argument('--job-duration', type=float, default=0.5)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--result-rows', type=int, default=100)
+    args = parser.parse_args()
+
+    server = FakeJobsManager(args.host, args.port, makejob_latency=args.makejob_latency,
+                             checkjob_latency=args.checkjob_latency, job_duration=args.job_duration,
+                             failure_rate=args.failure_rate, result_rows=args.result_rows)
+    print(f'Fake jobsmanager on {server.address}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(server.stats(), indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+from unittest import TestCase
+import datetime
+import random
+
+from celery import Celery
+from celery.schedules import crontab
+import pytz
+
+from super_scheduler.schedule.schedule_objects.custom.bitset_crontab import BitsetCrontab
+
+
+FIELDS = (
+    ('*', '*/5', '0', '15,45', '0-10', '*/7', '56'),
+    ('*', '0', '*/3', '9-17', '23'),
+    ('*', 'mon-fri', 'sun', '6', '*/3'),
+    ('*', '1', '15,28', '*/10', '20', '31'),
+    ('*', '3', '*/4', '12'),
+)
+
+
+class TestBitsetCrontab(TestCase):
+    def setUp(self):
+        self.app = Celery(set_as_current=False)
+        self.app.conf.timezone = 'Europe/Moscow'
+        self.tz = pytz.timezone('Europe/Moscow')
+
+    def _schedules(self, fields, now: datetime.datetime):
+        return (crontab(*fields, nowfun=lambda: now, app=self.app),
+                BitsetCrontab(*fields, nowfun=lambda: now, app=self.app))
+
+    def test_same_as_celery_crontab(self):
+        rnd = random.Random(0)
+        for _ in range(3000):
+            fields = [rnd.choice(values) for values in FIELDS]
+            last_run_at = self.tz.localize(
+                datetime.datetime(2024, 1, 1) + datetime.timedelta(minutes=rnd.randrange(2 * 366 * 24 * 60)))
+            now = last_run_at + datetime.timedelta(seconds=rnd.randrange(60))
+            if now.day != last_run_at.day:
+                continue
+            celery_crontab, bitset_crontab = self._schedules(fields, now)
+            self.assertEqual(bitset_crontab.is_due(last_run_at), celery_crontab.is_due(last_run_at),
+                             f'{fields} {last_run_at} {now}')
+
+            celery_crontab, bitset_crontab = self._schedules(fields, last_run_at)
+            self.assertEqual(bitset_crontab.remaining_estimate(last_run_at),
+                             celery_crontab.remaining_estimate(last_run_at), f'{fields} {last_run_at}')
+
+    def test_missed_fire_of_previous_day(self):
+        # celery crontab skips the rest of hour of last run if now is on another day, bitset crontab doesn't
+        fields = ('56', '*', '*/3', '*', '*')
+        last_run_at = self.tz.localize(datetime.datetime(2024, 5, 5, 23, 10))
+        now = self.tz.localize(datetime.datetime(2024, 5, 6, 0, 10))
+        celery_crontab, bitset_crontab = self._schedules(fields, now)
+        self.assertFalse(celery_crontab.is_due(last_run_at).is_due)
+        self.assertTrue(bitset_crontab.is_due(last_run_at).is_due)
@@ -0,0 +1,72 @@
+from unittest import TestCase, skipUnless
+import importlib.util
+import datetime
+
+from celery import Celery
+from celery.schedules import solar
+
+from super_scheduler.schedule.schedule_objects.custom.cached_solar import CachedSolar, NEVER_CHECK_TIMEOUT
+
+
+COORDINATES = (
+    (-37.817, 144.967),  # Melbourne
+    (0.0, 0.0),
+    (55.756, 37.617),  # Moscow
+    (68.970, 33.075),  # Murmansk: polar day and night
+    (78.223, 15.646),  # Longyearbyen
+    (-77.846, 166.676),  # McMurdo
+)
+LAST_RUNS = [datetime.datetime(2024, month, 20, hour, tzinfo=datetime.timezone.utc)
+             for month in (1, 3, 6, 9, 12) for hour in (0, 13)]
+SECOND = datetime.timedelta(seconds=1)
+MINUTE = datetime.timedelta(minutes=1)
+DAY = datetime.timedelta(days=1)
+
+
+@skipUnless(importlib.util.find_spec('ephem'), 'ephem is not installed')
+class TestCachedSolar(TestCase):
+    def setUp(self):
+        self.app = Celery(set_as_current=False)
+        self.app.conf.timezone = 'UTC'
+
+    def _schedules(self, event: str, lat: float, lon: float, now: datetime.datetime):
+        return (solar(event, lat, lon, nowfun=lambda: now, app=self.app),
+                CachedSolar(event, lat, lon, nowfun=lambda: now, app=self.app))
+
+    @staticmethod
+    def _event_after(schedule: solar, start: datetime.datetime):
+        """
+        Event found by ephem in one search from start, None if the sun doesn't rise or set.
+        """
+        ephem = schedule.ephem
+        kwargs = {'use_center': True} if schedule.use_center else {}
+        try:
+            next_utc = getattr(schedule.cal, schedule.method)(ephem.Sun(), start=start.replace(tzinfo=None), **kwargs)
+        except ephem.CircumpolarError:
+            return None
+        return next_utc.datetime().replace(tzinfo=datetime.timezone.utc)
+
+    def test_same_as_celery_solar(self):
+        for event in sorted(solar._all_events):
+            for lat, lon in COORDINATES:
+                for last_run_at in LAST_RUNS:
+                    msg = f'{event} {lat} {lon} {last_run_at}'
+                    celery_solar, cached_solar = self._schedules(event, lat, lon, last_run_at)
+                    remaining = cached_solar.remaining_estimate(last_run_at)
+                    self.assertNotEqual(remaining, NEVER_CHECK_TIMEOUT, msg)
+                    next_event_at = last_run_at + remaining
+
+                    if self._event_after(celery_solar, last_run_at) is not None:
+                        celery_event_at = last_run_at + celery_solar.remaining_estimate(last_run_at)
+                        self.assertAlmostEqual(next_event_at, celery_event_at, delta=SECOND, msg=msg)
+                        continue
+
+                    # polar day or night: celery checks again next day, cached solar waits for the next event
+                    start = last_run_at
+                    while start < next_event_at - DAY:
+                        event_at = self._event_after(celery_solar, start)
+                        self.assertTrue(event_at is None or event_at >= next_event_at - SECOND, msg)
+                        start += DAY
+                    celery_solar, _ = self._schedules(event, lat, lon, next_event_at - MINUTE)
+                    self.assertAlmostEqual(celery_solar.remaining_estimate(next_event_at - MINUTE), MINUTE,
+                                           delta=SECOND, msg=msg)
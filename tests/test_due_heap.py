@@ -0,0 +1,110 @@
+from unittest import TestCase
+import time
+
+from super_scheduler.utils.due_heap import DueTimeHeap, HeapTickMixin
+
+
+class TestDueTimeHeap(TestCase):
+    def test_order(self):
+        heap = DueTimeHeap()
+        for name, due_at in (('a', 3), ('b', 1), ('c', 2)):
+            heap.push(name, name, due_at)
+        self.assertEqual(len(heap), 3)
+        self.assertEqual(heap.peek().name, 'b')
+
+    def test_replace(self):
+        heap = DueTimeHeap()
+        heap.push('a', 'old', 1)
+        heap.push('b', 'b', 2)
+        heap.push('a', 'new', 3)
+        self.assertEqual(len(heap), 2)
+        self.assertEqual(heap.peek().name, 'b')
+        heap.remove('b')
+        item = heap.peek()
+        self.assertEqual((item.name, item.entry, item.due_at), ('a', 'new', 3))
+
+    def test_remove(self):
+        heap = DueTimeHeap()
+        heap.push('a', 'a', 1)
+        heap.push('b', 'b', 2)
+        heap.remove('a')
+        heap.remove('not_exist')
+        self.assertEqual(len(heap), 1)
+        self.assertEqual(heap.peek().name, 'b')
+        heap.remove('b')
+        self.assertIsNone(heap.peek())
+
+    def test_compaction(self):
+        heap = DueTimeHeap()
+        heap.push('a', 'a', 0)
+        for i in range(1000):
+            heap.push('b', 'b', 1000 - i)
+        # stale items of replaced entry don't pile up
+        self.assertLessEqual(len(heap._heap), 2 * len(heap) + 64 + 1)
+        self.assertEqual(heap.peek().name, 'a')
+        heap.remove('a')
+        self.assertEqual(heap.peek().due_at, 1)
+
+
+class FakeEntry:
+    def __init__(self, name: str, due: bool, next_time_to_run: float):
+        self.name = name
+        self.due = due
+        self.next_time_to_run = next_time_to_run
+
+
+class FakeScheduler(HeapTickMixin):
+    """
+    Minimal celery Scheduler: entries say if they are due, sent entries aren't due until next run.
+    """
+    max_interval = 5
+    producer = None
+
+    def __init__(self, entries: list):
+        self.schedule = {entry.name: entry for entry in entries}
+        self.sent = []
+
+    def is_due(self, entry: FakeEntry):
+        return entry.due, entry.next_time_to_run
+
+    def reserve(self, entry: FakeEntry) -> FakeEntry:
+        return FakeEntry(entry.name, False, entry.next_time_to_run)
+
+    def apply_entry(self, entry: FakeEntry, producer=None):
+        self.sent.append(entry.name)
+
+    def adjust(self, n: float, drift: float = -0.010) -> float:
+        return n + drift if n > 0 else n
+
+
+class TestHeapTick(TestCase):
+    def test_tick(self):
+        scheduler = FakeScheduler([
+            FakeEntry('due1', True, 10), FakeEntry('due2', True, 10), FakeEntry('not_due', False, 3),
+        ])
+        delay = scheduler.tick()
+        # every due entry is sent once, next check is at the earliest fire time
+        self.assertEqual(sorted(scheduler.sent), ['due1', 'due2'])
+        self.assertAlmostEqual(delay, 3, delta=0.1)
+        self.assertEqual(len(scheduler._due_heap), 3)
+        self.assertEqual(scheduler._due_heap.peek().name, 'not_due')
+
+        scheduler.tick()
+        self.assertEqual(sorted(scheduler.sent), ['due1', 'due2'])
+
+    def test_tick_not_due(self):
+        scheduler = FakeScheduler([])
+        scheduler.tick()
+        # fire time has come by heap, but entry isn't due yet (clock drift): it's re-pushed, not sent
+        now = time.time()
+        scheduler._due_heap.push('early', FakeEntry('early', False, 7), now - 1)
+        delay = scheduler.tick()
+        self.assertEqual(scheduler.sent, [])
+        item = scheduler._due_heap.peek()
+        self.assertEqual(item.name, 'early')
+        self.assertAlmostEqual(item.due_at, now + 7, delta=0.5)
+        self.assertEqual(delay, scheduler.max_interval)
+
+    def test_tick_empty(self):
+        scheduler = FakeScheduler([])
+        self.assertEqual(scheduler.tick(), scheduler.max_interval)
@@ -0,0 +1,133 @@
+from unittest import TestCase, mock
+
+from super_scheduler.tasks import otl, group_otl, OtlTaskMethods
+from super_scheduler.utils.otl_coalescing import OtlJobCoalescer, normalize_otl_line, get_coalescing_stats, \
+    _JOIN_SCRIPT, _RELEASE_SCRIPT
+
+
+class FakeRedis:
+    """
+    Redis with join and release scripts of coalescer.
+    """
+
+    def __init__(self):
+        self.values, self.hashes = {}, {}
+
+    def eval(self, script: str, numkeys: int, *keys_and_args):
+        keys, args = keys_and_args[:numkeys], [str(arg).encode() for arg in keys_and_args[numkeys:]]
+        if script == _JOIN_SCRIPT:
+            stats = self.hashes.setdefault(keys[1], {})
+            stats[b'total'] = stats.get(b'total', 0) + 1
+            if keys[0] in self.values:
+                stats[b'coalesced'] = stats.get(b'coalesced', 0) + 1
+                return [self.values[keys[0]], 0]
+            self.values[keys[0]] = args[0]
+            return [args[0], 1]
+        if script == _RELEASE_SCRIPT:
+            if self.values.get(keys[0]) == args[0]:
+                del self.values[keys[0]]
+                return 1
+            return 0
+        raise ValueError('Unknown script')
+
+    def hgetall(self, key: str) -> dict:
+        return self.hashes.get(key, {})
+
+
+class RedisTestCase(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        self.redis = FakeRedis()
+        patch = mock.patch('super_scheduler.utils.otl_coalescing.get_redis_connection', return_value=self.redis)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+
+class TestOtlJobCoalescer(RedisTestCase):
+    @staticmethod
+    def _key(otl_line: str = '| makeresults count=1', complex_rest_address: str = 'localhost:8080',
+             tws: int = 0, twf: int = 10, username: str = 'admin', row_limit: int = 10) -> str:
+        return OtlJobCoalescer(otl_line, complex_rest_address, tws, twf, username, 100, row_limit).key
+
+    def test_normalize_otl_line(self):
+        self.assertEqual(normalize_otl_line('  | search  a="x  y"\n|  head '), '| search a="x  y" | head')
+        self.assertEqual(normalize_otl_line("| eval b = 'c\\'  d'"), "| eval b = 'c\\'  d'")
+
+    def test_key(self):
+        self.assertEqual(self._key(), self._key(otl_line=' |  makeresults\tcount=1 '))
+        self.assertNotEqual(self._key(otl_line='| search a="x y"'), self._key(otl_line='| search a="x  y"'))
+        self.assertNotEqual(self._key(), self._key(complex_rest_address='otherhost:8080'))
+        self.assertNotEqual(self._key(), self._key(tws=1))
+        self.assertNotEqual(self._key(), self._key(twf=11))
+        self.assertNotEqual(self._key(), self._key(username='user'))
+        self.assertNotEqual(self._key(), self._key(row_limit=0))
+
+    def test_join_release(self):
+        coalescer = OtlJobCoalescer('| makeresults', 'localhost:8080', 0, 10, 'admin', 100)
+        self.assertEqual(coalescer.join('test_sid1'), ('test_sid1', True))
+        self.assertEqual(coalescer.join('test_sid2'), ('test_sid1', False))
+        # only leader finishes job
+        coalescer.release('test_sid2')
+        self.assertEqual(coalescer.join('test_sid3'), ('test_sid1', False))
+        coalescer.release('test_sid1')
+        self.assertEqual(coalescer.join('test_sid4'), ('test_sid4', True))
+        self.assertEqual(get_coalescing_stats(), {'total': 4, 'coalesced': 2, 'ratio': 0.5})
+
+
+class TestCoalescedTasks(RedisTestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        super().setUp()
+        self.makejob = mock.Mock()
+        self.checkjob = mock.Mock()
+        patches = (
+            mock.patch('super_scheduler.tasks.OTL_COALESCING', True),
+            mock.patch('super_scheduler.tasks.JOBSMANAGER_TRANSIT', 'jobsmanager'),
+            mock.patch.object(OtlTaskMethods, 'makejob', self.makejob),
+            mock.patch.object(OtlTaskMethods, 'checkjob', self.checkjob),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.coalescer = OtlJobCoalescer('| makeresults', 'localhost:8080', 0, 0, 'admin', 100, 10)
+
+    def _run_otl(self, sid: str):
+        otl.push_request(id=sid, hostname='test')
+        try:
+            otl.run('| makeresults', complex_rest_address='localhost:8080', sid=sid, row_limit=10)
+        finally:
+            otl.pop_request()
+
+    def test_otl_leader_releases_job(self):
+        self._run_otl('test_sid1')
+        self.makejob.assert_called_once()
+        self.assertEqual(self.coalescer.join('test_sid2'), ('test_sid2', True))
+
+    def test_otl_follower_waits_leader_job(self):
+        self.coalescer.join('test_sid1')
+        self._run_otl('test_sid2')
+        self.makejob.assert_not_called()
+        self.checkjob.assert_called_once()
+        # follower doesn't finish job of leader
+        self.assertEqual(self.coalescer.join('test_sid3'), ('test_sid1', False))
+
+    def test_failed_otl_leader_releases_job(self):
+        self.checkjob.side_effect = TimeoutError()
+        with self.assertRaises(TimeoutError):
+            self._run_otl('test_sid1')
+        self.assertEqual(self.coalescer.join('test_sid2'), ('test_sid2', True))
+
+    def test_failed_group_line_releases_job(self):
+        self.checkjob.side_effect = [None, TimeoutError()]
+        group_otl.push_request(id='test_group_id', hostname='test')
+        try:
+            with self.assertRaises(TimeoutError):
+                group_otl.run('| makeresults', '| makeresults', complex_rest_address='localhost:8080', row_limit=10)
+        finally:
+            group_otl.pop_request()
+        self.assertEqual(self.makejob.call_count, 2)
+        self.assertEqual(self.coalescer.join('test_sid'), ('test_sid', True))
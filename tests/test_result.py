@@ -0,0 +1,119 @@
+import unittest
+import tempfile
+import shutil
+import json
+
+from rest.test import TestCase, APIClient
+from rest_auth.models import User
+
+from super_scheduler.settings import RESULT_SPOOL_DIR
+from super_scheduler.utils.result_spool import ResultSpool
+
+
+def get_user_token(client: APIClient, login: str = 'admin', password: str = 'admin'):
+    data = {
+        "login": login,
+        "password": password,
+    }
+    response = client.post('/auth/login/', data=data)
+    return response.data['token']
+
+
+def json_chunks(records: list) -> list:
+    """
+    One data file of result, split in the middle of line like http stream.
+    """
+    data = '\n'.join(json.dumps(record) for record in records).encode()
+    return [[data[:len(data) // 2], data[len(data) // 2:]]]
+
+
+class TestResult(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        self.admin_user = User(username='admin', is_staff=True, is_active=True)
+        self.admin_user.set_password('admin')
+        self.admin_user.save()
+
+        self.client = APIClient()
+        self.user_token = get_user_token(self.client)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(self.user_token))
+
+    def test_get_result_without_sid(self):
+        response = self.client.get('/super_scheduler/v1/result/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_result_invalid_sid(self):
+        response = self.client.get('/super_scheduler/v1/result/', {'sid': '../settings'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_result_not_exist(self):
+        response = self.client.get('/super_scheduler/v1/result/', {'sid': 'not_exist_sid'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_get_result_of_owner(self):
+        spool = ResultSpool(RESULT_SPOOL_DIR)
+        spool.save('test_result_sid', json_chunks([{'count': 1}]), username='owner')
+        self.addCleanup(shutil.rmtree, spool.result_dir('test_result_sid'), ignore_errors=True)
+
+        for username in ('owner', 'other'):
+            user = User(username=username, is_staff=False, is_active=True)
+            user.set_password(username)
+            user.save()
+        client = APIClient()
+
+        for username, status_code in (('owner', 200), ('other', 403)):
+            client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(get_user_token(client, username, username)))
+            response = client.get('/super_scheduler/v1/result/', {'sid': 'test_result_sid'})
+            self.assertEqual(response.status_code, status_code)
+
+        # staff reads results of all users
+        response = self.client.get('/super_scheduler/v1/result/', {'sid': 'test_result_sid'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [{'count': 1}])
+
+
+class TestResultSpool(unittest.TestCase):
+    def setUp(self):
+        self.spool = ResultSpool(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.spool.spool_dir, ignore_errors=True)
+
+    def test_save_read_slice(self):
+        records = [
+            {'_time': 1, 'flag': True, 'value': 1.5, 'name': 'a', 'mixed': 1},
+            {'_time': 2, 'flag': False, 'value': None, 'name': None, 'mixed': 'b'},
+            {'_time': 3, 'flag': True, 'value': 3, 'mixed': [1, 2]},
+        ]
+        meta = self.spool.save('sid', json_chunks(records), username='admin')
+        self.assertEqual(meta['rows'], 3)
+        self.assertEqual(meta['username'], 'admin')
+        self.assertEqual(meta['columns'], [
+            {'name': '_time', 'type': 'int'},
+            {'name': 'flag', 'type': 'int'},
+            {'name': 'value', 'type': 'float'},
+            {'name': 'name', 'type': 'str'},
+            {'name': 'mixed', 'type': 'str'},
+        ])
+
+        # lossy types: bool -> int, null and missing value of str column -> '', values of mixed column -> json
+        data = self.spool.read_slice('sid', 0, 10)
+        self.assertEqual(data['data'], [
+            {'_time': 1, 'flag': 1, 'value': 1.5, 'name': 'a', 'mixed': '1'},
+            {'_time': 2, 'flag': 0, 'value': None, 'name': '', 'mixed': 'b'},
+            {'_time': 3, 'flag': 1, 'value': 3.0, 'name': '', 'mixed': '[1, 2]'},
+        ])
+
+        data = self.spool.read_slice('sid', 1, 1, columns=['name', 'mixed'])
+        self.assertEqual(data['offset'], 1)
+        self.assertEqual(data['rows'], 3)
+        self.assertEqual(data['data'], [{'name': '', 'mixed': 'b'}])
+
+        self.assertEqual(self.spool.read_slice('sid', 5, 10)['data'], [])
+        self.assertIsNone(self.spool.read_slice('not_exist_sid'))
+
+    def test_row_limit(self):
+        self.spool.save('sid', json_chunks([{'count': i} for i in range(10)]), row_limit=4)
+        data = self.spool.read_slice('sid', 0, 100)
+        self.assertEqual(data['rows'], 4)
+        self.assertEqual([record['count'] for record in data['data']], [0, 1, 2, 3])
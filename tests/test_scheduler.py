@@ -0,0 +1,110 @@
+from unittest import mock
+import datetime
+import json
+
+from rest.test import TestCase
+from celery.schedules import crontab
+from django_celery_beat.models import PeriodicTask, IntervalSchedule, CrontabSchedule
+
+from core.celeryapp import app
+from super_scheduler.scheduler import IncrementalDatabaseScheduler, SYNC_LAG
+from super_scheduler.schedule.schedule_objects.custom.bitset_crontab import BitsetCrontab, BITSET_CRONTAB_KWARG
+
+
+class TestIncrementalScheduler(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        def subscribe(scheduler: IncrementalDatabaseScheduler):
+            scheduler._pubsub = mock.Mock(**{'get_message.return_value': None})
+
+        patch = mock.patch.object(IncrementalDatabaseScheduler, '_subscribe', autospec=True, side_effect=subscribe)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.interval = IntervalSchedule.objects.create(every=10, period=IntervalSchedule.SECONDS)
+        self._create_task('test_task1')
+        self.scheduler = IncrementalDatabaseScheduler(app=app, lazy=True)
+        self.assertEqual(set(self.scheduler.schedule), {'test_task1'})
+        self.scheduler.populate_heap()
+
+    def _create_task(self, name: str) -> PeriodicTask:
+        return PeriodicTask.objects.create(name=name, task='super_scheduler.tasks.logger_msg',
+                                           interval=self.interval, kwargs='{"name": "%s"}' % name)
+
+    def _assert_entries(self, names: set):
+        self.assertEqual(set(self.scheduler._schedule), names)
+        self.assertEqual(set(self.scheduler._due_heap._items), names)
+
+    def test_add(self):
+        self._create_task('test_task2')
+        self.scheduler.apply_changes()
+        self._assert_entries({'test_task1', 'test_task2'})
+
+    def test_update(self):
+        p_task = PeriodicTask.objects.get(name='test_task1')
+        p_task.interval = IntervalSchedule.objects.create(every=20, period=IntervalSchedule.SECONDS)
+        p_task.save()
+        self.scheduler.apply_changes()
+        self._assert_entries({'test_task1'})
+        self.assertEqual(self.scheduler._schedule['test_task1'].schedule.run_every, datetime.timedelta(seconds=20))
+        self.assertIs(self.scheduler._due_heap.peek().entry, self.scheduler._schedule['test_task1'])
+
+    def test_disable(self):
+        p_task = PeriodicTask.objects.get(name='test_task1')
+        p_task.enabled = False
+        p_task.save()
+        self.assertEqual(self.scheduler.apply_changes(), 1)
+        self._assert_entries(set())
+
+    def test_delete(self):
+        PeriodicTask.objects.filter(name='test_task1').delete()
+        self.scheduler._notified_names.add('test_task1')
+        self.assertEqual(self.scheduler.apply_changes(), 1)
+        self._assert_entries(set())
+
+    def test_delete_without_notification(self):
+        PeriodicTask.objects.filter(name='test_task1').delete()
+        # names of all periodic tasks are read only after change without notification
+        self.assertEqual(self.scheduler.apply_changes(), 0)
+        self._assert_entries({'test_task1'})
+
+        self.scheduler._last_change_check = 0
+        with mock.patch.object(self.scheduler, 'schedule_changed', return_value=True):
+            self.assertTrue(self.scheduler._changed())
+        self.assertEqual(self.scheduler.apply_changes(), 1)
+        self._assert_entries(set())
+
+    def test_committed_later(self):
+        # 'date_changed' set before commit of long transaction is older than already read rows
+        self._create_task('test_task2')
+        PeriodicTask.objects.filter(name='test_task2').update(
+            date_changed=self.scheduler._last_sync - SYNC_LAG / 2)
+        self.scheduler.apply_changes()
+        self._assert_entries({'test_task1', 'test_task2'})
+
+    def test_notified(self):
+        self._create_task('test_task2')
+        PeriodicTask.objects.filter(name='test_task2').update(
+            date_changed=self.scheduler._last_sync - SYNC_LAG * 2)
+        self.scheduler.apply_changes()
+        self._assert_entries({'test_task1'})
+
+        self.scheduler._notified_names.add('test_task2')
+        self.scheduler.apply_changes()
+        self._assert_entries({'test_task1', 'test_task2'})
+        self.assertEqual(self.scheduler._notified_names, set())
+
+    def test_crontab(self):
+        self._create_task('test_task2')
+        crontab_schedule = CrontabSchedule.objects.create(minute='*/5')
+        for name, kwargs in (('test_task1', {}), ('test_task2', {BITSET_CRONTAB_KWARG: True})):
+            p_task = PeriodicTask.objects.get(name=name)
+            p_task.interval, p_task.crontab = None, crontab_schedule
+            p_task.kwargs = json.dumps({'name': name, **kwargs})
+            p_task.save()
+        self.scheduler.apply_changes()
+        # only periodic tasks created as 'bitset_crontab' leave celery crontab
+        self.assertIsInstance(self.scheduler._schedule['test_task1'].schedule, crontab)
+        self.assertIsInstance(self.scheduler._schedule['test_task2'].schedule, BitsetCrontab)
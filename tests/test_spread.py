@@ -0,0 +1,108 @@
+from unittest import TestCase
+import datetime
+import pickle
+import random
+
+from celery import Celery
+from celery.schedules import crontab
+import pytz
+
+from super_scheduler.schedule.schedule_objects.custom.bitset_crontab import BitsetCrontab
+from super_scheduler.schedule.schedule_objects.custom.spread import SpreadCrontab, SpreadBalancer, spread_offset
+
+
+FIELDS = (
+    ('*', '*/5', '0', '15,45', '0-10', '*/7', '56'),
+    ('*', '0', '*/3', '9-17', '23'),
+    ('*', 'mon-fri', 'sun', '6', '*/3'),
+    ('*', '1', '15,28', '*/10', '20', '31'),
+    ('*', '3', '*/4', '12'),
+)
+
+
+class TestSpreadCrontab(TestCase):
+    def setUp(self):
+        self.app = Celery(set_as_current=False)
+        self.app.conf.timezone = 'Europe/Moscow'
+        self.tz = pytz.timezone('Europe/Moscow')
+
+    def test_fire_times_shifted_by_offset(self):
+        rnd = random.Random(0)
+        for _ in range(1000):
+            fields = [rnd.choice(values) for values in FIELDS]
+            offset = rnd.randrange(3600)
+            last_run_at = self.tz.localize(
+                datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=rnd.randrange(366 * 24 * 60 * 60)))
+            now = last_run_at + datetime.timedelta(seconds=rnd.randrange(3600))
+            shift = datetime.timedelta(seconds=offset)
+            spread_crontab = SpreadCrontab(*fields, nowfun=lambda: now, app=self.app, offset=offset)
+            bitset_crontab = BitsetCrontab(*fields, nowfun=lambda: now - shift, app=self.app)
+            self.assertEqual(spread_crontab.remaining_estimate(last_run_at),
+                             bitset_crontab.remaining_estimate(last_run_at - shift),
+                             f'{fields} {offset} {last_run_at} {now}')
+            self.assertEqual(spread_crontab.is_due(last_run_at), bitset_crontab.is_due(last_run_at - shift),
+                             f'{fields} {offset} {last_run_at} {now}')
+
+    def test_cadence_is_kept(self):
+        last_run_at = self.tz.localize(datetime.datetime(2024, 5, 6, 10, 1, 30))
+        fires = []
+        for _ in range(4):
+            now = last_run_at
+            schedule = SpreadCrontab('*/15', nowfun=lambda: now, app=self.app, offset=90)
+            last_run_at = now + schedule.remaining_estimate(last_run_at)
+            fires.append(last_run_at.time())
+        self.assertEqual(fires, [datetime.time(10, 16, 30), datetime.time(10, 31, 30),
+                                 datetime.time(10, 46, 30), datetime.time(11, 1, 30)])
+
+    def test_is_due_at_offset(self):
+        last_run_at = self.tz.localize(datetime.datetime(2024, 5, 6, 10, 1, 30))
+        before = self.tz.localize(datetime.datetime(2024, 5, 6, 10, 16, 29))
+        at = self.tz.localize(datetime.datetime(2024, 5, 6, 10, 16, 30))
+        self.assertFalse(SpreadCrontab('*/15', nowfun=lambda: before, app=self.app, offset=90)
+                         .is_due(last_run_at).is_due)
+        self.assertTrue(SpreadCrontab('*/15', nowfun=lambda: at, app=self.app, offset=90).is_due(last_run_at).is_due)
+
+    def test_pickle_keeps_offset(self):
+        schedule = SpreadCrontab('*/15', '9-17', app=self.app, offset=90)
+        self.assertEqual(pickle.loads(pickle.dumps(schedule)), schedule)
+        self.assertNotEqual(SpreadCrontab('*/15', '9-17', app=self.app, offset=30), schedule)
+        self.assertNotEqual(BitsetCrontab('*/15', '9-17', app=self.app), schedule)
+
+
+class TestSpreadBalancer(TestCase):
+    def setUp(self):
+        self.balancer = SpreadBalancer()
+        self.schedule = crontab(minute='0')
+
+    def test_offset_by_name_hash_on_equal_load(self):
+        self.assertEqual(self.balancer.place('test_spread1', self.schedule, 60), spread_offset('test_spread1', 60))
+
+    def test_least_loaded_offset(self):
+        self.balancer.add('test_task', self.schedule)
+        preferred = spread_offset('test_spread1', 3)
+        # offset 0 is taken by task without offset, the nearest free one after preferred is chosen
+        expected = min((1, 2), key=lambda offset: (offset - preferred) % 3)
+        self.assertEqual(self.balancer.place('test_spread1', self.schedule, 3), expected)
+        self.assertEqual(self.balancer.place('test_spread2', self.schedule, 3), 3 - expected)
+
+    def test_placed_task_keeps_offset(self):
+        offset = self.balancer.place('test_spread1', self.schedule, 2)
+        self.balancer.add('test_task', self.schedule)
+        self.assertEqual(self.balancer.place('test_spread1', self.schedule, 2), offset)
+
+    def test_remove_releases_load(self):
+        offset = self.balancer.place('test_spread1', self.schedule, 2)
+        self.assertEqual(self.balancer.place('test_spread2', self.schedule, 2), 1 - offset)
+        self.balancer.remove('test_spread1')
+        self.balancer.remove('test_spread2')
+        self.balancer.remove('test_unknown')
+        self.assertEqual(self.balancer.place('test_spread3', self.schedule, 2), spread_offset('test_spread3', 2))
+
+    def test_rebalance(self):
+        self.balancer.place('test_old', self.schedule, 3)
+        self.balancer.rebalance([('test_task', self.schedule, None), ('test_spread1', self.schedule, 3),
+                                 ('test_spread2', self.schedule, 3)])
+        offsets = {self.balancer.place(name, self.schedule, 3) for name in ('test_spread1', 'test_spread2')}
+        self.assertEqual(offsets, {1, 2})
+        # load of tasks placed before rebalance is dropped, all offsets are equally loaded
+        self.assertEqual(self.balancer.place('test_old', self.schedule, 3), spread_offset('test_old', 3))
@@ -2,6 +2,7 @@ import json
 from rest.response import Response
 from rest.test import TestCase, APIClient
 from rest_auth.models import User
+from django_celery_beat.models import PeriodicTask, IntervalSchedule
 
 
 def get_user_token(client: APIClient):
@@ -76,6 +77,65 @@ class TestExample(TestCase):
         response = self._detele_task()
         self.assertEqual(response.status_code, 200)
 
+    def test_create_task_bitset_crontab(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.test_logger"},
+                 "schedule": {"name": "bitset_crontab", "minute": "*/5", "hour": "9-17", "day_of_week": "mon-fri"}}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), {"schedule_type": "crontab"})
+        self.assertIn("test_logger123", response.data['periodic_tasks'])
+        self.assertIs(json.loads(response.data['periodic_tasks']['test_logger123']['kwargs'])['bitset_crontab'], True)
+
+        response = self._detele_task()
+        self.assertEqual(response.status_code, 200)
+
+    def test_create_task_spread(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.test_logger"},
+                 "schedule": {"name": "spread", "minute": "*/5", "window": 120}}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), {"schedule_type": "crontab"})
+        self.assertIn("test_logger123", response.data['periodic_tasks'])
+        self.assertEqual(json.loads(response.data['periodic_tasks']['test_logger123']['kwargs'])['spread_window'], 120)
+
+        response = self._detele_task()
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_create_task_spread_window(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.test_logger"},
+                 "schedule": {"name": "spread", "minute": "*/5", "window": 0}}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_create_task_polling_policy(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.otl",
+                          "kwargs": {"otl_line": "| makeresults count=1", "polling_policy": "not_exist"}},
+                 "schedule": {"name": "interval", "every": 20, "period": "seconds"}}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
     def test_create_task_interval(self):
         response = self.client.post(
             '/super_scheduler/v1/task/'.lower(),
@@ -142,3 +202,237 @@ class TestExample(TestCase):
             content_type='application/json'
         )
         self.assertEqual(response.status_code, 400)
+
+    def test_get_tasks_page(self):
+        for name in ("test_logger123", "test_logger124"):
+            response = self.client.post(
+                '/super_scheduler/v1/task/'.lower(),
+                json.dumps(
+                    {"task": {"name": name, "task": "super_scheduler.tasks.test_logger"},
+                     "schedule": {"name": "interval", "every": 20, "period": "seconds"}}
+                ),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(
+            '/super_scheduler/v1/task/'.lower(),
+            {"name_prefix": "test_logger", "schedule_type": "interval", "fields": "name,enabled", "limit": 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['periodic_tasks']), ["test_logger123"])
+        self.assertEqual(set(response.data['periodic_tasks']["test_logger123"]), {"name", "enabled"})
+        self.assertNotIn('running tasks', response.data)
+
+        response = self.client.get(
+            '/super_scheduler/v1/task/'.lower(),
+            {"name_prefix": "test_logger", "limit": 1, "cursor": response.data['next_cursor']}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['periodic_tasks']), ["test_logger124"])
+        self.assertIsNone(response.data['next_cursor'])
+
+    def test_get_tasks_by_owner(self):
+        interval = IntervalSchedule.objects.create(every=20, period=IntervalSchedule.SECONDS)
+        for name, kwargs in (("test_logger123", {"username": "owner"}),
+                             ("test_logger124", {"username": "other", "params": {"username": "owner"}})):
+            PeriodicTask.objects.create(name=name, task="super_scheduler.tasks.logger_msg", interval=interval,
+                                        kwargs=json.dumps(kwargs))
+
+        # only top-level 'username' of kwargs is owner
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), {"owner": "owner"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data['periodic_tasks']), ["test_logger123"])
+
+    def test_invalid_get_tasks(self):
+        for params in ({"fields": "name,unknown"}, {"schedule_type": "unknown"}, {"limit": 0}, {"cursor": "abc"}):
+            response = self.client.get('/super_scheduler/v1/task/'.lower(), params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_bulk_tasks(self):
+        schedule = {"name": "interval", "every": 20, "period": "seconds"}
+        response = self.client.post(
+            '/super_scheduler/v1/task/bulk/'.lower(),
+            json.dumps({"create": [
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.logger_msg"}, "schedule": schedule},
+                {"task": {"name": "test_logger124", "task": "super_scheduler.tasks.logger_msg"}, "schedule": schedule},
+                {"task": {"name": "test_logger124", "task": "super_scheduler.tasks.logger_msg"}, "schedule": schedule},
+                {"task": {"name": "test_logger125", "task": "not_exist"}, "schedule": schedule},
+            ]}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'partial')
+        self.assertEqual([result['status'] for result in response.data['create']],
+                         ['success', 'success', 'failed', 'failed'])
+
+        response = self.client.post(
+            '/super_scheduler/v1/task/bulk/'.lower(),
+            json.dumps({
+                "update": [{"task": {"name": "test_logger123", "task": "super_scheduler.tasks.logger_msg",
+                                     "enabled": False},
+                            "schedule": {"name": "crontab", "minute": "*/5"}}],
+                "delete": [{"task": {"name": "test_logger124"}}],
+            }),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'success')
+
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), {"name_prefix": "test_logger"})
+        self.assertEqual(list(response.data['periodic_tasks']), ["test_logger123"])
+        self.assertFalse(response.data['periodic_tasks']["test_logger123"]['enabled'])
+
+    def test_invalid_bulk_tasks(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/bulk/'.lower(),
+            json.dumps({"create": {"task": {"name": "test_logger123"}}}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_tasks_not_modified(self):
+        def create_task(name):
+            return self.client.post(
+                '/super_scheduler/v1/task/'.lower(),
+                json.dumps(
+                    {"task": {"name": name, "task": "super_scheduler.tasks.logger_msg"},
+                     "schedule": {"name": "interval", "every": 20, "period": "seconds"}}
+                ),
+                content_type='application/json'
+            )
+
+        self.assertEqual(create_task("test_logger123").status_code, 201)
+        params = {"fields": "name,task,enabled"}
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), params)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.assertEqual(create_task("test_logger124").status_code, 201)
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # run stats are changed without notification
+        response = self.client.get('/super_scheduler/v1/task/'.lower())
+        self.assertNotIn('ETag', response)
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), {"fields": "name,date_changed"})
+        self.assertNotIn('ETag', response)
+
+    def test_export_import_tasks(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.logger_msg"},
+                 "schedule": {"name": "crontab", "minute": "*/1"}}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get('/super_scheduler/v1/task/export/'.lower())
+        self.assertEqual(response.status_code, 200)
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['schedule']['name'], 'crontab')
+
+        self._detele_task()
+        records[0]['task']['enabled'] = False
+        body = '\n'.join([json.dumps(records[0]), 'not json'])
+        response = self.client.post('/super_scheduler/v1/task/import/'.lower(), body,
+                                    content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['succeeded'], 1)
+        self.assertEqual([failed['line'] for failed in response.data['failed']], [2])
+
+        response = self.client.get('/super_scheduler/v1/task/'.lower(), {"fields": "name,enabled"})
+        self.assertFalse(response.data['periodic_tasks']["test_logger123"]['enabled'])
+
+    def test_invalid_create_task_duplicate_name(self):
+        data = json.dumps(
+            {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.logger_msg"},
+             "schedule": {"name": "interval", "every": 20, "period": "seconds"}}
+        )
+        response = self.client.post('/super_scheduler/v1/task/'.lower(), data, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post('/super_scheduler/v1/task/'.lower(), data, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self._detele_task()
+        self.assertEqual(response.status_code, 200)
+        response = self._detele_task()
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_task_equivalent_schedules(self):
+        for name, minute in (("test_logger123", "*/15"), ("test_logger124", "0,15,30,45")):
+            response = self.client.post(
+                '/super_scheduler/v1/task/'.lower(),
+                json.dumps(
+                    {"task": {"name": name, "task": "super_scheduler.tasks.logger_msg"},
+                     "schedule": {"name": "crontab", "minute": minute}}
+                ),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 201)
+
+        response = self.client.get('/super_scheduler/v1/task/export/'.lower())
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([record['schedule']['minute'] for record in records], ["*/15", "*/15"])
+
+    def test_invalid_create_task_crontab(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.logger_msg"},
+                 "schedule": {"name": "crontab", "minute": "61"}}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_create_task_duplicate_definition(self):
+        for name, status_code in (("test_logger123", 201), ("test_logger124", 400)):
+            response = self.client.post(
+                '/super_scheduler/v1/task/'.lower(),
+                json.dumps(
+                    {"task": {"name": name, "task": "super_scheduler.tasks.logger_msg", "args": ["msg"],
+                              "unique": True},
+                     "schedule": {"name": "interval", "every": 20, "period": "seconds"}}
+                ),
+                content_type='application/json'
+            )
+            self.assertEqual(response.status_code, status_code)
+
+        response = self._detele_task()
+        self.assertEqual(response.status_code, 200)
+
+    def test_schedule_load(self):
+        response = self.client.post(
+            '/super_scheduler/v1/task/'.lower(),
+            json.dumps(
+                {"task": {"name": "test_logger123", "task": "super_scheduler.tasks.test_logger"},
+                 "schedule": {"name": "interval", "every": 20, "period": "seconds"},
+                 "check_load": True}
+            ),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("warning", response.data)
+        # starts of other tasks may be not projected yet, it's reported in response
+        self.assertIn("load_checked", response.data)
+        if not response.data['load_checked']:
+            self.assertIn("load_note", response.data)
+
+        response = self.client.get('/super_scheduler/v1/task/load/'.lower(), {"hours": 1, "threshold": 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['starts']['per_hour']), 1)
+        self.assertGreaterEqual(response.data['starts']['total'], 180)
+
+        response = self.client.get('/super_scheduler/v1/task/load/'.lower(), {"hours": 0})
+        self.assertEqual(response.status_code, 400)
+
+        response = self._detele_task()
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,124 @@
+from unittest import TestCase, mock
+
+from super_scheduler.utils.task_lease import TaskLease, LeaseHeartbeat, _ACQUIRE_SCRIPT, _RENEW_SCRIPT
+
+
+class FakeScript:
+    def __init__(self, script: str):
+        self.script = script
+
+    def __call__(self, keys: list, args: list, client: 'FakeRedis') -> int:
+        return client.run_script(self.script, keys, [str(arg) for arg in args])
+
+
+class FakeRedis:
+    """
+    Redis with sorted sets and lease scripts.
+    """
+
+    def __init__(self):
+        self.zsets = {}
+
+    def register_script(self, script: str) -> 'FakeScript':
+        return FakeScript(script)
+
+    def run_script(self, script: str, keys: list, args: list) -> int:
+        holders = self.zsets.setdefault(keys[0], {})
+        if script == _ACQUIRE_SCRIPT:
+            now, expire_at, max_holders, holder_id, _, force = args
+            for holder in [holder for holder, score in holders.items() if score <= int(now)]:
+                del holders[holder]
+            if force != '1' and holder_id not in holders and len(holders) >= int(max_holders):
+                return 0
+            holders[holder_id] = int(expire_at)
+            return 1
+        if script == _RENEW_SCRIPT:
+            expire_at, holder_id, _ = args
+            if holder_id not in holders:
+                return 0
+            holders[holder_id] = int(expire_at)
+            return 1
+        raise ValueError('Unknown script')
+
+    def zrem(self, key: str, member: str):
+        self.zsets.get(key, {}).pop(member, None)
+
+    def zcount(self, key: str, min_score: int, max_score: str) -> int:
+        return sum(score >= min_score for score in self.zsets.get(key, {}).values())
+
+
+class TestTaskLease(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        self.now_ms = 1_000_000
+        patches = (
+            mock.patch('super_scheduler.utils.task_lease.get_redis_connection', return_value=FakeRedis()),
+            mock.patch('super_scheduler.utils.task_lease._now_ms', lambda: self.now_ms),
+            mock.patch.object(LeaseHeartbeat, '_ensure_thread'),
+            mock.patch.object(TaskLease, '_acquire_script', None),
+            mock.patch.object(TaskLease, '_renew_script', None),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    @staticmethod
+    def _lease(holder_id: str, max_parallel: int = 1) -> TaskLease:
+        return TaskLease('test_task', holder_id, max_parallel=max_parallel, ttl=60)
+
+    def test_max_parallel(self):
+        first, second, third = self._lease('test_id1', 2), self._lease('test_id2', 2), self._lease('test_id3', 2)
+        self.assertTrue(first.acquire())
+        self.assertTrue(second.acquire())
+        self.assertFalse(third.acquire())
+        self.assertEqual(first.holders(), 2)
+        # acquire of holder is idempotent
+        self.assertTrue(first.acquire())
+
+        second.release()
+        self.assertTrue(third.acquire())
+        # release of not held lease is safe
+        second.release()
+        self.assertEqual(first.holders(), 2)
+
+    def test_expired_lease_is_freed(self):
+        self.assertTrue(self._lease('test_id1').acquire())
+        self.assertFalse(self._lease('test_id2').acquire())
+        self.now_ms += 61_000
+        self.assertTrue(self._lease('test_id2').acquire())
+
+    def test_heartbeat(self):
+        lease = self._lease('test_id1')
+        lease.acquire()
+        self.assertTrue(LeaseHeartbeat.is_held(lease))
+        lease.release()
+        self.assertFalse(LeaseHeartbeat.is_held(lease))
+
+    def test_detached_lease_is_taken_by_reenqueued_run(self):
+        lease = self._lease('test_id1')
+        lease.acquire()
+        self.assertTrue(lease.detach(300))
+        self.assertFalse(LeaseHeartbeat.is_held(lease))
+        # detached lease outlives lease ttl without heartbeat
+        self.now_ms += 200_000
+        self.assertFalse(self._lease('test_id2').acquire())
+        # re-enqueued run acquires lease by id of first run
+        self.assertTrue(self._lease('test_id1').acquire())
+
+    def test_forced_acquire_of_lost_lease(self):
+        lease = self._lease('test_id1')
+        lease.acquire()
+        lease.detach(10)
+        self.now_ms += 11_000
+        self.assertTrue(self._lease('test_id2').acquire())
+        self.assertFalse(self._lease('test_id1').acquire())
+        self.assertTrue(self._lease('test_id1').acquire(force=True))
+        self.assertEqual(lease.holders(), 2)
+
+    def test_renew_of_released_lease(self):
+        lease = self._lease('test_id1')
+        lease.acquire()
+        lease.release()
+        self.assertFalse(lease.renew())
@@ -0,0 +1,185 @@
+from unittest import TestCase, mock
+import threading
+import time
+
+from celery.exceptions import Ignore
+from requests.exceptions import RequestException
+
+from super_scheduler.tasks import otl, LeaseLostError
+from super_scheduler.utils.failure_tracker import SKIP
+from super_scheduler.utils.otl_group import OtlGroupExecutor, parse_dependencies, \
+    SUCCESS, FAILED, SKIPPED, STOP_ON_FAILURE, CONTINUE_ON_FAILURE
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        tracker = mock.Mock()
+        tracker.allow.return_value = SKIP
+        patches = (
+            mock.patch.object(otl, '_get_failure_tracker', return_value=tracker),
+            mock.patch.object(otl, '_acquire_lease'),
+            mock.patch.object(otl, '_register_running'),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        otl.push_request(id='test_task_id', hostname='test')
+        self.addCleanup(otl.pop_request)
+
+    def test_open_breaker_skips_run(self):
+        with self.assertRaises(Ignore):
+            otl.before_start('test_task_id', ('| makeresults',), {'name': 'test_group'})
+
+    def test_open_breaker_of_group_line_doesnt_skip_run(self):
+        # skipped line would never let chord of distributed group finish
+        otl.before_start('test_task_id', ('| makeresults',),
+                         {'name': 'test_group:0', 'group_name': 'test_group', 'group_id': 'test_group_id'})
+        otl._get_failure_tracker.assert_not_called()
+
+
+class TestRunState(TestCase):
+    def test_runs_in_threads_dont_share_state(self):
+        # thread pool of worker runs requests of the same task instance at once
+        started, names = threading.Barrier(2), {}
+
+        def run(name: str):
+            otl.push_request(id=name, hostname='test')
+            try:
+                otl.init(name, (), {'name': name})
+                started.wait(timeout=5)
+                names[name] = otl.p_task_name
+            finally:
+                otl.pop_request()
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ('test_task1', 'test_task2')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(names, {'test_task1': 'test_task1', 'test_task2': 'test_task2'})
+
+
+class TestReenqueuedRun(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        self.lease = mock.Mock()
+        self.coalescer = mock.Mock()
+        patches = (
+            mock.patch('super_scheduler.tasks.TaskLease', return_value=self.lease),
+            mock.patch('super_scheduler.tasks.get_otl_coalescer', return_value=self.coalescer),
+            mock.patch.object(otl, '_register_running'),
+            mock.patch.object(otl, '_unregister_running'),
+            mock.patch.object(otl, '_track_failure'),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        otl.push_request(id='test_task_id2', hostname='test')
+        self.addCleanup(otl.pop_request)
+        self.kwargs = {
+            'name': 'test_otl', 'complex_rest_address': 'localhost:8080', 'tws': 0, 'twf': 0, 'sid': 'test_sid',
+            'username': 'admin', 'timeout': 100, 'row_limit': 10, 'state': 'polling', 'job_leader': True,
+            'lease_id': 'test_task_id1', 'max_parallel': 1,
+        }
+
+    def test_lease_is_taken_back_regardless_of_running_tasks(self):
+        self.lease.acquire.return_value = True
+        otl.before_start('test_task_id2', ('| makeresults',), self.kwargs)
+        self.lease.acquire.assert_called_once_with(force=True)
+        self.assertIs(otl.request.lease, self.lease)
+        self.coalescer.release.assert_not_called()
+
+    def test_lost_lease_releases_otl_job(self):
+        self.lease.acquire.side_effect = ConnectionError('redis is unavailable')
+        with self.assertRaises(LeaseLostError):
+            otl.before_start('test_task_id2', ('| makeresults',), self.kwargs)
+        self.coalescer.release.assert_called_once_with('test_sid')
+
+    def test_retry_keeps_lease(self):
+        # new scheduled run mustn't take place of polling run waiting for retry
+        otl.request.lease = self.lease
+        otl.on_retry(RequestException(), 'test_task_id2', ('| makeresults',), self.kwargs, None)
+        self.lease.detach.assert_called_once()
+        self.lease.release.assert_not_called()
+
+
+class TestParseDependencies(TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_dependencies(None, 3), {})
+        self.assertEqual(parse_dependencies('{"2": [0, 1]}', 3), {2: [0, 1]})
+        self.assertEqual(parse_dependencies({'1': 0}, 3), {1: [0]})
+
+    def test_line_out_of_range(self):
+        with self.assertRaises(ValueError):
+            parse_dependencies({'3': [0]}, 3)
+        with self.assertRaises(ValueError):
+            parse_dependencies({'1': [-1]}, 3)
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError):
+            parse_dependencies({'0': [2], '1': [0], '2': [1]}, 3)
+        with self.assertRaises(ValueError):
+            parse_dependencies({'0': [0]}, 1)
+
+
+class TestOtlGroupExecutor(TestCase):
+    def setUp(self):
+        """
+        define instructions that will be executed before each test method
+        """
+        self.lock = threading.Lock()
+        self.started, self.running, self.max_running = [], 0, 0
+        self.failed_lines = set()
+
+    def run_line(self, line: int):
+        with self.lock:
+            self.started.append(line)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        if line in self.failed_lines:
+            raise RuntimeError(f'line {line} failed')
+
+    def test_concurrency_limit(self):
+        statuses = OtlGroupExecutor(self.run_line, 6, concurrency=2).run()
+        self.assertEqual(statuses, {line: SUCCESS for line in range(6)})
+        self.assertEqual(self.max_running, 2)
+
+    def test_lines_run_consistently_by_default(self):
+        OtlGroupExecutor(self.run_line, 4).run()
+        self.assertEqual(self.started, [0, 1, 2, 3])
+        self.assertEqual(self.max_running, 1)
+
+    def test_dependencies_order(self):
+        # line 0 waits for lines 1 and 2, line 3 waits for line 0
+        OtlGroupExecutor(self.run_line, 4, concurrency=4, dependencies={0: [1, 2], 3: [0]}).run()
+        self.assertEqual(set(self.started[:2]), {1, 2})
+        self.assertEqual(self.started[2:], [0, 3])
+
+    def test_stop_on_failure(self):
+        self.failed_lines = {0}
+        executor = OtlGroupExecutor(self.run_line, 3, failure_mode=STOP_ON_FAILURE)
+        with self.assertRaisesRegex(RuntimeError, 'line 0 failed'):
+            executor.run()
+        self.assertEqual(self.started, [0])
+        self.assertEqual(executor.statuses, {0: FAILED, 1: SKIPPED, 2: SKIPPED})
+
+    def test_continue_on_failure_skips_dependent_lines(self):
+        self.failed_lines = {0}
+        executor = OtlGroupExecutor(self.run_line, 4, concurrency=2, dependencies={1: [0], 2: [1]},
+                                    failure_mode=CONTINUE_ON_FAILURE)
+        with self.assertRaisesRegex(RuntimeError, 'line 0 failed'):
+            executor.run()
+        self.assertEqual(sorted(self.started), [0, 3])
+        self.assertEqual(executor.statuses, {0: FAILED, 1: SKIPPED, 2: SKIPPED, 3: SUCCESS})
+
+    def test_not_correct_failure_mode(self):
+        with self.assertRaises(ValueError):
+            OtlGroupExecutor(self.run_line, 1, failure_mode='ignore')